@@ -1,9 +1,34 @@
 import os
-import shutil
+import sys
+import glob
 import time
+import shutil
 import argparse
 import logging
-import subprocess
+import multiprocessing
+from traveler_copy import COPY_ENGINES, DEFAULT_COPY_BUFFERS, available_copy_engines, copy_file
+from traveler_data import generate_test_file
+from traveler_results import make_result, write_results
+from traveler_tree import (SIZE_DISTRIBUTIONS, DEFAULT_TREE_FILES, DEFAULT_TREE_FILE_SIZE, DEFAULT_TREE_DEPTH, DEFAULT_TREE_FANOUT,
+                           DEFAULT_TREE_WORKERS, generate_tree, copy_tree, remove_path)
+from traveler_pool import run_sequential_processes, run_random_processes
+from traveler_verify import start_verification, finish_verification
+from traveler_fanout import MIN_OVERLAP_PERCENT, run_fanout, aggregate_results, scaling_report, format_cpu_summary
+from traveler_soak import (DEFAULT_STATE_FILE, parse_duration, new_state, load_state, save_state, data_matches, update_data,
+                           record_cycle, budget_exhausted, state_results, drift_summary, format_drift)
+from traveler_cache import lookup_test_file, store_test_file, claim_test_file, release_test_file
+from traveler_sweep import (load_spec, option_values, expand_matrix, prep_key, schedule_points, warm_up, point_label,
+                            summarize_sweep, format_table, pivot_table, format_pivot, write_heatmap_csv)
+from traveler_fio import DEFAULT_FIO_IOENGINE, find_fio, fio_version, run_fio
+from traveler_calibrate import (DEFAULT_CALIBRATION_FILE, DEFAULT_CALIBRATION_TARGET, CEILING_MARGIN, REGRESSION_THRESHOLD, is_ram_backed,
+                                build_calibration, load_calibration, save_calibration, compare_calibrations, calibration_rows, flag_ceilings)
+from traveler_telemetry import (DEFAULT_TELEMETRY_INTERVAL, mount_info, start_telemetry, stop_telemetry, timeline_telemetry, smart_changes,
+                                write_telemetry_csv, format_telemetry)
+from traveler_metrics import (DEFAULT_SAMPLE_INTERVAL, latency_summary, format_latency, throughput_summary,
+                              analyze_timeline, format_timeline_analysis, write_timeline_csv)
+from traveler_engine import (IO_ENGINES, ACCESS_DISTRIBUTIONS, DATA_PATTERNS, DEFAULT_BLOCK_SIZE, DEFAULT_RANDOM_BLOCK_SIZE, DEFAULT_RANDOM_OPS,
+                             PACED_STEPS, DEFAULT_PACED_SECONDS, SATURATION_RATIO, run_sequential, run_random, run_mixed, run_paced,
+                             mixed_split, parse_paced_steps, allocate_worker_buffers, parse_size, parse_block_size, format_size)
 
 def setup_logging(log_file='test_log.log'):
     """Set up logging configuration."""
@@ -14,72 +39,396 @@ def setup_logging(log_file='test_log.log'):
         datefmt='%Y-%m-%d %H:%M:%S'
     )
 
-def create_test_file(file_path, size_gb=50):
-    """Create a test file of the specified size in GB."""
-    message = f"Creating a test file of size {size_gb}GB at {file_path}..."
+SHARED_BOTTLENECK_FRACTION = 0.8  # Below this share of the solo rate, devices are contending for something
+
+# Options that may change between the sessions of one soak run
+SOAK_RUNTIME_OPTIONS = {'soak', 'resume', 'state_file', 'duration', 'cycles', 'results', 'log_file', 'timeline_dir', 'telemetry_interval', 'calibration'}
+
+def create_test_file(file_path, size_gb=50, pattern='random'):
+    """Create a fully allocated test file of the specified size in GB and data pattern."""
+    message = f"Creating a test file of size {size_gb}GB ({pattern} data) at {file_path}..."
     print(message)
     logging.info(message)
-    with open(file_path, 'wb') as f:
-        f.seek(size_gb * 1024 * 1024 * 1024 - 1)
-        f.write(b'\0')
-    message = "Test file created successfully."
+    stats = generate_test_file(file_path, size_gb * 1024 * 1024 * 1024, pattern)
+    fill_rate = stats['bytes'] / (1024 * 1024) / stats['seconds'] if stats['seconds'] else 0.0
+    message = f"Test file created successfully in {stats['seconds']:.2f} seconds ({fill_rate:.2f} MB/s with {stats['workers']} workers)."
     print(message)
     logging.info(message)
 
-def begin_travel(source, destination):
-    """Transfer a file from source to destination and measure the time taken."""
+def create_test_tree(root, file_count=DEFAULT_TREE_FILES, mean_size=DEFAULT_TREE_FILE_SIZE, distribution='lognormal', depth=DEFAULT_TREE_DEPTH, fanout=DEFAULT_TREE_FANOUT, pattern='random', workers=DEFAULT_TREE_WORKERS):
+    """Create a small-file dataset: file_count files of the given mean size spread over a directory tree."""
+    message = f"Creating a test tree of {file_count} files ({format_size(mean_size)} mean, {distribution} sizes, depth {depth}, fanout {fanout}) at {root}..."
+    print(message)
+    logging.info(message)
+    stats = generate_tree(root, file_count, mean_size, distribution, depth, fanout, pattern, workers)
+    message = f"Test tree created successfully in {stats['seconds']:.2f} seconds ({stats['bytes'] / (1024 * 1024):.0f}MB in {stats['files']} files, {stats['directories']} directories)."
+    print(message)
+    logging.info(message)
+
+def transfer_engine(source, copy_engine, tree_workers):
+    """Describe the engine begin_travel uses for source: the tree copy for a test tree, the copy engine for a file."""
+    if os.path.isdir(source):
+        return f"tree copy engine, {tree_workers} workers"
+    return f"{copy_engine} copy engine"
+
+def begin_travel(source, destination, copy_engine='shutil', copy_buffers=DEFAULT_COPY_BUFFERS, sample_interval=DEFAULT_SAMPLE_INTERVAL, tree_workers=DEFAULT_TREE_WORKERS):
+    """Transfer a file (or a test tree) from source to destination with the chosen copy engine and return the timing stats."""
     try:
-        start_time = time.time()
-        shutil.copy2(source, destination)
-        end_time = time.time()
-        return end_time - start_time
+        if os.path.isdir(source):
+            return copy_tree(source, destination, tree_workers, sample_interval=sample_interval)
+        return copy_file(source, destination, copy_engine, copy_buffers, sample_interval)
     except Exception as e:
         message = f"Error during file transfer from {source} to {destination}: {e}"
         print(message)
         logging.error(message)
         return None
 
-def train_travel(file_path, size_gb, operation='write'):
-    """Test sequential I/O speed using Python and measure the time taken."""
-    buffer_size = 1024 * 1024  # 1 MB buffer
+def train_travel(file_path, size_gb, operation='write', io_engine='buffered', dsync=False, queue_depth=1, block_size=DEFAULT_BLOCK_SIZE, buffers=None, sample_interval=DEFAULT_SAMPLE_INTERVAL, timeline_dir=None, processes=0, pin_cpus=False, pattern='random', backend='python', fio_ioengine=DEFAULT_FIO_IOENGINE, fio_path=None):
+    """Test sequential I/O speed using Python (or fio) and measure the time taken."""
     total_size = size_gb * 1024 * 1024 * 1024  # Convert GB to bytes
 
-    if operation == 'write':
-        message = f"Testing sequential write speed for {size_gb}GB file..."
-        print_to_terminal(message)
+    if operation not in ['write', 'read']:
+        raise ValueError("Invalid operation. Use 'write' or 'read'.")
+
+    pool = f", {processes} processes" if processes else ""
+    pool += f", fio {fio_ioengine}" if backend == 'fio' else ""
+    message = f"Testing sequential {operation} speed for {size_gb}GB file ({io_engine} I/O, {format_size(block_size)} blocks, QD{queue_depth}{pool})..."
+    print(message)
+    logging.info(message)
+    if backend == 'fio':
+        stats = run_fio(file_path, total_size, 'sequential', 100 if operation == 'read' else 0, queue_depth, block_size, io_engine,
+                        dsync=dsync, processes=processes, ioengine=fio_ioengine, fio_path=fio_path, pattern=pattern)
+    elif processes:
+        stats = run_sequential_processes(file_path, total_size, operation, processes, queue_depth, block_size, io_engine, dsync,
+                                         pin_cpus, sample_interval, pattern)
+    else:
+        stats = run_sequential(file_path, total_size, operation, queue_depth, block_size, io_engine, dsync, buffers, sample_interval, pattern)
+
+    if io_engine == 'direct' and not stats['direct']:
+        message = "O_DIRECT is not available here; page cache was flushed and dropped instead."
+        print(message)
+        logging.warning(message)
+
+    if queue_depth > 1 or processes:
+        for index, worker in enumerate(stats['workers']):
+            message = f"{'Process' if processes else 'Worker'} {index + 1} ({worker['bytes'] / (1024 * 1024):.0f}MB at offset {worker['offset']}) completed in {worker['seconds']:.2f} seconds."
+            logging.info(message)
+
+    elapsed_time = stats['seconds']
+    throughput = throughput_summary(stats['bytes'], elapsed_time, stats['histogram'])
+    message = f"{operation.capitalize()} operation completed in {elapsed_time:.2f} seconds ({throughput['mb_per_s']:.2f} MB/s, {throughput['iops']:.0f} IOPS)."
+    print(message)
+    logging.info(message)
+    report_latency(operation.capitalize(), stats['histogram'])
+    report_timeline(f"Sequential {operation}", f"sequential_{operation}", stats['timeline'], timeline_dir, stats.get('started'))
+    if backend == 'python':
+        message = f"Python overhead: {stats['python_overhead'] * 100:.1f}% of worker time spent outside {operation} calls."
+        print(message)
         logging.info(message)
-        start_time = time.time()
-        with open(file_path, 'wb') as f:
-            written = 0
-            while written < total_size:
-                f.write(b'\0' * buffer_size)
-                written += buffer_size
-        end_time = time.time()
+    return make_result('sequential', operation, 1, stats, io_engine, file_path, block_size, stats['queue_depth'],
+                       direct=stats['direct'], python_overhead=stats.get('python_overhead'), processes=processes, backend=backend)
 
-    elif operation == 'read':
-        message = f"Testing sequential read speed for {size_gb}GB file..."
-        print_to_terminal(message)
+def mixed_travel(file_path, size_gb, read_percent, io_engine='buffered', dsync=False, queue_depth=2, block_size=DEFAULT_BLOCK_SIZE, buffers=None, sample_interval=DEFAULT_SAMPLE_INTERVAL, timeline_dir=None, baselines=None, pattern='random'):
+    """Test sequential reads and writes running at the same time, and compare them with the read and write passes run alone."""
+    readers = mixed_split(queue_depth, read_percent)
+    message = f"Testing mixed sequential read/write for {size_gb}GB file ({io_engine} I/O, {format_size(block_size)} blocks, {readers} readers and {queue_depth - readers} writers at once)..."
+    print(message)
+    logging.info(message)
+    stats = run_mixed(file_path, size_gb * 1024 * 1024 * 1024, read_percent, queue_depth, block_size, io_engine, dsync, buffers, sample_interval, pattern)
+    message = f"Mixed operation completed in {stats['seconds']:.2f} seconds ({transfer_rate(stats):.2f} MB/s total)."
+    print(message)
+    logging.info(message)
+    report_timeline("Mixed read/write", f"sequential_mixed{read_percent}", stats['timeline'], timeline_dir, stats.get('started'))
+
+    results = []
+    alone = {result.direction: result for result in baselines or []}
+    for direction in ['read', 'write']:
+        direction_stats = {'bytes': stats[f'{direction}_bytes'], 'seconds': stats['seconds'], 'started': stats['started'],
+                           'histogram': stats[f'{direction}_histogram']}
+        result = make_result('mixed', direction, 1, direction_stats, io_engine, file_path, block_size, stats['queue_depth'],
+                             read_percent=read_percent, readers=stats['readers'], writers=stats['writers'], direct=stats['direct'],
+                             python_overhead=stats['python_overhead'], backend='python')
+        message = f"Mixed {direction}: {result.mb_per_s:.2f} MB/s, {format_latency(result.latency)}"
+        baseline = alone.get(direction)
+        if baseline is not None and baseline.latency and baseline.latency['p99_us']:
+            change = (result.latency['p99_us'] / baseline.latency['p99_us'] - 1) * 100
+            message += f" (p99 {change:+.0f}% and {result.mb_per_s / baseline.mb_per_s * 100 if baseline.mb_per_s else 0:.0f}% of the MB/s of the {direction} pass alone)"
+            result.extra['p99_change_percent'] = change
+        print(message + ".")
         logging.info(message)
-        start_time = time.time()
-        with open(file_path, 'rb') as f:
-            while f.read(buffer_size):
-                pass
-        end_time = time.time()
+        results.append(result)
+    return results
 
-    else:
-        raise ValueError("Invalid operation. Use 'write' or 'read'.")
+def paced_travel(file_path, size_gb, access, read_percent, peak_iops, steps=PACED_STEPS, seconds=DEFAULT_PACED_SECONDS, queue_depth=1, block_size=DEFAULT_BLOCK_SIZE, io_engine='buffered', distribution='uniform', dsync=False, buffers=None, sample_interval=DEFAULT_SAMPLE_INTERVAL, pattern='random'):
+    """Run an open-loop pass at each step (percent of the flat-out rate peak_iops) and report the throughput/latency curve.
 
-    elapsed_time = end_time - start_time
-    message = f"{operation.capitalize()} operation completed in {elapsed_time:.2f} seconds."
-    print_to_terminal(message)
+    Stops after the first step that cannot keep up with its target rate, i.e. at saturation.
+    """
+    direction = {100: 'read', 0: 'write'}.get(read_percent, f'mix{read_percent}')
+    label = f"{access} {direction}"
+    message = f"Paced {label} at {', '.join(f'{step}%' for step in steps)} of {peak_iops:.0f} IOPS, {seconds:g} seconds per step (QD{queue_depth}, {format_size(block_size)} blocks)..."
+    print(message)
+    logging.info(message)
+
+    results = []
+    rows = []
+    for step in steps:
+        rate = peak_iops * step / 100
+        stats = run_paced(file_path, size_gb * 1024 * 1024 * 1024, rate, seconds, access, read_percent, queue_depth, block_size,
+                          io_engine, distribution, dsync=dsync, buffers=buffers, sample_interval=sample_interval, pattern=pattern)
+        result = make_result(f'paced_{access}', f'{direction}@{step}%', 1, stats, io_engine, file_path, block_size, queue_depth,
+                             target_percent=step, target_iops=rate, target_mb_per_s=rate * block_size / (1024 * 1024),
+                             late_ops=stats['late_ops'], service_latency=latency_summary(stats['service_histogram']),
+                             read_percent=read_percent, distribution=distribution if access == 'random' else None, direct=stats['direct'])
+        result.extra['saturated'] = result.iops < SATURATION_RATIO * rate
+        results.append(result)
+        rows.append({'target': f"{step}%", 'target_mb_per_s': result.extra['target_mb_per_s'], 'mb_per_s': result.mb_per_s,
+                     'iops': result.iops, 'p50_us': result.latency['p50_us'], 'p99_us': result.latency['p99_us'],
+                     'p99.9_us': result.latency['p99.9_us'], 'service_p99_us': result.extra['service_latency']['p99_us'],
+                     'late_percent': stats['late_ops'] / stats['ops'] * 100 if stats['ops'] else 0.0})
+        message = f"Paced {label} at {step}% ({rate:.0f} IOPS target): {result.iops:.0f} IOPS, {result.mb_per_s:.2f} MB/s, {format_latency(result.latency)}"
+        print(message + (" - saturated." if result.extra['saturated'] else "."))
+        logging.info(message)
+        if result.extra['saturated']:
+            break
+
+    message = f"Paced {label} throughput/latency curve (latency from when each I/O was due):\n{format_table(rows)}"
+    print(message)
     logging.info(message)
+    return results
 
-def domestic_travel(file_path, primary_ssd_path, cycles=1):
-    """Test transferring a file within the primary SSD."""
-    message = "Starting internal file transfer test..."
+def report_results(results_path, results):
+    """Write the collected results to a JSON Lines or CSV file."""
+    if not results_path or not results:
+        return
+    write_results(results_path, results)
+    message = f"{len(results)} results written to {results_path}."
+    print(message)
+    logging.info(message)
+
+def report_timeline(label, name, timeline, timeline_dir=None, started=None):
+    """Report burst and sustained bandwidth of a test and optionally export its throughput time series.
+
+    With the test's start time and a running telemetry collector, each exported row carries the telemetry sample covering it.
+    """
+    if not timeline:
+        return
+    message = f"{label}: {format_timeline_analysis(analyze_timeline(timeline))}"
+    print(message)
+    logging.info(message)
+    if timeline_dir:
+        timeline_path = os.path.join(timeline_dir, f"{name}.csv")
+        write_timeline_csv(timeline_path, timeline, timeline_telemetry(timeline, started))
+        logging.info(f"Throughput timeline saved to {timeline_path}")
+
+def report_telemetry(results):
+    """Report the device and CPU telemetry recorded during each test."""
+    for result in results:
+        if result.telemetry:
+            message = f"Telemetry during {result.test} {result.direction} (cycle {result.cycle}): {format_telemetry(result.telemetry)}."
+            print(message)
+            logging.info(message)
+
+def report_ceilings(results, calibration_path):
+    """Flag results that came close to the ceiling of their engine measured by the calibrate subcommand."""
+    calibration = load_calibration(calibration_path)
+    if calibration is None:
+        return
+    for result in flag_ceilings(results, calibration):
+        message = (f"{result.test.capitalize()} {result.direction} reached {result.extra['ceiling_percent']:.0f}% of the {result.engine} engine's "
+                   f"ceiling on RAM ({result.extra['ceiling_mb_per_s']:.2f} MB/s): Traveler, not the drive, may be the limit.")
+        print(message)
+        logging.warning(message)
+
+def collect_telemetry(args):
+    """Start sampling the devices under test and the CPU in the background, and report their environment."""
+    if not args.telemetry_interval:
+        return None
+    paths = [args.primary_ssd_path] + (args.targets or []) + ([args.secondary_ssd_path] if args.secondary_ssd_path else [])
+    collector = start_telemetry(paths, args.telemetry_interval)
+    environment = collector['environment']
+    if 'cpu_governor' in environment:
+        message = f"CPU frequency governor: {environment['cpu_governor']}" + (f" (max {environment['cpu_max_mhz']:.0f} MHz)." if 'cpu_max_mhz' in environment else ".")
+        print(message)
+        logging.info(message)
+    for path, info in environment['paths'].items():
+        message = f"{path}: {info.get('fs_type', 'unknown')} filesystem on {info.get('device', 'an unknown device')} mounted {info.get('mount_options', '')}"
+        if 'model' in info:
+            message += f", {info['model']} firmware {info.get('firmware', 'unknown')}"
+        print(message + ".")
+        logging.info(message)
+    for name, device in collector['devices'].items():
+        if device['sensor'] is None and device['smart_start'] is None:
+            logging.info(f"No temperature readings for {name}: no hwmon sensor in sysfs and nvme-cli is missing or has no access.")
+    return collector
+
+def finish_telemetry(collector, timeline_dir=None):
+    """Stop the telemetry collector, report peak temperatures and SMART counters that changed, and export the samples."""
+    if collector is None:
+        return
+    stop_telemetry(collector)
+    for name, device in collector['devices'].items():
+        temperatures = [sample[f"{name}_temp_c"] for sample in collector['samples'] if f"{name}_temp_c" in sample]
+        if temperatures:
+            message = f"{name} temperature: {min(temperatures):.0f}-{max(temperatures):.0f}C during the run."
+            print(message)
+            logging.info(message)
+        changes = smart_changes(device)
+        if changes:
+            message = f"{name} SMART counters changed during the run: {', '.join(f'{field} +{change}' for field, change in changes.items())}."
+            print(message)
+            logging.warning(message)
+        if (device.get('smart_end') or {}).get('critical_warning'):
+            message = f"{name} reports SMART critical warning {device['smart_end']['critical_warning']}."
+            print(message)
+            logging.error(message)
+    if timeline_dir and collector['samples']:
+        os.makedirs(timeline_dir, exist_ok=True)
+        telemetry_path = os.path.join(timeline_dir, 'telemetry.csv')
+        write_telemetry_csv(telemetry_path, collector['samples'])
+        logging.info(f"Telemetry samples saved to {telemetry_path}")
+
+def report_latency(label, histogram):
+    """Report the latency percentiles of a histogram."""
+    message = f"{label} latency: {format_latency(latency_summary(histogram))}"
+    print(message)
+    logging.info(message)
+
+def report_chunk_latency(transfer):
+    """Report per-chunk copy latency when the copy engine works in chunks, or per-file latency for a tree copy."""
+    if 'files' in transfer:
+        report_latency("Per-file copy", transfer['histogram'])
+        return
+    if transfer['read_histogram'] is not None:
+        report_latency("Chunk read", transfer['read_histogram'])
+    if transfer['histogram'] is not None:
+        report_latency("Chunk write" if transfer['read_histogram'] is not None else "Chunk copy", transfer['histogram'])
+
+def transfer_rate(transfer):
+    """Return the throughput of a transfer in MB/s."""
+    return transfer['bytes'] / (1024 * 1024) / transfer['seconds'] if transfer['seconds'] else 0.0
+
+def file_rate(transfer):
+    """Describe the files per second of a tree copy (empty for a single-file transfer)."""
+    if 'files' not in transfer or not transfer['seconds']:
+        return ""
+    return f", {transfer['files'] / transfer['seconds']:.0f} files/s"
+
+def start_verify(test, cycle, source, copies, transfer_results, source_digests):
+    """Start checking the copies of a cycle against the source in the background, overlapping the next transfer."""
+    message = f"Verifying {len(copies)} {'copy' if len(copies) == 1 else 'copies'} of cycle {cycle} in the background..."
+    logging.info(message)
+    return {'test': test, 'cycle': cycle, 'copies': copies, 'results': transfer_results,
+            'verification': start_verification(source, copies, source_digests=source_digests)}
+
+def verify_overlap(pending):
+    """Return the extra result fields of a transfer about to start: verify_overlapped if the previous cycle is still being verified."""
+    return {'verify_overlapped': True} if pending is not None and pending['verification']['thread'].is_alive() else {}
+
+def overlap_note(overlap):
+    """Mention in a transfer report that the transfer shared the drive with a verification."""
+    return ", overlapped verification" if overlap else ""
+
+def finish_verify(pending):
+    """Wait for a background verification, report it, delete the checked copies and return its result."""
+    try:
+        stats = finish_verification(pending['verification'])
+    except (OSError, ValueError) as e:
+        stats = None
+        message = f"Verification of cycle {pending['cycle']} failed: {e}"
+        print(message)
+        logging.error(message)
+    for path in pending['copies']:
+        if os.path.exists(path):
+            remove_path(path)  # Clean up
+    if stats is None:
+        return []
+
+    if stats['mismatches']:
+        for mismatch in stats['mismatches']:
+            logging.error(f"Data mismatch: {mismatch}.")
+        message = f"DATA MISMATCH in cycle {pending['cycle']}: {len(stats['mismatches'])} of {stats['files'] * stats['copies']} copied files differ from the source (see the log)."
+        print(message)
+        logging.error(message)
+    else:
+        message = f"Verified {stats['copies']} {'copy' if stats['copies'] == 1 else 'copies'} of cycle {pending['cycle']} in {stats['seconds']:.2f} seconds ({transfer_rate(stats):.2f} MB/s hashed, {stats['algorithm']})."
+        print(message)
+        logging.info(message)
+    for result in pending['results']:
+        result.extra['verified'] = not stats['mismatches']
+    return [make_result(pending['test'], 'verify', pending['cycle'], stats, stats['algorithm'], pending['copies'][0],
+                        copies=stats['copies'], mismatches=stats['mismatches'])]
+
+def random_travel(file_path, size_gb, queue_depth=1, block_size=DEFAULT_RANDOM_BLOCK_SIZE, io_engine='buffered', read_mix=None, distribution='uniform', ops=DEFAULT_RANDOM_OPS, dsync=False, sample_interval=DEFAULT_SAMPLE_INTERVAL, timeline_dir=None, processes=0, pin_cpus=False, backend='python', fio_ioengine=DEFAULT_FIO_IOENGINE, fio_path=None, pattern='random'):
+    """Test random I/O (IOPS) at the given block size, queue depth, read/write mix and access distribution."""
+    total_size = size_gb * 1024 * 1024 * 1024  # Convert GB to bytes
+    buffers = allocate_worker_buffers(queue_depth, block_size, pattern) if backend == 'python' and not processes else None
+    pool = f", {processes} processes" if processes else ""
+    pool += f", fio {fio_ioengine}" if backend == 'fio' else ""
+    # Without an explicit mix, measure pure random read and pure random write like the PCL tables do
+    mixes = [100, 0] if read_mix is None else [read_mix]
+    results = []
+
+    for read_percent in mixes:
+        label = {100: 'read', 0: 'write'}.get(read_percent, f'{read_percent}/{100 - read_percent} read/write')
+        message = f"Testing random {label} for {size_gb}GB file ({io_engine} I/O, {format_size(block_size)} blocks, QD{queue_depth}{pool}, {distribution}, {ops} ops)..."
+        print(message)
+        logging.info(message)
+        if backend == 'fio':
+            stats = run_fio(file_path, total_size, 'random', read_percent, queue_depth, block_size, io_engine, distribution, ops,
+                            dsync=dsync, processes=processes, ioengine=fio_ioengine, fio_path=fio_path, pattern=pattern)
+        elif processes:
+            stats = run_random_processes(file_path, total_size, processes, queue_depth, block_size, io_engine, read_percent, distribution,
+                                         ops, dsync=dsync, pin_cpus=pin_cpus, sample_interval=sample_interval, pattern=pattern)
+        else:
+            stats = run_random(file_path, total_size, queue_depth, block_size, io_engine, read_percent, distribution, ops,
+                               dsync=dsync, buffers=buffers, sample_interval=sample_interval, pattern=pattern)
+
+        throughput = throughput_summary(stats['bytes'], stats['seconds'], stats['histogram'])
+        message = f"Random {label} completed in {stats['seconds']:.2f} seconds ({throughput['iops']:.0f} IOPS, {throughput['mb_per_s']:.2f} MB/s)."
+        print(message)
+        logging.info(message)
+        if stats['read_bytes']:
+            report_latency("Random read", stats['read_histogram'])
+        if stats['write_bytes']:
+            report_latency("Random write", stats['write_histogram'])
+        name = {100: 'read', 0: 'write'}.get(read_percent, f'mix{read_percent}')
+        report_timeline(f"Random {label}", f"random_{name}", stats['timeline'], timeline_dir, stats.get('started'))
+
+        for direction in ['read', 'write']:
+            if stats[f'{direction}_bytes']:
+                direction_stats = {'bytes': stats[f'{direction}_bytes'], 'seconds': stats['seconds'], 'started': stats.get('started'),
+                                   'histogram': stats[f'{direction}_histogram'], 'timeline': stats['timeline'] if read_percent in [0, 100] else None}
+                results.append(make_result('random', direction, 1, direction_stats, io_engine, file_path, block_size, stats['queue_depth'],
+                                           read_percent=read_percent, distribution=distribution, direct=stats['direct'],
+                                           python_overhead=stats.get('python_overhead'), processes=processes, backend=backend))
+    return results
+
+def report_cross_check(results):
+    """Compare each Python engine result with the fio result of the same test."""
+    fio_results = {(result.test, result.direction, result.extra.get('read_percent')): result
+                   for result in results if result.extra.get('backend') == 'fio'}
+    for result in results:
+        if result.extra.get('backend') != 'python':
+            continue
+        fio_result = fio_results.get((result.test, result.direction, result.extra.get('read_percent')))
+        if fio_result is None or not fio_result.mb_per_s:
+            continue
+        message = f"Cross-check {result.test} {result.direction}: Python {result.mb_per_s:.2f} MB/s, fio {fio_result.mb_per_s:.2f} MB/s ({result.mb_per_s / fio_result.mb_per_s * 100:.0f}% of fio)"
+        if result.latency and fio_result.latency:
+            message += f", p99 {result.latency['p99_us']:.1f}us vs {fio_result.latency['p99_us']:.1f}us"
+        print(message + ".")
+        logging.info(message)
+
+def domestic_travel(file_path, primary_ssd_path, cycles=1, copy_engine='shutil', copy_buffers=DEFAULT_COPY_BUFFERS, sample_interval=DEFAULT_SAMPLE_INTERVAL, timeline_dir=None, tree_workers=DEFAULT_TREE_WORKERS, verify=False):
+    """Test transferring a file (or test tree) within the primary SSD, optionally verifying every copy."""
+    message = f"Starting internal file transfer test ({transfer_engine(file_path, copy_engine, tree_workers)})..."
     print(message)
     logging.info(message)
     total_suite_time = 0
+    results = []
+    pending = None
+    source_digests = {}
 
     for cycle in range(cycles):
         message = f"Cycle {cycle + 1} of {cycles}"
@@ -87,14 +436,25 @@ def domestic_travel(file_path, primary_ssd_path, cycles=1):
         logging.info(message)
         start_suite_time = time.time()
 
-        destination_path = os.path.join(primary_ssd_path, 'internal_test_copy')
-        transfer_time = begin_travel(file_path, destination_path)
+        # With verify, each cycle copies to its own destination so the previous copy can be checked meanwhile
+        destination_path = os.path.join(primary_ssd_path, f'internal_test_copy_{cycle + 1}' if verify else 'internal_test_copy')
+        overlap = verify_overlap(pending)
+        transfer = begin_travel(file_path, destination_path, copy_engine, copy_buffers, sample_interval, tree_workers)
+        if pending is not None:
+            results += finish_verify(pending)
+            pending = None
         
-        if transfer_time is not None:
-            message = f"Internal file transfer completed in {transfer_time:.2f} seconds."
+        if transfer is not None:
+            message = f"Internal file transfer completed in {transfer['seconds']:.2f} seconds ({transfer_rate(transfer):.2f} MB/s{file_rate(transfer)}, {transfer['engine']}{overlap_note(overlap)})."
             print(message)
             logging.info(message)
-            os.remove(destination_path)  # Clean up
+            report_chunk_latency(transfer)
+            report_timeline("Internal transfer", f"internal_cycle{cycle + 1}", transfer['timeline'], timeline_dir, transfer.get('started'))
+            results.append(make_result('internal', 'copy', cycle + 1, transfer, transfer['engine'], destination_path, **overlap))
+            if verify:
+                pending = start_verify('internal', cycle + 1, file_path, [destination_path], results[-1:], source_digests)
+            else:
+                remove_path(destination_path)  # Clean up
         else:
             message = "Internal file transfer failed."
             print(message)
@@ -107,16 +467,23 @@ def domestic_travel(file_path, primary_ssd_path, cycles=1):
         print(message)
         logging.info(message)
 
+    if pending is not None:
+        results += finish_verify(pending)
+
     message = f"Total time for {cycles} internal file transfer cycles: {total_suite_time:.2f} seconds."
     print(message)
     logging.info(message)
+    return results
 
-def interstate_travel(file_path, primary_ssd_path, secondary_ssd_path, cycles=1):
-    """Test transferring a file from primary to secondary SSD and back."""
-    message = "Starting external file transfer test..."
+def interstate_travel(file_path, primary_ssd_path, secondary_ssd_path, cycles=1, copy_engine='shutil', copy_buffers=DEFAULT_COPY_BUFFERS, sample_interval=DEFAULT_SAMPLE_INTERVAL, timeline_dir=None, tree_workers=DEFAULT_TREE_WORKERS, verify=False):
+    """Test transferring a file (or test tree) from primary to secondary SSD and back, optionally verifying both copies."""
+    message = f"Starting external file transfer test ({transfer_engine(file_path, copy_engine, tree_workers)})..."
     print(message)
     logging.info(message)
     total_suite_time = 0
+    results = []
+    pending = None
+    source_digests = {}
 
     for cycle in range(cycles):
         message = f"Cycle {cycle + 1} of {cycles}"
@@ -125,29 +492,49 @@ def interstate_travel(file_path, primary_ssd_path, secondary_ssd_path, cycles=1)
         start_suite_time = time.time()
 
         # Transfer from primary to secondary
-        destination_path = os.path.join(secondary_ssd_path, 'external_test_copy')
-        transfer_time_to_secondary = begin_travel(file_path, destination_path)
+        suffix = f'_{cycle + 1}' if verify else ''
+        destination_path = os.path.join(secondary_ssd_path, 'external_test_copy' + suffix)
+        overlap = verify_overlap(pending)
+        transfer_to_secondary = begin_travel(file_path, destination_path, copy_engine, copy_buffers, sample_interval, tree_workers)
+        if pending is not None:
+            results += finish_verify(pending)
+            pending = None
         
-        if transfer_time_to_secondary is not None:
-            message = f"Transfer to secondary SSD completed in {transfer_time_to_secondary:.2f} seconds."
+        if transfer_to_secondary is not None:
+            message = f"Transfer to secondary SSD completed in {transfer_to_secondary['seconds']:.2f} seconds ({transfer_rate(transfer_to_secondary):.2f} MB/s{file_rate(transfer_to_secondary)}, {transfer_to_secondary['engine']}{overlap_note(overlap)})."
             print(message)
             logging.info(message)
+            report_chunk_latency(transfer_to_secondary)
+            report_timeline("Transfer to secondary", f"external_to_secondary_cycle{cycle + 1}", transfer_to_secondary['timeline'], timeline_dir, transfer_to_secondary.get('started'))
+            results.append(make_result('external', 'to_secondary', cycle + 1, transfer_to_secondary, transfer_to_secondary['engine'], destination_path, **overlap))
+            copies = [destination_path]
+            transfer_results = results[-1:]
             
             # Transfer back from secondary to primary
-            return_path = os.path.join(primary_ssd_path, 'external_test_return_copy')
-            transfer_time_to_primary = begin_travel(destination_path, return_path)
+            return_path = os.path.join(primary_ssd_path, 'external_test_return_copy' + suffix)
+            transfer_to_primary = begin_travel(destination_path, return_path, copy_engine, copy_buffers, sample_interval, tree_workers)
             
-            if transfer_time_to_primary is not None:
-                message = f"Transfer back to primary SSD completed in {transfer_time_to_primary:.2f} seconds."
+            if transfer_to_primary is not None:
+                message = f"Transfer back to primary SSD completed in {transfer_to_primary['seconds']:.2f} seconds ({transfer_rate(transfer_to_primary):.2f} MB/s{file_rate(transfer_to_primary)}, {transfer_to_primary['engine']})."
                 print(message)
                 logging.info(message)
-                os.remove(return_path)  # Clean up
+                report_chunk_latency(transfer_to_primary)
+                report_timeline("Transfer back to primary", f"external_to_primary_cycle{cycle + 1}", transfer_to_primary['timeline'], timeline_dir, transfer_to_primary.get('started'))
+                results.append(make_result('external', 'to_primary', cycle + 1, transfer_to_primary, transfer_to_primary['engine'], return_path))
+                if verify:
+                    copies.append(return_path)
+                    transfer_results += results[-1:]
+                else:
+                    remove_path(return_path)  # Clean up
             else:
                 message = "Transfer back to primary SSD failed."
                 print(message)
                 logging.warning(message)
             
-            os.remove(destination_path)  # Clean up
+            if verify:
+                pending = start_verify('external', cycle + 1, file_path, copies, transfer_results, source_digests)
+            else:
+                remove_path(destination_path)  # Clean up
         else:
             message = "Transfer to secondary SSD failed."
             print(message)
@@ -160,23 +547,563 @@ def interstate_travel(file_path, primary_ssd_path, secondary_ssd_path, cycles=1)
         print(message)
         logging.info(message)
 
+    if pending is not None:
+        results += finish_verify(pending)
+
     message = f"Total time for {cycles} external file transfer cycles: {total_suite_time:.2f} seconds."
     print(message)
     logging.info(message)
+    return results
 
-def main():
-    parser = argparse.ArgumentParser(description="NVMe SSD File Transfer Test")
-    parser.add_argument('primary_ssd_path', type=str, help='Path to the primary SSD')
+def prepare_test_data(primary_ssd_path, args, tree_file_size):
+    """Create the test file (and test tree) the selected tests need if they don't exist; return both paths.
+
+    With --cache the test file comes from the drive's test-file cache and is only created on a miss.
+    """
+    test_file_path = os.path.join(primary_ssd_path, 'test_file')
+    cached = False
+    if args.cache:
+        file_size = args.file_size * 1024 * 1024 * 1024
+        test_file_path, cached = lookup_test_file(primary_ssd_path, file_size, args.data_pattern, args.cache_quota and parse_size(args.cache_quota))
+        if cached:
+            message = f"Reusing cached test file {test_file_path}."
+            print(message)
+            logging.info(message)
+    transfer_source = test_file_path
+    if args.workload == 'tree' and args.test in ['internal', 'external', 'all']:
+        transfer_source = os.path.join(primary_ssd_path, 'test_tree')
+        if not os.path.exists(transfer_source):
+            create_test_tree(transfer_source, args.tree_files, tree_file_size, args.tree_size_distribution, args.tree_depth,
+                             args.tree_fanout, args.data_pattern, args.tree_workers)
+    if transfer_source == test_file_path or args.test in ['sequential', 'random', 'all']:
+        if not os.path.exists(test_file_path):
+            create_test_file(test_file_path, args.file_size, args.data_pattern)
+            if args.cache:
+                store_test_file(primary_ssd_path, test_file_path, file_size, args.data_pattern)
+    return test_file_path, transfer_source
+
+def writes_test_file(args):
+    """Return True if the selected tests write to the test file (every sequential run, and random runs unless read-only)."""
+    return args.test in ['sequential', 'all'] or (args.test == 'random' and args.read_mix != 100)
+
+def device_travel(primary_ssd_path, secondary_ssd_path, args, block_size, random_block_size, tree_file_size, sample_interval, timeline_dir, backends, keep_data=False):
+    """Create the test data on one device, run the selected tests on it and clean up unless keep_data is set."""
+    test_file_path, transfer_source = prepare_test_data(primary_ssd_path, args, tree_file_size)
+    if args.cache and writes_test_file(args):
+        claim_test_file(primary_ssd_path, test_file_path)
+    if timeline_dir:
+        os.makedirs(timeline_dir, exist_ok=True)
+
+    # Run the specified tests
+    results = []
+    if args.test in ['internal', 'all']:
+        results += domestic_travel(transfer_source, primary_ssd_path, args.cycles, args.copy_engine, args.copy_buffers, sample_interval, timeline_dir, args.tree_workers, args.verify)
+    if args.test in ['external', 'all'] and secondary_ssd_path:
+        results += interstate_travel(transfer_source, primary_ssd_path, secondary_ssd_path, args.cycles, args.copy_engine, args.copy_buffers, sample_interval, timeline_dir, args.tree_workers, args.verify)
+    if args.test in ['sequential', 'all']:
+        # Process pool workers allocate and fill their own buffers
+        buffers = None if args.processes else allocate_worker_buffers(args.queue_depth, block_size, args.data_pattern)
+        for backend in backends:
+            results.append(train_travel(test_file_path, args.file_size, operation='write', io_engine=args.io_engine, dsync=args.dsync, queue_depth=args.queue_depth, block_size=block_size, buffers=buffers, sample_interval=sample_interval, timeline_dir=timeline_dir, processes=args.processes, pin_cpus=args.pin_cpus, pattern=args.data_pattern, backend=backend, fio_ioengine=args.fio_ioengine, fio_path=args.fio_path))
+            results.append(train_travel(test_file_path, args.file_size, operation='read', io_engine=args.io_engine, queue_depth=args.queue_depth, block_size=block_size, buffers=buffers, sample_interval=sample_interval, timeline_dir=timeline_dir, processes=args.processes, pin_cpus=args.pin_cpus, backend=backend, fio_ioengine=args.fio_ioengine, fio_path=args.fio_path))
+            if args.paced and backend == 'python':
+                for result in results[-2:]:
+                    results += paced_travel(test_file_path, args.file_size, 'sequential', 100 if result.direction == 'read' else 0, result.iops,
+                                            args.paced_steps, args.paced_seconds, args.queue_depth, block_size, args.io_engine,
+                                            dsync=args.dsync, buffers=buffers, sample_interval=sample_interval, pattern=args.data_pattern)
+            if args.sequential_mix is not None and backend == 'python':
+                results += mixed_travel(test_file_path, args.file_size, args.sequential_mix, args.io_engine, args.dsync, args.queue_depth, block_size, buffers, sample_interval, timeline_dir, results[-2:], args.data_pattern)
+
+    if args.test == 'random':
+        for backend in backends:
+            random_results = random_travel(test_file_path, args.file_size, args.queue_depth, random_block_size, args.io_engine, args.read_mix,
+                                           args.random_distribution, args.random_ops, args.dsync, sample_interval, timeline_dir,
+                                           args.processes, args.pin_cpus, backend, args.fio_ioengine, args.fio_path, args.data_pattern)
+            results += random_results
+            if args.paced and backend == 'python':
+                # One curve per read/write mix, paced against the combined IOPS of both directions
+                peaks = {}
+                for result in random_results:
+                    peaks[result.extra['read_percent']] = peaks.get(result.extra['read_percent'], 0.0) + result.iops
+                for read_percent, peak_iops in peaks.items():
+                    results += paced_travel(test_file_path, args.file_size, 'random', read_percent, peak_iops, args.paced_steps, args.paced_seconds,
+                                            args.queue_depth, random_block_size, args.io_engine, args.random_distribution, args.dsync,
+                                            sample_interval=sample_interval, pattern=args.data_pattern)
+
+    # Delete the test file and test tree after all tests are done; a cached test file is checksummed again and kept for the next run
+    if args.cache and os.path.exists(test_file_path):
+        release_test_file(primary_ssd_path, test_file_path, writes_test_file(args))
+    if not keep_data:
+        for path in {test_file_path, transfer_source} - ({test_file_path} if args.cache else set()):
+            if os.path.exists(path):
+                remove_path(path)
+    return results
+
+def soak_travel(args, block_size, random_block_size, tree_file_size, sample_interval, backends):
+    """Repeat the selected tests until the cycle or time budget is used, checkpointing after every cycle."""
+    state_path = args.state_file or os.path.join(args.primary_ssd_path, DEFAULT_STATE_FILE)
+    data_paths = [os.path.join(args.primary_ssd_path, 'test_file'), os.path.join(args.primary_ssd_path, 'test_tree')]
+    config = {key: value for key, value in vars(args).items() if key not in SOAK_RUNTIME_OPTIONS}
+    max_seconds = parse_duration(args.duration) if args.duration else None
+    max_cycles = None if max_seconds else args.cycles
+
+    state = load_state(state_path)
+    if args.resume:
+        if state is None:
+            message = f"No soak state to resume at {state_path}."
+            print(message)
+            logging.error(message)
+            return
+        if state['completed']:
+            message = f"The soak run in {state_path} already completed {state['cycles_completed']} cycles."
+            print(message)
+            logging.info(message)
+            return
+        if state['config'] != config:
+            message = f"The soak state at {state_path} was created with different test settings; rerun with the same options to resume."
+            print(message)
+            logging.error(message)
+            return
+        if not data_matches(state, data_paths):
+            message = "Test data changed or is missing since the last checkpoint; it will be regenerated."
+            print(message)
+            logging.warning(message)
+            for path in data_paths:
+                if os.path.exists(path):
+                    remove_path(path)
+            prepare_test_data(args.primary_ssd_path, args, tree_file_size)
+            update_data(state, data_paths)
+            save_state(state_path, state)
+        # Copies left behind by an interrupted cycle (with --verify they carry a cycle suffix)
+        for path in glob.glob(os.path.join(args.primary_ssd_path, 'internal_test_copy*')) + glob.glob(os.path.join(args.primary_ssd_path, 'external_test_return_copy*')) + \
+                    (glob.glob(os.path.join(args.secondary_ssd_path, 'external_test_copy*')) if args.secondary_ssd_path else []):
+            if os.path.exists(path):
+                remove_path(path)
+        message = f"Resuming soak after {state['cycles_completed']} cycles ({state['elapsed_seconds'] / 3600:.2f} hours)."
+        print(message)
+        logging.info(message)
+    else:
+        if state is not None and not state['completed']:
+            message = f"An unfinished soak state exists at {state_path}; use --resume to continue it or delete it to start over."
+            print(message)
+            logging.error(message)
+            return
+        prepare_test_data(args.primary_ssd_path, args, tree_file_size)
+        state = new_state(config, data_paths)
+        save_state(state_path, state)
+
+    budget = f"{max_seconds / 3600:.2f} hours" if max_seconds else f"{max_cycles} cycles"
+    message = f"Soak run with a budget of {budget}, checkpointing to {state_path}."
+    print(message)
+    logging.info(message)
+    cycle_args = argparse.Namespace(**{**vars(args), 'cycles': 1})
+    try:
+        while not budget_exhausted(state, max_cycles, max_seconds):
+            cycle = state['cycles_completed'] + 1
+            message = f"Soak cycle {cycle} ({state['elapsed_seconds'] / 3600:.2f} hours elapsed)"
+            print(message)
+            logging.info(message)
+            start_time = time.perf_counter()
+            timeline_dir = os.path.join(args.timeline_dir, f"cycle{cycle}") if args.timeline_dir else None
+            results = device_travel(args.primary_ssd_path, args.secondary_ssd_path, cycle_args, block_size, random_block_size, tree_file_size, sample_interval, timeline_dir, backends, keep_data=True)
+            for result in results:
+                result.cycle = cycle
+            record_cycle(state, results, time.perf_counter() - start_time, data_paths)
+            save_state(state_path, state)
+            report_telemetry(results)
+            report_ceilings(results, args.calibration)
+            report_results(args.results, results)
+    except KeyboardInterrupt:
+        message = f"Soak interrupted after {state['cycles_completed']} completed cycles; run again with --resume to continue."
+        print(message)
+        logging.warning(message)
+        return
+
+    state['completed'] = True
+    save_state(state_path, state)
+    for (test, direction, engine, backend), drift in drift_summary(state_results(state)).items():
+        label = f"{engine}, {backend}" if backend else engine
+        message = f"Drift {test} {direction} ({label}): {format_drift(drift)}."
+        print(message)
+        logging.info(message)
+    for path in data_paths:
+        if os.path.exists(path):
+            remove_path(path)
+
+def fanout_travel(devices, args, block_size, random_block_size, tree_file_size, sample_interval, backends):
+    """Run the selected tests on every device at once and report per-device, aggregate and CPU results."""
+    def job(index, device):
+        timeline_dir = os.path.join(args.timeline_dir, f"device{index + 1}") if args.timeline_dir else None
+        results = device_travel(device, None, args, block_size, random_block_size, tree_file_size, sample_interval, timeline_dir, backends)
+        for result in results:
+            result.extra['device_index'] = index + 1
+        return results
+
+    results = []
+    solo_results = {}
+    if args.solo_baseline:
+        for index, device in enumerate(devices):
+            message = f"Solo baseline on device {index + 1} of {len(devices)} ({device})..."
+            print(message)
+            logging.info(message)
+            solo_results[device] = job(index, device)
+            for result in solo_results[device]:
+                result.extra['fanout'] = 'solo'
+            results += solo_results[device]
+
+    message = f"Running tests on {len(devices)} devices concurrently: {', '.join(devices)}"
+    print(message)
+    logging.info(message)
+    fanout = run_fanout(devices, job)
+    for device, device_results in fanout['results'].items():
+        for result in device_results:
+            result.extra['fanout'] = 'concurrent'
+            message = f"Device {result.extra['device_index']} ({device}) {result.test} {result.direction}: {result.mb_per_s:.2f} MB/s"
+            print(message)
+            logging.info(message)
+        results += device_results
+
+    aggregates = aggregate_results(fanout['results'], fanout['cpu'])
+    for aggregate in aggregates:
+        message = f"Aggregate {aggregate.test} {aggregate.direction} over {aggregate.extra['devices']} devices: {aggregate.mb_per_s:.2f} MB/s (slowest device {aggregate.extra['slowest_mb_per_s']:.2f} MB/s, {aggregate.extra['overlap_percent']:.0f}% overlap)."
+        if aggregate.extra['overlap_percent'] < MIN_OVERLAP_PERCENT:
+            message += " The devices ran this pass mostly at different times."
+            print(message)
+            logging.warning(message)
+        else:
+            print(message)
+            logging.info(message)
+    message = f"Fan-out completed in {fanout['seconds']:.2f} seconds. {format_cpu_summary(fanout['cpu'])}."
+    print(message)
+    logging.info(message)
+
+    for device, result, fraction in scaling_report(solo_results, fanout['results']):
+        message = f"Device {result.extra['device_index']} ({device}) {result.test} {result.direction}: {fraction * 100:.0f}% of its solo rate under fan-out."
+        print(message)
+        if fraction < SHARED_BOTTLENECK_FRACTION:
+            logging.warning(message)
+        else:
+            logging.info(message)
+    return results + aggregates
+
+def check_paths(args):
+    """Raise ValueError unless the primary SSD, and the secondary SSD when the selected tests need one, exist."""
+    if not os.path.exists(args.primary_ssd_path):
+        raise ValueError(f"Primary SSD path does not exist: {args.primary_ssd_path}")
+    if args.test in ['external', 'all'] and not args.secondary_ssd_path:
+        raise ValueError("Secondary SSD path is required for external test.")
+    if args.secondary_ssd_path and not os.path.exists(args.secondary_ssd_path):
+        raise ValueError(f"Secondary SSD path does not exist: {args.secondary_ssd_path}")
+
+def sweep_travel(args, parser, sample_interval):
+    """Run every point of a sweep spec's matrix on the primary SSD and report one consolidated table.
+
+    Points that share their test data run back to back, so each test file or tree is prepared once.
+    """
+    try:
+        spec = load_spec(args.spec)
+        base = option_values(parser, spec.get('base', {}))
+        points = [option_values(parser, point) for point in expand_matrix(spec['matrix'])]
+        axes = list(points[0])
+        repeat = int(spec.get('repeat', 1))
+        warmup = float(spec.get('warmup', 0))
+        cooldown = float(spec.get('cooldown', 0))
+        if repeat < 1 or warmup < 0 or cooldown < 0:
+            raise ValueError("Sweep repeat must be at least 1, and warmup and cooldown cannot be negative.")
+        schedule = schedule_points(points, base, repeat, spec.get('randomize', False), spec.get('seed'))
+
+        # Validate every point up front so a typo does not surface hours into the sweep
+        runs = []
+        fio_checked = False
+        for index, point in schedule:
+            point_args = argparse.Namespace(**{**vars(args), **base, **point})
+            sizes = parse_options(point_args)
+            check_paths(point_args)
+            if point_args.copy_engine not in available_copy_engines():
+                raise ValueError(f"Copy engine {point_args.copy_engine} is not supported on this platform. Available: {', '.join(available_copy_engines())}")
+            backends = ['python', 'fio'] if point_args.cross_check else [point_args.backend]
+            if 'fio' in backends and not fio_checked:
+                find_fio(point_args.fio_path)
+                fio_checked = True
+            runs.append((index, point, point_args, sizes, backends))
+    except (ValueError, OSError) as e:
+        message = f"Invalid sweep: {e}"
+        print(message)
+        logging.error(message)
+        return
+
+    message = f"Sweep of {len(points)} points x {repeat} repeats ({len(runs)} runs) over {', '.join(axes)}, {len({prep_key(vars(run[2])) for run in runs})} test data sets."
+    print(message)
+    logging.info(message)
+    if args.dry_run:
+        for number, (index, point, point_args, sizes, backends) in enumerate(runs, 1):
+            print(f"{number:4d}. point {index + 1}: {point_label(point)}")
+        return
+
+    records = []
+    data_key = None
+    for number, (index, point, point_args, sizes, backends) in enumerate(runs, 1):
+        block_size, random_block_size, tree_file_size = sizes
+        if data_key is not None and prep_key(vars(point_args)) != data_key:
+            for path in [os.path.join(args.primary_ssd_path, 'test_file'), os.path.join(args.primary_ssd_path, 'test_tree')]:
+                if os.path.exists(path):
+                    remove_path(path)
+        data_key = prep_key(vars(point_args))
+        if cooldown and number > 1:
+            time.sleep(cooldown)
+        message = f"Sweep run {number} of {len(runs)} (point {index + 1}): {point_label(point)}"
+        print(message)
+        logging.info(message)
+        if warmup:
+            test_file_path, _ = prepare_test_data(args.primary_ssd_path, point_args, tree_file_size)
+            if os.path.isfile(test_file_path):
+                warm_up(test_file_path, warmup)
+        timeline_dir = os.path.join(args.timeline_dir, f"run{number}") if args.timeline_dir else None
+        results = device_travel(args.primary_ssd_path, args.secondary_ssd_path, point_args, block_size, random_block_size, tree_file_size,
+                                sample_interval, timeline_dir, backends, keep_data=True)
+        for result in results:
+            result.extra['sweep_point'] = index + 1
+            result.extra.update({f"sweep_{axis}": value for axis, value in point.items()})
+            records.append((index, point, result))
+        report_telemetry(results)
+        report_ceilings(results, args.calibration)
+        report_results(args.results, results)
+
+    for path in [os.path.join(args.primary_ssd_path, 'test_file'), os.path.join(args.primary_ssd_path, 'test_tree')]:
+        if os.path.exists(path):
+            remove_path(path)
+
+    rows = summarize_sweep(records, axes)
+    message = f"Sweep results:\n{format_table(rows)}"
+    print(message)
+    logging.info(message)
+    if len(axes) >= 2:
+        for (test, direction, engine, backend, others), grid in pivot_table(rows, axes, axes[0], axes[1]).items():
+            context = (f", {backend}" if backend else '') + ''.join(f", {axis}={value}" for axis, value in others)
+            message = f"{test} {direction} MB/s ({engine}{context}):\n{format_pivot(axes[0], axes[1], grid)}"
+            print(message)
+            logging.info(message)
+    if args.heatmap:
+        write_heatmap_csv(args.heatmap, rows)
+        message = f"Sweep heatmap data written to {args.heatmap}."
+        print(message)
+        logging.info(message)
+
+def calibrate_travel(args, block_size, random_block_size, sample_interval):
+    """Run every engine against a RAM-backed directory and store the ceilings as this host's calibration.
+
+    Each sequential and random engine (buffered and direct, threads and, with --processes, the process pool) and each copy
+    engine available here is measured with the same block sizes and queue depth as a device run. Engines that got slower
+    than in the previous calibration are reported, so the calibration doubles as a regression benchmark of the engines;
+    configurations this run did not measure keep their previous ceiling.
+    """
+    target = args.primary_ssd_path
+    if not is_ram_backed(target):
+        message = f"{target} is not on a RAM-backed filesystem ({mount_info(target).get('fs_type', 'unknown')}); the calibration will include the device."
+        print(message)
+        logging.warning(message)
+    needed = 2 * args.file_size * 1024 * 1024 * 1024  # The test file and one copy
+    if shutil.disk_usage(target).free < needed:
+        message = f"Calibration needs {needed // (1024 * 1024 * 1024)}GB free on {target}; use a smaller --file-size."
+        print(message)
+        logging.error(message)
+        return
+
+    test_file_path = os.path.join(target, 'test_file')
+    create_test_file(test_file_path, args.file_size, args.data_pattern)
+    results = []
+    try:
+        buffers = allocate_worker_buffers(args.queue_depth, block_size, args.data_pattern)
+        for io_engine in IO_ENGINES:
+            for processes in sorted({0, args.processes}):
+                for operation in ['write', 'read']:
+                    results.append(train_travel(test_file_path, args.file_size, operation, io_engine, queue_depth=args.queue_depth, block_size=block_size,
+                                                buffers=None if processes else buffers, sample_interval=sample_interval, processes=processes,
+                                                pin_cpus=args.pin_cpus, pattern=args.data_pattern))
+                results += random_travel(test_file_path, args.file_size, args.queue_depth, random_block_size, io_engine, None, args.random_distribution,
+                                         args.random_ops, sample_interval=sample_interval, processes=processes, pin_cpus=args.pin_cpus,
+                                         pattern=args.data_pattern)
+        for copy_engine in available_copy_engines():
+            results += domestic_travel(test_file_path, target, 1, copy_engine, args.copy_buffers, sample_interval)
+    finally:
+        remove_path(test_file_path)
+
+    calibration = build_calibration(results, target)
+    message = f"Engine ceilings on {target}:\n{format_table(calibration_rows(calibration))}"
+    print(message)
+    logging.info(message)
+    previous = load_calibration(args.calibration)
+    if previous is not None and previous['host'].get('hostname') == calibration['host']['hostname']:
+        regressions = compare_calibrations(previous, calibration)
+        for key, before, after, change in regressions:
+            message = f"Regression: {key} {after:.2f} MB/s, {-change:.0f}% slower than the calibration of {previous['created']} ({before:.2f} MB/s)."
+            print(message)
+            logging.warning(message)
+        if not regressions:
+            message = f"No engine is more than {REGRESSION_THRESHOLD:.0f}% slower than the calibration of {previous['created']}."
+            print(message)
+            logging.info(message)
+        # Keep the ceilings of configurations this run did not measure, e.g. another queue depth or block size
+        calibration['engines'] = {**previous['engines'], **calibration['engines']}
+    save_calibration(args.calibration, calibration)
+    message = f"Calibration saved to {args.calibration}; device results within {CEILING_MARGIN * 100:.0f}% of an engine's ceiling will be flagged."
+    print(message)
+    logging.info(message)
+    report_results(args.results, results)
+
+def build_parser(command=None):
+    """Build the command line parser.
+
+    The sweep subcommand takes a spec file first and a few extra options; the calibrate subcommand takes a RAM-backed
+    directory instead of the primary SSD and defaults to a small test file.
+    """
+    parser = argparse.ArgumentParser(prog=f'Intel_Storage_Traveler.py {command}' if command else None, description="NVMe SSD File Transfer Test")
+    if command == 'sweep':
+        parser.add_argument('spec', type=str, help='Sweep spec: a JSON (or, with PyYAML, YAML) file with a matrix of option values to run')
+    if command == 'calibrate':
+        parser.add_argument('primary_ssd_path', type=str, nargs='?', default=DEFAULT_CALIBRATION_TARGET, help=f'RAM-backed directory (tmpfs) to measure the engines against (default: {DEFAULT_CALIBRATION_TARGET})')
+    else:
+        parser.add_argument('primary_ssd_path', type=str, help='Path to the primary SSD')
+    parser.add_argument('--targets', nargs='+', help='More device paths to test at the same time as the primary SSD, each with its own test file and worker pool')
+    parser.add_argument('--solo-baseline', action='store_true', help='With --targets, first run the tests on each device alone to show how much each device loses when all run together')
     parser.add_argument('--secondary_ssd_path', type=str, help='Path to the secondary SSD (required for external test)')
     parser.add_argument('--file-size', type=int, default=50, help='Size of the test file in GB (default: 50GB)')
-    parser.add_argument('--test', choices=['internal', 'external', 'sequential', 'all'], default='all', help='Specify which test to run: internal, external, sequential, or all (default: all)')
+    parser.add_argument('--data-pattern', choices=DATA_PATTERNS, default='random', help='Data written to the test file and by the sequential and random write tests, every 4K sector stamped with its offset: zeros, compressible (~2:1) or random (default: random)')
+    parser.add_argument('--test', choices=['internal', 'external', 'sequential', 'random', 'all'], default='all', help='Specify which test to run: internal, external, sequential, random, or all (internal, external and sequential) (default: all)')
+    parser.add_argument('--random-block-size', type=str, default='4K', help='Block size for the random test, a power of two from 4K to 4M (default: 4K)')
+    parser.add_argument('--read-mix', type=int, help='Percentage of reads in the random test (0-100); by default a pure read pass and a pure write pass are run')
+    parser.add_argument('--random-distribution', choices=ACCESS_DISTRIBUTIONS, default='uniform', help='Access distribution of the random test: uniform, zipf or hotset (90%% of I/O to 10%% of the file) (default: uniform)')
+    parser.add_argument('--random-ops', type=int, default=DEFAULT_RANDOM_OPS, help=f'Number of operations in each random pass (default: {DEFAULT_RANDOM_OPS})')
+    parser.add_argument('--cache', action='store_true', help='Keep the test file in a cache on the primary SSD (traveler_cache) and reuse it on later runs with the same file size and data pattern')
+    parser.add_argument('--cache-quota', type=str, help='Maximum total size of the test-file cache, e.g. 200G; least recently used files are evicted to stay under it (default: no quota, only keep 5%% of the drive free)')
+    parser.add_argument('--workload', choices=['file', 'tree'], default='file', help='What the internal/external tests copy: the single large test file, or a tree of many small files (default: file)')
+    parser.add_argument('--tree-files', type=int, default=DEFAULT_TREE_FILES, help=f'Number of files in the test tree (default: {DEFAULT_TREE_FILES})')
+    parser.add_argument('--tree-file-size', type=str, default='64K', help='Mean file size in the test tree, e.g. 4K, 64K, 2M (default: 64K)')
+    parser.add_argument('--tree-size-distribution', choices=SIZE_DISTRIBUTIONS, default='lognormal', help='File size distribution of the test tree: fixed, uniform or lognormal (default: lognormal)')
+    parser.add_argument('--tree-depth', type=int, default=DEFAULT_TREE_DEPTH, help=f'Directory depth of the test tree (default: {DEFAULT_TREE_DEPTH})')
+    parser.add_argument('--tree-fanout', type=int, default=DEFAULT_TREE_FANOUT, help=f'Subdirectories per directory in the test tree (default: {DEFAULT_TREE_FANOUT})')
+    parser.add_argument('--tree-workers', type=int, default=DEFAULT_TREE_WORKERS, help=f'Worker threads for generating and copying the test tree (default: {DEFAULT_TREE_WORKERS})')
+    parser.add_argument('--copy-engine', choices=COPY_ENGINES, default='shutil', help='Copy engine for the internal/external tests: shutil (copy2 baseline), copy_file_range, sendfile or pipeline (default: shutil)')
+    parser.add_argument('--copy-buffers', type=int, default=DEFAULT_COPY_BUFFERS, help=f'Number of in-flight buffers for the pipeline copy engine (default: {DEFAULT_COPY_BUFFERS})')
+    parser.add_argument('--verify', action='store_true', help='Check every internal/external copy against the source with a fast checksum (xxh3 if xxhash is installed, else CRC32), overlapping the next transfer')
     parser.add_argument('--cycles', type=int, default=1, help='Number of test cycles to run (default: 1)')
+    parser.add_argument('--soak', action='store_true', help='Soak mode: repeat the selected tests for --duration (or --cycles cycles), keeping the test data and checkpointing every completed cycle')
+    parser.add_argument('--duration', type=str, help='Time budget of a soak run, e.g. 90m, 8h or 2d (default: use --cycles)')
+    parser.add_argument('--resume', action='store_true', help='Resume an interrupted soak run from its state file without regenerating the test data')
+    parser.add_argument('--state-file', type=str, help=f'Soak state file (default: {DEFAULT_STATE_FILE} on the primary SSD)')
+    parser.add_argument('--io-engine', choices=IO_ENGINES, default='buffered', help='I/O engine for the sequential test: buffered (page cache) or direct (O_DIRECT, bypasses the page cache) (default: buffered)')
+    parser.add_argument('--dsync', action='store_true', help='Open the test file with O_DSYNC for every pass that writes (sequential, mixed, random and paced) so every write reaches stable storage')
+    parser.add_argument('--paced', action='store_true', help='After the flat-out sequential and random passes, rerun them open-loop at a target rate stepped up to saturation, and report the throughput/latency curve')
+    parser.add_argument('--paced-steps', type=parse_paced_steps, default=','.join(map(str, PACED_STEPS)), help=f'Comma-separated target rates of --paced, in percent of the flat-out rate (default: {",".join(map(str, PACED_STEPS))})')
+    parser.add_argument('--paced-seconds', type=float, default=DEFAULT_PACED_SECONDS, help=f'Duration of each --paced step in seconds (default: {DEFAULT_PACED_SECONDS:g})')
+    parser.add_argument('--sequential-mix', type=int, help='After the sequential write and read passes, run a mixed pass with this percentage of the --queue-depth workers reading while the rest write, at the same time, on separate regions of the test file (Python thread engine only)')
+    parser.add_argument('--queue-depth', type=int, default=1, help='Number of concurrent workers for the sequential test, each owning a disjoint range of the file (default: 1)')
+    parser.add_argument('--processes', type=int, default=0, help='Spread the sequential and random tests over this many processes, each with its own file descriptor and queue-depth/processes threads, to get past the GIL (default: 0, threads in one process)')
+    parser.add_argument('--pin-cpus', action='store_true', help='Pin each --processes worker process to its own CPU')
+    parser.add_argument('--backend', choices=['python', 'fio'], default='python', help='Engine for the sequential and random tests: the built-in Python engines or fio (default: python)')
+    parser.add_argument('--cross-check', action='store_true', help='Run the sequential and random tests with both the Python engines and fio and compare them')
+    parser.add_argument('--fio-ioengine', type=str, default=DEFAULT_FIO_IOENGINE, help=f'fio ioengine for the fio backend, e.g. psync, libaio, io_uring or windowsaio (default: {DEFAULT_FIO_IOENGINE})')
+    parser.add_argument('--fio-path', type=str, help='Path to the fio binary (default: fio on PATH, then a build of the fio submodule)')
+    parser.add_argument('--block-size', type=str, default='1M', help='Block size for the sequential test, a power of two from 4K to 4M (default: 1M)')
+    parser.add_argument('--sample-interval', type=float, default=DEFAULT_SAMPLE_INTERVAL * 1000, help='Throughput sampling interval in milliseconds, 0 to disable (default: 100)')
+    parser.add_argument('--timeline-dir', type=str, help='Directory to export the per-test throughput time series as CSV')
+    parser.add_argument('--telemetry-interval', type=float, default=DEFAULT_TELEMETRY_INTERVAL, help='Seconds between telemetry samples (drive temperature, /proc/diskstats, CPU utilization and frequency) taken alongside the tests, 0 to disable (default: 1)')
+    parser.add_argument('--results', type=str, help='Append structured results to this file: JSON Lines, or CSV if the name ends in .csv')
+    parser.add_argument('--calibration', type=str, default=DEFAULT_CALIBRATION_FILE, help=f'Engine calibration file written by the calibrate subcommand; results within {CEILING_MARGIN * 100:.0f}%% of their engine\'s ceiling are flagged (default: {DEFAULT_CALIBRATION_FILE})')
     parser.add_argument('--log-file', type=str, default='test_log.log', help='Log file path (default: test_log.log)')
-    args = parser.parse_args()
+    if command == 'calibrate':
+        parser.set_defaults(file_size=1)
+    if command == 'sweep':
+        parser.add_argument('--heatmap', type=str, help='Write the sweep summary as a CSV with one row per matrix cell, test and direction')
+        parser.add_argument('--dry-run', action='store_true', help='Print the sweep schedule without running it')
+    return parser
+
+def parse_options(args):
+    """Validate the parsed options and return the sequential block size, random block size and tree file size in bytes."""
+    if args.queue_depth < 1:
+        raise ValueError("Queue depth must be at least 1.")
+    if args.processes < 0:
+        raise ValueError("Process count cannot be negative.")
+    if args.processes and args.queue_depth % args.processes:
+        raise ValueError("Queue depth must be a multiple of --processes, so every process runs the same number of threads.")
+    if args.telemetry_interval < 0:
+        raise ValueError("Telemetry interval cannot be negative.")
+    block_size = parse_block_size(args.block_size)
+    random_block_size = parse_block_size(args.random_block_size)
+    tree_file_size = parse_size(args.tree_file_size)
+    if args.tree_files < 1 or args.tree_depth < 0 or args.tree_fanout < 1 or args.tree_workers < 1:
+        raise ValueError("Tree file count, fanout and workers must be at least 1 and depth at least 0.")
+    if args.workload == 'tree' and args.copy_engine != 'shutil':
+        raise ValueError("The tree workload copies with its own tree engine; --copy-engine applies to the file workload only.")
+    if args.read_mix is not None and not 0 <= args.read_mix <= 100:
+        raise ValueError("Read mix must be a percentage between 0 and 100.")
+    if args.paced:
+        if args.processes or (args.backend == 'fio' and not args.cross_check):
+            raise ValueError("Paced runs use the Python thread engine and cannot be combined with --processes or the fio backend.")
+        if args.paced_seconds <= 0:
+            raise ValueError("Paced step duration must be positive.")
+    if args.sequential_mix is not None:
+        mixed_split(args.queue_depth, args.sequential_mix)
+        if args.processes or (args.backend == 'fio' and not args.cross_check):
+            raise ValueError("The mixed sequential pass runs on the Python thread engine and cannot be combined with --processes or the fio backend.")
+    if args.duration:
+        parse_duration(args.duration)
+    if (args.soak or args.resume) and args.targets:
+        raise ValueError("Soak runs test the primary SSD only and cannot fan out over --targets.")
+    if args.cache_quota:
+        parse_size(args.cache_quota)
+    if args.cache and (args.soak or args.resume):
+        raise ValueError("Soak runs keep their own test data and cannot use the test-file cache.")
+    return block_size, random_block_size, tree_file_size
+
+def main():
+    command = sys.argv[1] if sys.argv[1:2] in [['sweep'], ['calibrate']] else None
+    sweep = command == 'sweep'
+    parser = build_parser(command)
+    args = parser.parse_args(sys.argv[2:] if command else None)
 
     setup_logging(args.log_file)
 
-    test_file_path = os.path.join(args.primary_ssd_path, 'test_file')
+    try:
+        block_size, random_block_size, tree_file_size = parse_options(args)
+        if sweep and (args.soak or args.resume or args.targets):
+            raise ValueError("Sweeps run on the primary SSD only and cannot be combined with --soak or --targets.")
+        if command == 'calibrate' and (args.soak or args.resume or args.targets or args.backend == 'fio' or args.cross_check):
+            raise ValueError("Calibration measures the Python engines on one RAM-backed directory and cannot be combined with --soak, --targets or fio.")
+    except ValueError as e:
+        message = str(e)
+        print(message)
+        logging.error(message)
+        return
+
+    backends = ['python', 'fio'] if args.cross_check else [args.backend]
+    if 'fio' in backends and args.test in ['sequential', 'random', 'all'] and not command:
+        try:
+            fio_path = find_fio(args.fio_path)
+        except FileNotFoundError as e:
+            message = str(e)
+            print(message)
+            logging.error(message)
+            return
+        message = f"Using {fio_version(fio_path)} at {fio_path}."
+        print(message)
+        logging.info(message)
+
+    if args.copy_engine not in available_copy_engines():
+        message = f"Copy engine {args.copy_engine} is not supported on this platform. Available: {', '.join(available_copy_engines())}"
+        print(message)
+        logging.error(message)
+        return
+
+    sample_interval = args.sample_interval / 1000
+
+    if sweep:
+        telemetry = collect_telemetry(args)
+        try:
+            sweep_travel(args, parser, sample_interval)
+        finally:
+            finish_telemetry(telemetry, args.timeline_dir)
+        return
 
     # Ensure primary path is valid
     if not os.path.exists(args.primary_ssd_path):
@@ -185,8 +1112,28 @@ def main():
         logging.error(message)
         return
 
+    if command == 'calibrate':
+        calibrate_travel(args, block_size, random_block_size, sample_interval)
+        return
+
+    for target in args.targets or []:
+        if not os.path.exists(target):
+            message = f"Target path does not exist: {target}"
+            print(message)
+            logging.error(message)
+            return
+
     # Ensure secondary path is valid if needed
-    if args.test in ['external', 'all'] and not args.secondary_ssd_path:
+    if args.targets and args.test in ['external', 'all']:
+        if args.test == 'external':
+            message = "The external test copies between two SSDs and cannot fan out over --targets."
+            print(message)
+            logging.error(message)
+            return
+        message = "The external test is skipped when fanning out over --targets."
+        print(message)
+        logging.warning(message)
+    elif args.test in ['external', 'all'] and not args.secondary_ssd_path:
         message = "Secondary SSD path is required for external test."
         print(message)
         logging.error(message)
@@ -197,22 +1144,26 @@ def main():
         logging.error(message)
         return
 
-    # Create the test file if it doesn't exist
-    if not os.path.exists(test_file_path):
-        create_test_file(test_file_path, args.file_size)
+    telemetry = collect_telemetry(args)
+    try:
+        if args.soak or args.resume:
+            soak_travel(args, block_size, random_block_size, tree_file_size, sample_interval, backends)
+            return
 
-    # Run the specified tests
-    if args.test in ['internal', 'all']:
-        domestic_travel(test_file_path, args.primary_ssd_path, args.cycles)
-    if args.test in ['external', 'all']:
-        interstate_travel(test_file_path, args.primary_ssd_path, args.secondary_ssd_path, args.cycles)
-    if args.test in ['sequential', 'all']:
-        train_travel(test_file_path, args.file_size, operation='write')
-        train_travel(test_file_path, args.file_size, operation='read')
+        devices = [args.primary_ssd_path] + (args.targets or [])
+        if len(devices) == 1:
+            results = device_travel(args.primary_ssd_path, args.secondary_ssd_path, args, block_size, random_block_size, tree_file_size, sample_interval, args.timeline_dir, backends)
+        else:
+            results = fanout_travel(devices, args, block_size, random_block_size, tree_file_size, sample_interval, backends)
 
-    # Delete the test file after all tests are done
-    if os.path.exists(test_file_path):
-        os.remove(test_file_path)
+        if args.cross_check:
+            report_cross_check(results)
+        report_telemetry(results)
+        report_ceilings(results, args.calibration)
+        report_results(args.results, results)
+    finally:
+        finish_telemetry(telemetry, args.timeline_dir)
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # Needed by --processes in the PyInstaller build
     main()
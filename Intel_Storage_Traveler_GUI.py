@@ -1,14 +1,31 @@
 import os
 import sys
-import shutil
+import glob
 import time
+import queue
 import logging
-import subprocess
-import concurrent.futures
 import customtkinter as ctk
 from tkinter import filedialog, messagebox
 from PIL import Image, ImageTk
 import threading
+from collections import deque
+from traveler_events import TravelCancelled, stop_event, open_event_queue, publish, check_stop
+from traveler_copy import DEFAULT_COPY_BUFFERS, available_copy_engines, copy_file
+from traveler_data import generate_test_file
+from traveler_results import make_result, write_results
+from traveler_cache import lookup_test_file, store_test_file, claim_test_file, release_test_file
+from traveler_calibrate import DEFAULT_CALIBRATION_FILE, load_calibration, flag_ceilings
+from traveler_verify import start_verification, finish_verification
+from traveler_fanout import MIN_OVERLAP_PERCENT, run_fanout, aggregate_results, format_cpu_summary
+from traveler_telemetry import (DEFAULT_TELEMETRY_INTERVAL, start_telemetry, stop_telemetry, timeline_telemetry, smart_changes,
+                                format_telemetry)
+from traveler_tree import (DEFAULT_TREE_FILES, DEFAULT_TREE_FILE_SIZE, DEFAULT_TREE_DEPTH, DEFAULT_TREE_FANOUT,
+                           DEFAULT_TREE_WORKERS, generate_tree, copy_tree, remove_path)
+from traveler_metrics import (DEFAULT_SAMPLE_INTERVAL, latency_summary, format_latency, throughput_summary,
+                              analyze_timeline, format_timeline_analysis, write_timeline_csv)
+from traveler_engine import (IO_ENGINES, BLOCK_SIZES, ACCESS_DISTRIBUTIONS, DATA_PATTERNS, DEFAULT_BLOCK_SIZE, DEFAULT_RANDOM_BLOCK_SIZE,
+                             DEFAULT_RANDOM_OPS, run_sequential, run_random, run_mixed, mixed_split, allocate_worker_buffers, parse_block_size,
+                             format_size)
 
 def resource_path(relative_path):
     """This is for the standalone build purpose"""
@@ -28,41 +45,61 @@ def setup_logging(log_file='test_log.log'):
         datefmt='%Y-%m-%d %H:%M:%S'
     )
 
-def create_test_file(file_path, size_gb=50):
-    """Create a test file of the specified size in GB."""
-    message = f"Creating a test file of size {size_gb}GB at {file_path}..."
+def create_test_file(file_path, size_gb=50, pattern='random'):
+    """Create a fully allocated test file of the specified size in GB and data pattern."""
+    message = f"Creating a test file of size {size_gb}GB ({pattern} data) at {file_path}..."
     print_to_terminal(message)
     logging.info(message)
-    with open(file_path, 'wb') as f:
-        f.seek(size_gb * 1024 * 1024 * 1024 - 1)
-        f.write(b'\0')
-    message = "Test file created successfully.\n"
+    stats = generate_test_file(file_path, size_gb * 1024 * 1024 * 1024, pattern)
+    fill_rate = stats['bytes'] / (1024 * 1024) / stats['seconds'] if stats['seconds'] else 0.0
+    message = f"Test file created successfully in {stats['seconds']:.2f} seconds ({fill_rate:.2f} MB/s with {stats['workers']} workers).\n"
     print_to_terminal(message)
     logging.info(message)
 
-def begin_travel(source, destination):
-    """Transfer a file from source to destination and measure the time taken."""
+def create_test_tree(root, file_count=DEFAULT_TREE_FILES, mean_size=DEFAULT_TREE_FILE_SIZE, distribution='lognormal', depth=DEFAULT_TREE_DEPTH, fanout=DEFAULT_TREE_FANOUT, pattern='random', workers=DEFAULT_TREE_WORKERS):
+    """Create a small-file dataset: file_count files of the given mean size spread over a directory tree."""
+    message = f"Creating a test tree of {file_count} files ({format_size(mean_size)} mean, {distribution} sizes, depth {depth}, fanout {fanout}) at {root}..."
+    print_to_terminal(message)
+    logging.info(message)
+    stats = generate_tree(root, file_count, mean_size, distribution, depth, fanout, pattern, workers)
+    message = f"Test tree created successfully in {stats['seconds']:.2f} seconds ({stats['bytes'] / (1024 * 1024):.0f}MB in {stats['files']} files, {stats['directories']} directories).\n"
+    print_to_terminal(message)
+    logging.info(message)
+
+def transfer_engine(source, copy_engine, tree_workers):
+    """Describe the engine begin_travel uses for source: the tree copy for a test tree, the copy engine for a file."""
+    if os.path.isdir(source):
+        return f"tree copy engine, {tree_workers} workers"
+    return f"{copy_engine} copy engine"
+
+def begin_travel(source, destination, copy_engine='shutil', copy_buffers=DEFAULT_COPY_BUFFERS, sample_interval=DEFAULT_SAMPLE_INTERVAL, tree_workers=DEFAULT_TREE_WORKERS):
+    """Transfer a file (or a test tree) from source to destination with the chosen copy engine and return the timing stats."""
     try:
-        start_time = time.time()
-        shutil.copy2(source, destination)
-        end_time = time.time()
-        return end_time - start_time
+        if os.path.isdir(source):
+            return copy_tree(source, destination, tree_workers, sample_interval=sample_interval)
+        return copy_file(source, destination, copy_engine, copy_buffers, sample_interval)
+    except TravelCancelled:
+        raise
     except Exception as e:
         message = f"Error during file transfer from {source} to {destination}: {e}\n"
         print_to_terminal(message)
         logging.error(message)
         return None
 
-def train_travel(file_path, size_gb, cycles=1, queue_depth=4):
-    """Test sequential R/W speed using Python with concurrent operations to simulate higher queue depth."""
-    buffer_size = 1024 * 1024  # 1 MB buffer
+def train_travel(file_path, size_gb, cycles=1, queue_depth=4, io_engine='buffered', dsync=False, block_size=DEFAULT_BLOCK_SIZE, data_pattern='random', sample_interval=DEFAULT_SAMPLE_INTERVAL, sequential_mix=None):
+    """Test sequential R/W speed with queue_depth concurrent workers, each owning a disjoint range of the file.
+
+    With sequential_mix (percent of workers reading), every cycle ends with a pass that reads and writes at the same time.
+    """
     total_size = size_gb * 1024 * 1024 * 1024  # Convert GB to bytes
+    buffers = allocate_worker_buffers(queue_depth, block_size, data_pattern)  # Reused by every cycle
 
-    message = "Starting sequential R/W test...\n"
+    message = f"Starting sequential R/W test ({io_engine} I/O, {format_size(block_size)} blocks, QD{queue_depth})...\n"
     print_to_terminal(message)
     logging.info(message)
 
     total_suite_time = 0
+    results = []
 
     for cycle in range(cycles):
         message = f"Cycle {cycle + 1} of {cycles}"
@@ -71,33 +108,30 @@ def train_travel(file_path, size_gb, cycles=1, queue_depth=4):
 
         start_suite_time = time.time()
 
-        # Read Operation
-        message = f"Testing sequential read speed for {size_gb}GB file..."
-        print_to_terminal(message)
-        logging.info(message)
+        for operation in ['read', 'write']:
+            message = f"Testing sequential {operation} speed for {size_gb}GB file..."
+            print_to_terminal(message)
+            logging.info(message)
 
-        with concurrent.futures.ThreadPoolExecutor(max_workers=queue_depth) as executor:
-            futures = {executor.submit(read_from_file, file_path, buffer_size, total_size // queue_depth): i for i in range(queue_depth)}
-            for future in concurrent.futures.as_completed(futures):
-                index = futures[future]
-                read_time = future.result()
-                message = f"Cycle {cycle + 1}, Concurrent read {index + 1} completed in {read_time:.2f} seconds."
-                print_to_terminal(message)
+            stats = run_sequential(file_path, total_size, operation, queue_depth, block_size, io_engine, dsync, buffers, sample_interval, data_pattern)
+            for index, worker in enumerate(stats['workers']):
+                message = f"Cycle {cycle + 1}, Concurrent {operation} {index + 1} completed in {worker['seconds']:.2f} seconds."
                 logging.info(message)
 
-        # Write Operation
-        message = f"Testing sequential write speed for {size_gb}GB file..."
-        print_to_terminal(message)
-        logging.info(message)
+            throughput = throughput_summary(stats['bytes'], stats['seconds'], stats['histogram'])
+            message = f"Cycle {cycle + 1}, Sequential {operation} completed in {stats['seconds']:.2f} seconds ({throughput['mb_per_s']:.2f} MB/s, {throughput['iops']:.0f} IOPS)."
+            print_to_terminal(message)
+            logging.info(message)
+            report_latency(operation.capitalize(), stats['histogram'])
+            report_timeline(f"Sequential {operation}", f"sequential_{operation}_cycle{cycle + 1}", stats['timeline'])
+            message = f"Python overhead: {stats['python_overhead'] * 100:.1f}% of worker time."
+            print_to_terminal(message)
+            logging.info(message)
+            results.append(make_result('sequential', operation, cycle + 1, stats, io_engine, file_path, block_size, queue_depth,
+                                       direct=stats['direct'], python_overhead=stats['python_overhead']))
 
-        with concurrent.futures.ThreadPoolExecutor(max_workers=queue_depth) as executor:
-            futures = {executor.submit(write_to_file, file_path, buffer_size, total_size // queue_depth): i for i in range(queue_depth)}
-            for future in concurrent.futures.as_completed(futures):
-                index = futures[future]
-                write_time = future.result()
-                message = f"Cycle {cycle + 1}, Concurrent write {index + 1} completed in {write_time:.2f} seconds."
-                print_to_terminal(message)
-                logging.info(message)
+        if sequential_mix is not None:
+            results += mixed_travel(file_path, size_gb, sequential_mix, cycle + 1, queue_depth, io_engine, dsync, block_size, buffers, sample_interval, results[-2:], data_pattern)
 
         end_suite_time = time.time()
         cycle_time = end_suite_time - start_suite_time
@@ -110,42 +144,274 @@ def train_travel(file_path, size_gb, cycles=1, queue_depth=4):
     message = f"Total time for {cycles} sequential R/W cycles: {total_suite_time:.2f} seconds."
     print_to_terminal(message)
     logging.info(message)
+    return results
+
+def mixed_travel(file_path, size_gb, read_percent, cycle=1, queue_depth=4, io_engine='buffered', dsync=False, block_size=DEFAULT_BLOCK_SIZE, buffers=None, sample_interval=DEFAULT_SAMPLE_INTERVAL, baselines=None, pattern='random'):
+    """Test sequential reads and writes running at the same time, and compare them with the read and write passes run alone."""
+    readers = mixed_split(queue_depth, read_percent)
+    message = f"Testing mixed sequential read/write for {size_gb}GB file ({readers} readers and {queue_depth - readers} writers at once)..."
+    print_to_terminal(message)
+    logging.info(message)
+    stats = run_mixed(file_path, size_gb * 1024 * 1024 * 1024, read_percent, queue_depth, block_size, io_engine, dsync, buffers, sample_interval, pattern)
+    report_timeline("Mixed read/write", f"sequential_mixed{read_percent}_cycle{cycle}", stats['timeline'])
+
+    results = []
+    alone = {result.direction: result for result in baselines or []}
+    for direction in ['read', 'write']:
+        direction_stats = {'bytes': stats[f'{direction}_bytes'], 'seconds': stats['seconds'], 'started': stats['started'],
+                           'histogram': stats[f'{direction}_histogram']}
+        result = make_result('mixed', direction, cycle, direction_stats, io_engine, file_path, block_size, queue_depth,
+                             read_percent=read_percent, readers=stats['readers'], writers=stats['writers'], direct=stats['direct'],
+                             python_overhead=stats['python_overhead'])
+        message = f"Cycle {cycle}, Mixed {direction}: {result.mb_per_s:.2f} MB/s, {format_latency(result.latency)}"
+        baseline = alone.get(direction)
+        if baseline is not None and baseline.latency and baseline.latency['p99_us']:
+            change = (result.latency['p99_us'] / baseline.latency['p99_us'] - 1) * 100
+            message += f" (p99 {change:+.0f}% against the {direction} pass alone)"
+            result.extra['p99_change_percent'] = change
+        print_to_terminal(message + ".")
+        logging.info(message)
+        results.append(result)
+    return results
 
-def write_to_file(file_path, buffer_size, size):
-    """Write data to a file and return the time taken."""
-    start_time = time.time()
-    with open(file_path, 'wb') as f:
-        written = 0
-        while written < size:
-            f.write(b'\0' * buffer_size)
-            written += buffer_size
-    end_time = time.time()
-    return end_time - start_time
-
-def read_from_file(file_path, buffer_size, size):
-    """Read data from a file and return the time taken."""
-    start_time = time.time()
-    with open(file_path, 'rb') as f:
-        read = 0
-        while read < size:
-            f.read(buffer_size)
-            read += buffer_size
-    end_time = time.time()
-    return end_time - start_time
+def random_travel(file_path, size_gb, cycles=1, queue_depth=4, io_engine='buffered', dsync=False, block_size=DEFAULT_RANDOM_BLOCK_SIZE, distribution='uniform', ops=DEFAULT_RANDOM_OPS, sample_interval=DEFAULT_SAMPLE_INTERVAL, pattern='random'):
+    """Test random read and write IOPS with queue_depth concurrent workers."""
+    total_size = size_gb * 1024 * 1024 * 1024  # Convert GB to bytes
+    buffers = allocate_worker_buffers(queue_depth, block_size, pattern)
+
+    message = f"Starting random R/W test ({io_engine} I/O, {format_size(block_size)} blocks, QD{queue_depth}, {distribution})...\n"
+    print_to_terminal(message)
+    logging.info(message)
+    results = []
+
+    for cycle in range(cycles):
+        message = f"Cycle {cycle + 1} of {cycles}"
+        print_to_terminal(message)
+        logging.info(message)
+
+        for operation, read_percent in [('read', 100), ('write', 0)]:
+            stats = run_random(file_path, total_size, queue_depth, block_size, io_engine, read_percent, distribution, ops,
+                               dsync=dsync, buffers=buffers, sample_interval=sample_interval, pattern=pattern)
+            throughput = throughput_summary(stats['bytes'], stats['seconds'], stats['histogram'])
+            message = f"Cycle {cycle + 1}, Random {operation} completed in {stats['seconds']:.2f} seconds ({throughput['iops']:.0f} IOPS, {throughput['mb_per_s']:.2f} MB/s)."
+            print_to_terminal(message)
+            logging.info(message)
+            report_latency(f"Random {operation}", stats['histogram'])
+            results.append(make_result('random', operation, cycle + 1, stats, io_engine, file_path, block_size, queue_depth,
+                                       read_percent=read_percent, distribution=distribution, direct=stats['direct'],
+                                       python_overhead=stats['python_overhead']))
+        print_to_terminal("")
+
+    return results
 
 def print_to_terminal(message):
-    """Print message to the text widget terminal."""
-    terminal_text.configure(state='normal')
-    terminal_text.insert(ctk.END, message + '\n')
-    terminal_text.configure(state='disabled')
-    terminal_text.see(ctk.END)
-
-def domestic_travel(file_path, primary_ssd_path, cycles=1):
-    """Test transferring a file within the primary SSD."""
-    message = "Starting internal file transfer test...\n"
+    """Queue message for the text widget terminal; safe to call from the test thread, which never waits on Tk."""
+    publish('message', text=message)
+
+def drain_events():
+    """Apply the queued events to the terminal and the chart in one batch, then reschedule; runs on the Tk main loop."""
+    lines = []
+    redraw = False
+    for _ in range(MAX_EVENTS_PER_DRAIN):
+        try:
+            kind, fields = events.get_nowait()
+        except queue.Empty:
+            break
+        if kind == 'message':
+            lines.append(fields['text'])
+        elif kind == 'sample':
+            if not fields['seconds']:
+                chart_rates.clear()  # A new test started
+            elif last_sample[0] is not None and fields['seconds'] > last_sample[0]:
+                rate = (fields['bytes'] - last_sample[1]) / (1024 * 1024) / (fields['seconds'] - last_sample[0])
+                chart_rates.append((fields['seconds'], rate))
+            last_sample[:] = [fields['seconds'], fields['bytes']]
+            redraw = True
+        elif kind == 'result' and fields['p99_us'] is not None:
+            chart_latencies.append((f"{fields['test'][:3]} {fields['direction'][:5]}", fields['p99_us']))
+            redraw = True
+        elif kind == 'done':
+            start_button.configure(state='normal')
+            stop_button.configure(state='disabled')
+
+    if lines:
+        terminal_text.configure(state='normal')
+        terminal_text.insert(ctk.END, '\n'.join(lines) + '\n')
+        terminal_text.configure(state='disabled')
+        terminal_text.see(ctk.END)
+    if redraw:
+        draw_chart()
+    root.after(DRAIN_INTERVAL_MS, drain_events)
+
+def draw_chart():
+    """Draw the live MB/s of the running test on the left and the p99 latency of the last completed tests on the right."""
+    chart.delete('all')
+    split = CHART_WIDTH * 2 // 3
+    bottom = CHART_HEIGHT - 20
+    if len(chart_rates) >= 2:
+        peak = max(rate for _, rate in chart_rates) or 1.0
+        first, last = chart_rates[0][0], chart_rates[-1][0]
+        points = []
+        for seconds, rate in chart_rates:
+            points += [10 + (seconds - first) / ((last - first) or 1.0) * (split - 20), bottom - rate / peak * (bottom - 25)]
+        chart.create_line(*points, fill='#0071c5', width=2)
+        chart.create_text(10, 5, anchor='nw', text=f"{chart_rates[-1][1]:.0f} MB/s (peak {peak:.0f} MB/s)")
+    latencies = list(chart_latencies)
+    if latencies:
+        worst = max(latency for _, latency in latencies) or 1.0
+        width = (CHART_WIDTH - split - 10) / len(latencies)
+        for i, (label, latency) in enumerate(latencies):
+            x = split + 5 + i * width
+            chart.create_rectangle(x + 2, bottom - latency / worst * (bottom - 25), x + width - 2, bottom, fill='#00c7fd', outline='')
+            chart.create_text(x + width / 2, bottom + 10, text=label, font=('TkDefaultFont', 7))
+        chart.create_text(split + 5, 5, anchor='nw', text=f"p99 latency (max {worst:.0f}us)")
+
+def report_results(results_path, results):
+    """Write the collected results to a JSON Lines or CSV file."""
+    if not results_path or not results:
+        return
+    write_results(results_path, results)
+    message = f"{len(results)} results written to {results_path}."
+    print_to_terminal(message)
+    logging.info(message)
+
+def report_timeline(label, name, timeline, timeline_dir=None, started=None):
+    """Report burst and sustained bandwidth of a test and optionally export its throughput time series with the telemetry covering it."""
+    if not timeline:
+        return
+    message = f"{label}: {format_timeline_analysis(analyze_timeline(timeline))}"
+    print_to_terminal(message)
+    logging.info(message)
+    if timeline_dir:
+        timeline_path = os.path.join(timeline_dir, f"{name}.csv")
+        write_timeline_csv(timeline_path, timeline, timeline_telemetry(timeline, started))
+        logging.info(f"Throughput timeline saved to {timeline_path}")
+
+def report_telemetry(results):
+    """Report the device and CPU telemetry recorded during each test."""
+    for result in results:
+        if result.telemetry:
+            message = f"Telemetry during {result.test} {result.direction} (cycle {result.cycle}): {format_telemetry(result.telemetry)}."
+            print_to_terminal(message)
+            logging.info(message)
+
+def report_ceilings(results):
+    """Flag results that came close to the ceiling of their engine measured by the command line calibrate subcommand."""
+    calibration = load_calibration(DEFAULT_CALIBRATION_FILE)
+    if calibration is None:
+        return
+    for result in flag_ceilings(results, calibration):
+        message = (f"{result.test.capitalize()} {result.direction} reached {result.extra['ceiling_percent']:.0f}% of the {result.engine} engine's "
+                   f"ceiling on RAM ({result.extra['ceiling_mb_per_s']:.2f} MB/s): Traveler, not the drive, may be the limit.")
+        print_to_terminal(message)
+        logging.warning(message)
+
+def collect_telemetry(paths):
+    """Start sampling the devices holding paths and the CPU in the background, and report their filesystems."""
+    collector = start_telemetry(paths, DEFAULT_TELEMETRY_INTERVAL)
+    for path, info in collector['environment']['paths'].items():
+        message = f"{path}: {info.get('fs_type', 'unknown')} filesystem mounted {info.get('mount_options', '')}"
+        if 'model' in info:
+            message += f", {info['model']} firmware {info.get('firmware', 'unknown')}"
+        print_to_terminal(message + ".")
+        logging.info(message)
+    return collector
+
+def finish_telemetry(collector):
+    """Stop the telemetry collector and report peak temperatures and SMART counters that changed."""
+    stop_telemetry(collector)
+    for name, device in collector['devices'].items():
+        temperatures = [sample[f"{name}_temp_c"] for sample in collector['samples'] if f"{name}_temp_c" in sample]
+        if temperatures:
+            message = f"{name} temperature: {min(temperatures):.0f}-{max(temperatures):.0f}C during the run."
+            print_to_terminal(message)
+            logging.info(message)
+        changes = smart_changes(device)
+        if changes:
+            message = f"{name} SMART counters changed during the run: {', '.join(f'{field} +{change}' for field, change in changes.items())}."
+            print_to_terminal(message)
+            logging.warning(message)
+
+def report_latency(label, histogram):
+    """Report the latency percentiles of a histogram."""
+    message = f"{label} latency: {format_latency(latency_summary(histogram))}"
+    print_to_terminal(message)
+    logging.info(message)
+
+def report_chunk_latency(transfer):
+    """Report per-chunk copy latency when the copy engine works in chunks, or per-file latency for a tree copy."""
+    if 'files' in transfer:
+        report_latency("Per-file copy", transfer['histogram'])
+        return
+    if transfer['read_histogram'] is not None:
+        report_latency("Chunk read", transfer['read_histogram'])
+    if transfer['histogram'] is not None:
+        report_latency("Chunk write" if transfer['read_histogram'] is not None else "Chunk copy", transfer['histogram'])
+
+def transfer_rate(transfer):
+    """Return the throughput of a transfer in MB/s."""
+    return transfer['bytes'] / (1024 * 1024) / transfer['seconds'] if transfer['seconds'] else 0.0
+
+def file_rate(transfer):
+    """Describe the files per second of a tree copy (empty for a single-file transfer)."""
+    if 'files' not in transfer or not transfer['seconds']:
+        return ""
+    return f", {transfer['files'] / transfer['seconds']:.0f} files/s"
+
+def start_verify(test, cycle, source, copies, transfer_results, source_digests):
+    """Start checking the copies of a cycle against the source in the background, overlapping the next transfer."""
+    message = f"Verifying {len(copies)} {'copy' if len(copies) == 1 else 'copies'} of cycle {cycle} in the background..."
+    logging.info(message)
+    return {'test': test, 'cycle': cycle, 'copies': copies, 'results': transfer_results,
+            'verification': start_verification(source, copies, source_digests=source_digests)}
+
+def verify_overlap(pending):
+    """Return the extra result fields of a transfer about to start: verify_overlapped if the previous cycle is still being verified."""
+    return {'verify_overlapped': True} if pending is not None and pending['verification']['thread'].is_alive() else {}
+
+def overlap_note(overlap):
+    """Mention in a transfer report that the transfer shared the drive with a verification."""
+    return ", overlapped verification" if overlap else ""
+
+def finish_verify(pending):
+    """Wait for a background verification, report it, delete the checked copies and return its result."""
+    try:
+        stats = finish_verification(pending['verification'])
+    except (OSError, ValueError) as e:
+        stats = None
+        message = f"Verification of cycle {pending['cycle']} failed: {e}"
+        print_to_terminal(message)
+        logging.error(message)
+    for path in pending['copies']:
+        if os.path.exists(path):
+            remove_path(path)  # Clean up
+    if stats is None:
+        return []
+
+    if stats['mismatches']:
+        for mismatch in stats['mismatches']:
+            logging.error(f"Data mismatch: {mismatch}.")
+        message = f"DATA MISMATCH in cycle {pending['cycle']}: {len(stats['mismatches'])} of {stats['files'] * stats['copies']} copied files differ from the source (see the log)."
+        print_to_terminal(message)
+        logging.error(message)
+    else:
+        message = f"Verified {stats['copies']} {'copy' if stats['copies'] == 1 else 'copies'} of cycle {pending['cycle']} in {stats['seconds']:.2f} seconds ({transfer_rate(stats):.2f} MB/s hashed, {stats['algorithm']})."
+        print_to_terminal(message)
+        logging.info(message)
+    for result in pending['results']:
+        result.extra['verified'] = not stats['mismatches']
+    return [make_result(pending['test'], 'verify', pending['cycle'], stats, stats['algorithm'], pending['copies'][0],
+                        copies=stats['copies'], mismatches=stats['mismatches'])]
+
+def domestic_travel(file_path, primary_ssd_path, cycles=1, copy_engine='shutil', copy_buffers=DEFAULT_COPY_BUFFERS, sample_interval=DEFAULT_SAMPLE_INTERVAL, timeline_dir=None, tree_workers=DEFAULT_TREE_WORKERS, verify=False):
+    """Test transferring a file (or test tree) within the primary SSD, optionally verifying every copy."""
+    message = f"Starting internal file transfer test ({transfer_engine(file_path, copy_engine, tree_workers)})...\n"
     print_to_terminal(message)
     logging.info(message)
     total_suite_time = 0
+    results = []
+    pending = None
+    source_digests = {}
 
     for cycle in range(cycles):
         message = f"Cycle {cycle + 1} of {cycles}"
@@ -153,14 +419,25 @@ def domestic_travel(file_path, primary_ssd_path, cycles=1):
         logging.info(message)
         start_suite_time = time.time()
 
-        destination_path = os.path.join(primary_ssd_path, 'internal_test_copy')
-        transfer_time = begin_travel(file_path, destination_path)
+        # With verify, each cycle copies to its own destination so the previous copy can be checked meanwhile
+        destination_path = os.path.join(primary_ssd_path, f'internal_test_copy_{cycle + 1}' if verify else 'internal_test_copy')
+        overlap = verify_overlap(pending)
+        transfer = begin_travel(file_path, destination_path, copy_engine, copy_buffers, sample_interval, tree_workers)
+        if pending is not None:
+            results += finish_verify(pending)
+            pending = None
         
-        if transfer_time is not None:
-            message = f"Internal file transfer completed in {transfer_time:.2f} seconds."
+        if transfer is not None:
+            message = f"Internal file transfer completed in {transfer['seconds']:.2f} seconds ({transfer_rate(transfer):.2f} MB/s{file_rate(transfer)}, {transfer['engine']}{overlap_note(overlap)})."
             print_to_terminal(message)
             logging.info(message)
-            os.remove(destination_path)
+            report_chunk_latency(transfer)
+            report_timeline("Internal transfer", f"internal_cycle{cycle + 1}", transfer['timeline'], timeline_dir, transfer.get('started'))
+            results.append(make_result('internal', 'copy', cycle + 1, transfer, transfer['engine'], destination_path, **overlap))
+            if verify:
+                pending = start_verify('internal', cycle + 1, file_path, [destination_path], results[-1:], source_digests)
+            else:
+                remove_path(destination_path)
         else:
             message = "\nInternal file transfer failed."
             print_to_terminal(message)
@@ -173,16 +450,23 @@ def domestic_travel(file_path, primary_ssd_path, cycles=1):
         print_to_terminal(message)
         logging.info(message)
 
+    if pending is not None:
+        results += finish_verify(pending)
+
     message = f"Total time for {cycles} internal file transfer cycles: {total_suite_time:.2f} seconds."
     print_to_terminal(message)
     logging.info(message)
+    return results
 
-def interstate_travel(file_path, primary_ssd_path, secondary_ssd_path, cycles=1):
-    """Test transferring a file from primary to secondary SSD and back."""
-    message = "Starting external file transfer test...\n"
+def interstate_travel(file_path, primary_ssd_path, secondary_ssd_path, cycles=1, copy_engine='shutil', copy_buffers=DEFAULT_COPY_BUFFERS, sample_interval=DEFAULT_SAMPLE_INTERVAL, timeline_dir=None, tree_workers=DEFAULT_TREE_WORKERS, verify=False):
+    """Test transferring a file (or test tree) from primary to secondary SSD and back, optionally verifying both copies."""
+    message = f"Starting external file transfer test ({transfer_engine(file_path, copy_engine, tree_workers)})...\n"
     print_to_terminal(message)
     logging.info(message)
     total_suite_time = 0
+    results = []
+    pending = None
+    source_digests = {}
 
     for cycle in range(cycles):
         message = f"Cycle {cycle + 1} of {cycles}"
@@ -191,29 +475,49 @@ def interstate_travel(file_path, primary_ssd_path, secondary_ssd_path, cycles=1)
         start_suite_time = time.time()
 
         # Transfer from primary to secondary
-        destination_path = os.path.join(secondary_ssd_path, 'external_test_copy')
-        transfer_time_to_secondary = begin_travel(file_path, destination_path)
+        suffix = f'_{cycle + 1}' if verify else ''
+        destination_path = os.path.join(secondary_ssd_path, 'external_test_copy' + suffix)
+        overlap = verify_overlap(pending)
+        transfer_to_secondary = begin_travel(file_path, destination_path, copy_engine, copy_buffers, sample_interval, tree_workers)
+        if pending is not None:
+            results += finish_verify(pending)
+            pending = None
         
-        if transfer_time_to_secondary is not None:
-            message = f"Transfer to secondary storage completed in {transfer_time_to_secondary:.2f} seconds."
+        if transfer_to_secondary is not None:
+            message = f"Transfer to secondary storage completed in {transfer_to_secondary['seconds']:.2f} seconds ({transfer_rate(transfer_to_secondary):.2f} MB/s{file_rate(transfer_to_secondary)}, {transfer_to_secondary['engine']}{overlap_note(overlap)})."
             print_to_terminal(message)
             logging.info(message)
+            report_chunk_latency(transfer_to_secondary)
+            report_timeline("Transfer to secondary", f"external_to_secondary_cycle{cycle + 1}", transfer_to_secondary['timeline'], timeline_dir, transfer_to_secondary.get('started'))
+            results.append(make_result('external', 'to_secondary', cycle + 1, transfer_to_secondary, transfer_to_secondary['engine'], destination_path, **overlap))
+            copies = [destination_path]
+            transfer_results = results[-1:]
             
             # Transfer back from secondary to primary
-            return_path = os.path.join(primary_ssd_path, 'external_test_return_copy')
-            transfer_time_to_primary = begin_travel(destination_path, return_path)
+            return_path = os.path.join(primary_ssd_path, 'external_test_return_copy' + suffix)
+            transfer_to_primary = begin_travel(destination_path, return_path, copy_engine, copy_buffers, sample_interval, tree_workers)
             
-            if transfer_time_to_primary is not None:
-                message = f"Transfer back to primary storage completed in {transfer_time_to_primary:.2f} seconds."
+            if transfer_to_primary is not None:
+                message = f"Transfer back to primary storage completed in {transfer_to_primary['seconds']:.2f} seconds ({transfer_rate(transfer_to_primary):.2f} MB/s{file_rate(transfer_to_primary)}, {transfer_to_primary['engine']})."
                 print_to_terminal(message)
                 logging.info(message)
-                os.remove(return_path)
+                report_chunk_latency(transfer_to_primary)
+                report_timeline("Transfer back to primary", f"external_to_primary_cycle{cycle + 1}", transfer_to_primary['timeline'], timeline_dir, transfer_to_primary.get('started'))
+                results.append(make_result('external', 'to_primary', cycle + 1, transfer_to_primary, transfer_to_primary['engine'], return_path))
+                if verify:
+                    copies.append(return_path)
+                    transfer_results += results[-1:]
+                else:
+                    remove_path(return_path)
             else:
                 message = "\nTransfer back to primary SSD failed."
                 print_to_terminal(message)
                 logging.warning(message)
             
-            os.remove(destination_path)
+            if verify:
+                pending = start_verify('external', cycle + 1, file_path, copies, transfer_results, source_digests)
+            else:
+                remove_path(destination_path)
         else:
             message = "\nTransfer to secondary storage failed."
             print_to_terminal(message)
@@ -226,23 +530,108 @@ def interstate_travel(file_path, primary_ssd_path, secondary_ssd_path, cycles=1)
         print_to_terminal(message)
         logging.info(message)
 
+    if pending is not None:
+        results += finish_verify(pending)
+
     message = f"Total time for {cycles} external file transfer cycles: {total_suite_time:.2f} seconds."
     print_to_terminal(message)
     logging.info(message)
+    return results
 
-def run_tests(primary_ssd_path, secondary_ssd_path, file_size, test_type, cycles, log_file, queue_depth):
-    setup_logging(log_file)
+def device_travel(primary_ssd_path, secondary_ssd_path, file_size, test_type, cycles, queue_depth, io_engine='buffered', dsync=False, block_size=DEFAULT_BLOCK_SIZE, data_pattern='random', copy_engine='shutil', distribution='uniform', workload='file', cache=False, verify=False, sequential_mix=None):
+    """Create the test data on one device, run the selected tests on it and clean up, keeping a cached test file."""
     test_file_path = os.path.join(primary_ssd_path, 'test_file')
+    if cache:
+        test_file_path, cached = lookup_test_file(primary_ssd_path, file_size * 1024 * 1024 * 1024, data_pattern)
+        if cached:
+            message = f"Reusing cached test file {test_file_path}.\n"
+            print_to_terminal(message)
+            logging.info(message)
+
+    # Create the test file (and test tree) if they don't exist
+    transfer_source = test_file_path
+    if workload == 'tree' and test_type in ['internal', 'external', 'all']:
+        transfer_source = os.path.join(primary_ssd_path, 'test_tree')
+        if not os.path.exists(transfer_source):
+            create_test_tree(transfer_source, pattern=data_pattern)
+    if transfer_source == test_file_path or test_type in ['sequential', 'random', 'all']:
+        if not os.path.exists(test_file_path):
+            create_test_file(test_file_path, file_size, data_pattern)
+            if cache:
+                store_test_file(primary_ssd_path, test_file_path, file_size * 1024 * 1024 * 1024, data_pattern)
+    # Every sequential and random run writes to the test file; it is marked until release_test_file checksums it again
+    writes = test_type not in ['internal', 'external']
+    if cache and writes:
+        claim_test_file(primary_ssd_path, test_file_path)
+
+    # Run the specified tests
+    results = []
+    if test_type in ['internal', 'all']:
+        results += domestic_travel(transfer_source, primary_ssd_path, cycles, copy_engine, verify=verify)
+    if test_type in ['external', 'all'] and secondary_ssd_path:
+        results += interstate_travel(transfer_source, primary_ssd_path, secondary_ssd_path, cycles, copy_engine, verify=verify)
+    if test_type in ['sequential', 'all']:
+        results += train_travel(test_file_path, file_size, cycles, queue_depth, io_engine, dsync, block_size, data_pattern, sequential_mix=sequential_mix)
+
+    if test_type == 'random':
+        results += random_travel(test_file_path, file_size, cycles, queue_depth, io_engine, dsync, DEFAULT_RANDOM_BLOCK_SIZE, distribution, pattern=data_pattern)
 
-    # Ensure primary path is valid
-    if not os.path.exists(primary_ssd_path):
-        message = f"Primary SSD path does not exist: {primary_ssd_path}"
+    # Delete the test file and test tree after all tests are done
+    if os.path.exists(transfer_source) and transfer_source != test_file_path:
+        remove_path(transfer_source)
+    if os.path.exists(test_file_path):
+        if cache:
+            release_test_file(primary_ssd_path, test_file_path, writes)
+        else:
+            os.remove(test_file_path)
+    return results
+
+def fanout_travel(devices, *test_args):
+    """Run the selected tests on every device at once and report aggregate and CPU results."""
+    message = f"Running tests on {len(devices)} devices concurrently...\n"
+    print_to_terminal(message)
+    logging.info(message)
+    fanout = run_fanout(devices, lambda index, device: device_travel(device, None, *test_args))
+    check_stop()
+
+    results = []
+    for device_results in fanout['results'].values():
+        results += device_results
+    aggregates = aggregate_results(fanout['results'], fanout['cpu'])
+    for aggregate in aggregates:
+        message = f"Aggregate {aggregate.test} {aggregate.direction} over {aggregate.extra['devices']} devices: {aggregate.mb_per_s:.2f} MB/s (slowest device {aggregate.extra['slowest_mb_per_s']:.2f} MB/s, {aggregate.extra['overlap_percent']:.0f}% overlap)."
+        if aggregate.extra['overlap_percent'] < MIN_OVERLAP_PERCENT:
+            message += " The devices ran this pass mostly at different times."
+            print_to_terminal(message)
+            logging.warning(message)
+        else:
+            print_to_terminal(message)
+            logging.info(message)
+    message = f"{format_cpu_summary(fanout['cpu'])}."
+    print_to_terminal(message)
+    logging.info(message)
+    return results + aggregates
+
+def run_tests(primary_ssd_path, secondary_ssd_path, file_size, test_type, cycles, log_file, queue_depth, io_engine='buffered', dsync=False, block_size=DEFAULT_BLOCK_SIZE, data_pattern='random', copy_engine='shutil', results_path='', distribution='uniform', workload='file', targets='', cache=False, verify=False, sequential_mix=None):
+    setup_logging(log_file)
+    devices = [primary_ssd_path] + [target.strip() for target in targets.split(';') if target.strip()]
+
+    # Ensure primary path and any additional targets are valid
+    for device in devices:
+        if not os.path.exists(device):
+            message = f"SSD path does not exist: {device}"
+            print_to_terminal(message)
+            logging.error(message)
+            return
+
+    # Ensure secondary path is valid if needed
+    if len(devices) > 1 and test_type == 'external':
+        message = "The external test copies between two SSDs and cannot fan out over additional targets."
         print_to_terminal(message)
         logging.error(message)
         return
 
-    # Ensure secondary path is valid if needed
-    if test_type in ['external', 'all'] and not secondary_ssd_path:
+    if len(devices) == 1 and test_type in ['external', 'all'] and not secondary_ssd_path:
         message = "Secondary SSD path is required for external test."
         print_to_terminal(message)
         logging.error(message)
@@ -254,24 +643,59 @@ def run_tests(primary_ssd_path, secondary_ssd_path, file_size, test_type, cycles
         logging.error(message)
         return
 
-    # Create the test file if it doesn't exist
-    if not os.path.exists(test_file_path):
-        create_test_file(test_file_path, file_size)
+    if sequential_mix is not None:
+        try:
+            mixed_split(queue_depth, sequential_mix)
+        except ValueError as e:
+            message = str(e)
+            print_to_terminal(message)
+            logging.error(message)
+            return
 
-    # Run the specified tests
-    if test_type in ['internal', 'all']:
-        domestic_travel(test_file_path, primary_ssd_path, cycles)
-    if test_type in ['external', 'all']:
-        interstate_travel(test_file_path, primary_ssd_path, secondary_ssd_path, cycles)
-    if test_type in ['sequential', 'all']:
-        train_travel(test_file_path, file_size, cycles, queue_depth)
+    test_args = (file_size, test_type, cycles, queue_depth, io_engine, dsync, block_size, data_pattern, copy_engine, distribution, workload, cache, verify, sequential_mix)
+    telemetry = collect_telemetry(devices + ([secondary_ssd_path] if secondary_ssd_path else []))
+    try:
+        if len(devices) == 1:
+            results = device_travel(primary_ssd_path, secondary_ssd_path, *test_args)
+        else:
+            results = fanout_travel(devices, *test_args)
+    except TravelCancelled:
+        for device in devices:
+            remove_test_data(device, secondary_ssd_path if device == primary_ssd_path else None)
+        message = "\n***Tests Stopped***\n"
+        print_to_terminal(message)
+        logging.warning(message)
+        return
+    finally:
+        finish_telemetry(telemetry)
 
-    # Delete the test file after all tests are done
-    if os.path.exists(test_file_path):
-        os.remove(test_file_path)
-        message = "\n***All Tests Completed***\n"
+    report_telemetry(results)
+    report_ceilings(results)
+    report_results(results_path, results)
+    message = "\n***All Tests Completed***\n"
+    print_to_terminal(message)
+    logging.info(message)
+
+def remove_test_data(primary_ssd_path, secondary_ssd_path=None):
+    """Delete the test data and any copies a stopped run left behind (a cached test file is kept)."""
+    paths = [os.path.join(primary_ssd_path, 'test_file'), os.path.join(primary_ssd_path, 'test_tree')]
+    paths += glob.glob(os.path.join(primary_ssd_path, 'internal_test_copy*')) + glob.glob(os.path.join(primary_ssd_path, 'external_test_return_copy*'))
+    if secondary_ssd_path:
+        paths += glob.glob(os.path.join(secondary_ssd_path, 'external_test_copy*'))
+    for path in paths:
+        if os.path.exists(path):
+            remove_path(path)
+
+def test_worker(*args):
+    """Run the tests on the worker thread and tell the main loop when they are over."""
+    try:
+        run_tests(*args)
+    except Exception as e:
+        message = f"Tests failed: {e}"
         print_to_terminal(message)
-        logging.info(message)
+        logging.error(message)
+    finally:
+        publish('done')
 
 def select_primary_ssd():
     path = filedialog.askdirectory(title="Select Primary SSD Path")
@@ -283,19 +707,55 @@ def select_secondary_ssd():
 
 def start_test():
     try:
+        if workload.get() == 'tree' and copy_engine.get() != 'shutil':
+            raise ValueError("The tree workload copies with its own tree engine; the copy engine applies to the file workload only.")
+        stop_event.clear()
+        chart_latencies.clear()
         # Run tests in a separate thread to keep the GUI responsive
-        threading.Thread(target=run_tests, args=(
+        threading.Thread(target=test_worker, args=(
             primary_ssd_path.get(),
             secondary_ssd_path.get(),
             int(file_size.get()),
             test_type.get(),
             int(cycles.get()),
             log_file.get(),
-            int(queue_depth.get())  # Pass the queue depth
-        )).start()
+            int(queue_depth.get()),  # Pass the queue depth
+            io_engine.get(),
+            dsync.get(),
+            parse_block_size(block_size.get()),
+            data_pattern.get(),
+            copy_engine.get(),
+            results_file.get(),
+            distribution.get(),
+            workload.get(),
+            targets.get(),
+            cache.get(),
+            verify.get(),
+            SEQUENTIAL_MIXES[sequential_mix.get()]
+        ), daemon=True).start()
+        start_button.configure(state='disabled')
+        stop_button.configure(state='normal')
     except Exception as e:
         messagebox.showerror("Error", f"An error occurred: {e}")
 
+def stop_test():
+    """Ask the running tests to stop at the next block, chunk or file."""
+    stop_event.set()
+    stop_button.configure(state='disabled')
+    print_to_terminal("Stopping...")
+
+# Progress events from the test thread, applied to the widgets by drain_events on the Tk main loop
+events = open_event_queue()
+DRAIN_INTERVAL_MS = 100
+MAX_EVENTS_PER_DRAIN = 1000
+CHART_WIDTH = 600
+CHART_HEIGHT = 160
+CHART_BARS = 8
+chart_rates = deque(maxlen=600)  # (seconds, MB/s) of the running test
+chart_latencies = deque(maxlen=CHART_BARS)  # (label, p99 us) of the last completed tests
+last_sample = [None, 0]
+SEQUENTIAL_MIXES = {'R/W separate': None, 'R/W mixed 70/30': 70, 'R/W mixed 50/50': 50, 'R/W mixed 30/70': 30}  # Percent of workers reading
+
 # GUI Setup
 ctk.set_appearance_mode("light")
 ctk.set_default_color_theme("blue")
@@ -309,7 +769,19 @@ file_size = ctk.StringVar(value="50")
 test_type = ctk.StringVar(value="all")
 cycles = ctk.StringVar(value="1")
 log_file = ctk.StringVar(value="test_log.log")
+results_file = ctk.StringVar(value="")
+distribution = ctk.StringVar(value="uniform")
 queue_depth = ctk.StringVar(value="32")
+io_engine = ctk.StringVar(value="buffered")
+dsync = ctk.BooleanVar(value=False)
+block_size = ctk.StringVar(value="1M")
+data_pattern = ctk.StringVar(value="random")
+copy_engine = ctk.StringVar(value="shutil")
+workload = ctk.StringVar(value="file")
+targets = ctk.StringVar(value="")
+cache = ctk.BooleanVar(value=False)
+verify = ctk.BooleanVar(value=False)
+sequential_mix = ctk.StringVar(value="R/W separate")
 
 # Load and display the Intel logo
 logo_image = Image.open(resource_path("intel_logo.png"))
@@ -329,9 +801,11 @@ ctk.CTkButton(root, text="Browse", command=select_secondary_ssd).grid(row=2, col
 
 ctk.CTkLabel(root, text="File Size (GB):").grid(row=3, column=0, sticky=ctk.W, padx=10, pady=5)
 ctk.CTkEntry(root, textvariable=file_size).grid(row=3, column=1, sticky=ctk.W, padx=10, pady=5)
+ctk.CTkCheckBox(root, text="Reuse cached test file", variable=cache).grid(row=3, column=2, sticky=ctk.W, padx=10, pady=5)
 
 ctk.CTkLabel(root, text="Test Type:").grid(row=4, column=0, sticky=ctk.W, padx=10, pady=5)
-ctk.CTkOptionMenu(root, variable=test_type, values=["internal", "external", "sequential", "all"]).grid(row=4, column=1, sticky=ctk.W, padx=10, pady=5)
+ctk.CTkOptionMenu(root, variable=test_type, values=["internal", "external", "sequential", "random", "all"]).grid(row=4, column=1, sticky=ctk.W, padx=10, pady=5)
+ctk.CTkOptionMenu(root, variable=distribution, values=ACCESS_DISTRIBUTIONS).grid(row=4, column=2, sticky=ctk.W, padx=10, pady=5)
 
 ctk.CTkLabel(root, text="Cycles:").grid(row=5, column=0, sticky=ctk.W, padx=10, pady=5)
 ctk.CTkEntry(root, textvariable=cycles).grid(row=5, column=1, sticky=ctk.W, padx=10, pady=5)
@@ -339,13 +813,43 @@ ctk.CTkEntry(root, textvariable=cycles).grid(row=5, column=1, sticky=ctk.W, padx
 ctk.CTkLabel(root, text="Queue Depth:").grid(row=6, column=0, sticky=ctk.W, padx=10, pady=5)
 ctk.CTkEntry(root, textvariable=queue_depth).grid(row=6, column=1, sticky=ctk.W, padx=10, pady=5)
 
-ctk.CTkLabel(root, text="Log File:").grid(row=7, column=0, sticky=ctk.W, padx=10, pady=5)
-ctk.CTkEntry(root, textvariable=log_file).grid(row=7, column=1, sticky=ctk.W, padx=10, pady=5)
+ctk.CTkLabel(root, text="I/O Engine:").grid(row=7, column=0, sticky=ctk.W, padx=10, pady=5)
+ctk.CTkOptionMenu(root, variable=io_engine, values=IO_ENGINES).grid(row=7, column=1, sticky=ctk.W, padx=10, pady=5)
+ctk.CTkCheckBox(root, text="O_DSYNC writes", variable=dsync).grid(row=8, column=1, sticky=ctk.W, padx=10, pady=5)
+
+ctk.CTkLabel(root, text="Block Size:").grid(row=9, column=0, sticky=ctk.W, padx=10, pady=5)
+ctk.CTkOptionMenu(root, variable=block_size, values=BLOCK_SIZES).grid(row=9, column=1, sticky=ctk.W, padx=10, pady=5)
+
+ctk.CTkLabel(root, text="Data Pattern:").grid(row=10, column=0, sticky=ctk.W, padx=10, pady=5)
+ctk.CTkOptionMenu(root, variable=data_pattern, values=DATA_PATTERNS).grid(row=10, column=1, sticky=ctk.W, padx=10, pady=5)
+
+ctk.CTkLabel(root, text="Copy Engine:").grid(row=11, column=0, sticky=ctk.W, padx=10, pady=5)
+ctk.CTkOptionMenu(root, variable=copy_engine, values=available_copy_engines()).grid(row=11, column=1, sticky=ctk.W, padx=10, pady=5)
+ctk.CTkOptionMenu(root, variable=workload, values=["file", "tree"]).grid(row=11, column=2, sticky=ctk.W, padx=10, pady=5)
+ctk.CTkCheckBox(root, text="Verify copies", variable=verify).grid(row=12, column=2, sticky=ctk.W, padx=10, pady=5)
+
+ctk.CTkLabel(root, text="Log File:").grid(row=12, column=0, sticky=ctk.W, padx=10, pady=5)
+ctk.CTkEntry(root, textvariable=log_file).grid(row=12, column=1, sticky=ctk.W, padx=10, pady=5)
+
+ctk.CTkLabel(root, text="Results File (.jsonl/.csv):").grid(row=13, column=0, sticky=ctk.W, padx=10, pady=5)
+ctk.CTkEntry(root, textvariable=results_file).grid(row=13, column=1, sticky=ctk.W, padx=10, pady=5)
+ctk.CTkOptionMenu(root, variable=sequential_mix, values=list(SEQUENTIAL_MIXES)).grid(row=13, column=2, sticky=ctk.W, padx=10, pady=5)
 
 # Terminal for test output
 terminal_text = ctk.CTkTextbox(root, width=400, height=150, state='disabled')
 terminal_text.place(relx=0.7, rely=0.4, anchor='n')
 
-ctk.CTkButton(root, text="Start Test", command=start_test).grid(row=8, column=1, pady=20)
+ctk.CTkLabel(root, text="Additional Targets (;):").grid(row=14, column=0, sticky=ctk.W, padx=10, pady=5)
+ctk.CTkEntry(root, textvariable=targets, width=400).grid(row=14, column=1, padx=10, pady=5)
+
+start_button = ctk.CTkButton(root, text="Start Test", command=start_test)
+start_button.grid(row=15, column=1, pady=20)
+stop_button = ctk.CTkButton(root, text="Stop", command=stop_test, state='disabled')
+stop_button.grid(row=15, column=2, pady=20)
+
+# Live throughput and latency chart
+chart = ctk.CTkCanvas(root, width=CHART_WIDTH, height=CHART_HEIGHT, bg='white', highlightthickness=0)
+chart.grid(row=16, column=0, columnspan=3, padx=10, pady=5)
 
+root.after(DRAIN_INTERVAL_MS, drain_events)
 root.mainloop()
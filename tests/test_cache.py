@@ -0,0 +1,75 @@
+import os
+import time
+from traveler_data import generate_test_file
+from traveler_engine import run_sequential
+from traveler_cache import (cache_directory, load_manifest, save_manifest, make_room, lookup_test_file, store_test_file,
+                            claim_test_file, release_test_file)
+
+SIZE = 256 * 1024
+
+def create(file_path, size=SIZE, fill=b'\xa5'):
+    with open(file_path, 'wb') as f:
+        f.write(fill * size)
+
+def cached(tmp_path, size=SIZE, pattern='random'):
+    file_path, hit = lookup_test_file(str(tmp_path), size, pattern)
+    assert not hit
+    create(file_path, size)
+    store_test_file(str(tmp_path), file_path, size, pattern)
+    return file_path
+
+def test_stored_file_is_a_hit(tmp_path):
+    file_path = cached(tmp_path)
+    assert lookup_test_file(str(tmp_path), SIZE, 'random') == (file_path, True)
+
+def test_changed_file_fails_validation_and_is_removed(tmp_path):
+    file_path = cached(tmp_path)
+    with open(file_path, 'r+b') as f:
+        f.write(b'\0' * 4096)
+    assert lookup_test_file(str(tmp_path), SIZE, 'random') == (file_path, False)
+    assert not os.path.exists(file_path)
+    assert load_manifest(cache_directory(str(tmp_path)))['entries'] == {}
+
+def test_make_room_evicts_least_recently_used_first(tmp_path):
+    cache_dir = cache_directory(str(tmp_path))
+    os.makedirs(cache_dir)
+    manifest = {'entries': {}}
+    for age, name in enumerate(['newest', 'middle', 'oldest']):
+        create(os.path.join(cache_dir, name))
+        manifest['entries'][name] = {'size': SIZE, 'last_used': time.time() - age}
+    assert make_room(cache_dir, manifest, SIZE, quota=3 * SIZE) == ['oldest']
+    assert make_room(cache_dir, manifest, 2 * SIZE, quota=3 * SIZE, keep='middle') == ['newest']
+    assert list(manifest['entries']) == ['middle']
+    assert sorted(os.listdir(cache_dir)) == ['middle']
+
+def test_lookup_evicts_to_fit_the_quota(tmp_path):
+    old = cached(tmp_path, pattern='zeros')
+    assert not lookup_test_file(str(tmp_path), SIZE, 'random', quota=SIZE)[1]
+    assert not os.path.exists(old)
+    assert list(load_manifest(cache_directory(str(tmp_path)))['entries']) == []
+
+def test_second_default_run_reuses_the_file_written_by_the_first(tmp_path):
+    file_path, hit = lookup_test_file(str(tmp_path), SIZE, 'random')
+    assert not hit
+    generate_test_file(file_path, SIZE, 'random', workers=1)
+    store_test_file(str(tmp_path), file_path, SIZE, 'random')
+    claim_test_file(str(tmp_path), file_path)
+    run_sequential(file_path, SIZE, 'write', queue_depth=2, block_size=64 * 1024, pattern='random')
+    release_test_file(str(tmp_path), file_path, written=True)
+    assert lookup_test_file(str(tmp_path), SIZE, 'random') == (file_path, True)
+    assert 'writing' not in load_manifest(cache_directory(str(tmp_path)))['entries'][os.path.basename(file_path)]
+
+def test_claimed_file_left_by_an_interrupted_run_is_regenerated(tmp_path):
+    file_path = cached(tmp_path)
+    claim_test_file(str(tmp_path), file_path)
+    assert lookup_test_file(str(tmp_path), SIZE, 'random') == (file_path, False)
+    assert not os.path.exists(file_path)
+
+def test_read_only_use_keeps_the_file(tmp_path):
+    file_path = cached(tmp_path)
+    manifest = load_manifest(cache_directory(str(tmp_path)))
+    manifest['entries'][os.path.basename(file_path)]['last_used'] = 0
+    save_manifest(cache_directory(str(tmp_path)), manifest)
+    release_test_file(str(tmp_path), file_path)
+    assert load_manifest(cache_directory(str(tmp_path)))['entries'][os.path.basename(file_path)]['last_used'] > 0
+    assert lookup_test_file(str(tmp_path), SIZE, 'random') == (file_path, True)
@@ -0,0 +1,65 @@
+import json
+import pytest
+from traveler_results import TravelResult
+from traveler_calibrate import (calibration_key, build_calibration, load_calibration, save_calibration, compare_calibrations,
+                                flag_ceilings)
+
+def result(test='sequential', direction='read', engine='direct', mb_per_s=100.0, latency=None, **extra):
+    return TravelResult(test, direction, 1, 1024, 1.0, mb_per_s, engine, '/tmp/test_file',
+                        iops=1000.0, block_size=1024 * 1024, queue_depth=4, extra=extra, latency=latency)
+
+def test_key_of_a_sequential_pass():
+    assert calibration_key(result(backend='python')) == 'sequential/read/direct/1M/QD4'
+
+def test_key_records_the_mix_and_process_count():
+    assert calibration_key(result('random', 'mixed', read_percent=70, processes=2)) == 'random/mixed/direct/1M/QD4/mix70/P2'
+    assert calibration_key(result('random', 'read', read_percent=100)) == 'random/read/direct/1M/QD4'
+
+def test_copies_share_the_ceiling_of_their_engine():
+    assert calibration_key(result('internal', 'copy', 'sendfile')) == 'copy/sendfile'
+    assert calibration_key(result('external', 'to_secondary', 'sendfile')) == 'copy/sendfile'
+    assert calibration_key(result('external', 'verify', 'sendfile')) is None
+
+def test_no_key_for_fio_aggregates_or_other_tests():
+    assert calibration_key(result(backend='fio')) is None
+    assert calibration_key(result(aggregate=True)) is None
+    assert calibration_key(result('tree', 'write', 'tree')) is None
+
+def test_fio_results_are_not_flagged_against_python_ceilings():
+    calibration = build_calibration([result(backend='python', mb_per_s=1000.0)], '/tmp')
+    python, fio = result(backend='python', mb_per_s=900.0), result(backend='fio', mb_per_s=900.0)
+    assert flag_ceilings([python, fio], calibration) == [python]
+    assert 'ceiling_mb_per_s' not in fio.extra
+
+def test_calibration_keeps_the_fastest_pass_and_the_engine_overhead():
+    calibration = build_calibration([result(mb_per_s=800.0, latency={'mean_us': 3000.0}),
+                                     result(mb_per_s=1000.0, latency={'mean_us': 2500.0}),
+                                     result('internal', 'copy', 'shutil', mb_per_s=600.0)], '/tmp')
+    entry = calibration['engines']['sequential/read/direct/1M/QD4']
+    assert entry['mb_per_s'] == 1000.0
+    # QD4 at 1000 IOPS: each worker spends 4000us per operation, 2500us of it in the system call
+    assert (entry['op_us'], entry['io_us'], entry['overhead_us']) == pytest.approx((4000.0, 2500.0, 1500.0))
+    assert calibration['engines']['copy/shutil'] == {'mb_per_s': 600.0, 'iops': 1000.0}
+
+def test_calibration_file_round_trip(tmp_path):
+    path = str(tmp_path / 'calibration.json')
+    calibration = build_calibration([result()], '/tmp')
+    save_calibration(path, calibration)
+    assert load_calibration(path) == calibration
+    assert load_calibration(str(tmp_path / 'none.json')) is None
+    (tmp_path / 'old.json').write_text(json.dumps({'version': 0}))
+    (tmp_path / 'broken.json').write_text('{')
+    assert load_calibration(str(tmp_path / 'old.json')) is None and load_calibration(str(tmp_path / 'broken.json')) is None
+
+def test_only_engines_slower_by_the_threshold_are_regressions():
+    previous = {'engines': {'a': {'mb_per_s': 1000.0}, 'b': {'mb_per_s': 1000.0}, 'c': {'mb_per_s': 0.0}}}
+    current = {'engines': {'a': {'mb_per_s': 850.0}, 'b': {'mb_per_s': 950.0}, 'c': {'mb_per_s': 10.0}, 'd': {'mb_per_s': 1.0}}}
+    assert compare_calibrations(previous, current) == [('a', 1000.0, 850.0, pytest.approx(-15.0))]
+
+def test_results_near_the_ceiling_are_flagged():
+    calibration = build_calibration([result(backend='python', mb_per_s=1000.0)], '/tmp')
+    near, far = result(backend='python', mb_per_s=850.0), result(backend='python', mb_per_s=500.0)
+    assert flag_ceilings([near, far], calibration) == [near]
+    assert far.extra['ceiling_percent'] == 50.0 and not far.extra['near_ceiling']
+    calibration['host'] = {**calibration['host'], 'hostname': 'another-host'}
+    assert flag_ceilings([result(mb_per_s=990.0)], calibration) == []
@@ -0,0 +1,34 @@
+import os
+import errno
+import pytest
+from traveler_copy import available_copy_engines, copy_file, COPY_CHUNK_SIZE
+
+SIZE = 2 * COPY_CHUNK_SIZE + 12345
+
+@pytest.fixture
+def source(tmp_path):
+    file_path = str(tmp_path / 'source')
+    with open(file_path, 'wb') as f:
+        f.write(os.urandom(SIZE))
+    return file_path
+
+@pytest.mark.parametrize('engine', available_copy_engines())
+def test_every_engine_copies_the_file_exactly(tmp_path, source, engine):
+    destination = str(tmp_path / 'destination')
+    stats = copy_file(source, destination, engine, copy_buffers=2)
+    assert stats['engine'] == engine and stats['bytes'] == SIZE
+    with open(source, 'rb') as f, open(destination, 'rb') as g:
+        assert f.read() == g.read()
+
+def test_unknown_engine_is_rejected(tmp_path, source):
+    with pytest.raises(ValueError):
+        copy_file(source, str(tmp_path / 'destination'), 'splice')
+
+@pytest.mark.skipif('copy_file_range' not in available_copy_engines(), reason='copy_file_range is not available')
+def test_refused_kernel_copy_falls_back_to_the_pipeline(tmp_path, source, monkeypatch):
+    def refuse(*args):
+        raise OSError(errno.EXDEV, 'Invalid cross-device link')
+    monkeypatch.setattr(os, 'copy_file_range', refuse)
+    destination = str(tmp_path / 'destination')
+    stats = copy_file(source, destination, 'copy_file_range')
+    assert stats['engine'] == 'pipeline' and stats['bytes'] == os.path.getsize(destination) == SIZE
@@ -0,0 +1,61 @@
+import os
+import zlib
+import struct
+import pytest
+from traveler_data import generate_test_file
+from traveler_engine import DATA_PATTERNS, SECTOR_SIZE, fill_pattern_buffer, stamp_block, run_sequential
+
+TOTAL_SIZE = 1024 * 1024 + 3 * SECTOR_SIZE
+
+def sectors(file_path):
+    with open(file_path, 'rb') as f:
+        data = f.read()
+    return [data[offset:offset + SECTOR_SIZE] for offset in range(0, len(data), SECTOR_SIZE)]
+
+def assert_stamped(file_path):
+    blocks = sectors(file_path)
+    assert [struct.unpack_from('<Q', block)[0] for block in blocks] == [index * SECTOR_SIZE for index in range(len(blocks))]
+    assert len(set(blocks)) == len(blocks)
+
+@pytest.mark.parametrize('pattern', DATA_PATTERNS)
+def test_test_file_is_fully_written(tmp_path, pattern):
+    file_path = str(tmp_path / 'test_file')
+    stats = generate_test_file(file_path, TOTAL_SIZE, pattern, workers=3, block_size=64 * 1024, seed=1)
+    assert stats['bytes'] == os.path.getsize(file_path) == TOTAL_SIZE
+    assert os.stat(file_path).st_blocks * 512 >= TOTAL_SIZE
+
+def test_zeros_test_file_is_all_zeros(tmp_path):
+    file_path = str(tmp_path / 'test_file')
+    generate_test_file(file_path, TOTAL_SIZE, 'zeros', workers=2, seed=1)
+    assert not any(block.strip(b'\0') for block in sectors(file_path))
+
+@pytest.mark.parametrize('pattern', ['random', 'compressible'])
+def test_test_file_sectors_are_stamped_and_unique(tmp_path, pattern):
+    file_path = str(tmp_path / 'test_file')
+    generate_test_file(file_path, TOTAL_SIZE, pattern, workers=3, block_size=64 * 1024, seed=1)
+    assert_stamped(file_path)
+
+def test_patterns_compress_as_described():
+    ratios = {}
+    for pattern in DATA_PATTERNS:
+        buffer = bytearray(64 * SECTOR_SIZE)
+        fill_pattern_buffer(buffer, pattern)
+        ratios[pattern] = len(buffer) / len(zlib.compress(bytes(buffer)))
+    assert ratios['zeros'] > 100
+    assert 1.7 < ratios['compressible'] < 2.3
+    assert ratios['random'] < 1.01
+
+def test_stamp_block_writes_the_offset_of_every_sector():
+    view = memoryview(bytearray(4 * SECTOR_SIZE))
+    stamp_block(view, 10 * SECTOR_SIZE)
+    assert [struct.unpack_from('<Q', view, sector)[0] for sector in range(0, len(view), SECTOR_SIZE)] == [10 * SECTOR_SIZE + sector for sector in range(0, len(view), SECTOR_SIZE)]
+
+def test_unknown_pattern_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        generate_test_file(str(tmp_path / 'test_file'), TOTAL_SIZE, 'ones')
+
+@pytest.mark.parametrize('pattern', ['random', 'compressible'])
+def test_sequential_writes_are_stamped(tmp_path, pattern):
+    file_path = str(tmp_path / 'test_file')
+    run_sequential(file_path, TOTAL_SIZE, 'write', queue_depth=3, block_size=64 * 1024, pattern=pattern)
+    assert_stamped(file_path)
@@ -0,0 +1,243 @@
+import os
+import time
+import mmap
+import errno
+import ctypes
+import struct
+from collections import Counter
+import pytest
+import traveler_engine
+from traveler_engine import (IO_ENGINES, ACCESS_DISTRIBUTIONS, HOT_SET_FRACTION, HOT_SET_PROBABILITY, SECTOR_SIZE, open_target,
+                             run_sequential, run_random, run_mixed, mixed_split, run_paced, parse_paced_steps, sequential_offsets, evict_unless_direct, split_ranges, parse_block_size,
+                             allocate_worker_buffers, generate_offsets, generate_op_kinds)
+from traveler_data import generate_test_file
+from traveler_metrics import histogram_count, latency_summary
+
+BLOCK_SIZE = 64 * 1024
+TOTAL_SIZE = 16 * BLOCK_SIZE
+OFFSETS_SIZE = 1000 * 4096
+RANDOM_BLOCK_SIZE = 4096
+COUNT = 20000
+
+def without_o_direct(monkeypatch):
+    """Make every O_DIRECT open fail as it does on a filesystem that does not support it."""
+    real_open = os.open
+    def fake_open(path, flags, *args):
+        if flags & getattr(os, 'O_DIRECT', 0):
+            raise OSError(errno.EINVAL, 'Invalid argument')
+        return real_open(path, flags, *args)
+    monkeypatch.setattr(os, 'open', fake_open)
+
+def count_cache_drops(monkeypatch):
+    drops = []
+    monkeypatch.setattr(traveler_engine, 'drop_file_cache', drops.append)
+    return drops
+
+def test_open_target_rejects_unknown_engines_and_operations(tmp_path):
+    with pytest.raises(ValueError):
+        open_target(str(tmp_path / 'f'), 'write', 'mmap')
+    with pytest.raises(ValueError):
+        open_target(str(tmp_path / 'f'), 'append')
+
+@pytest.mark.parametrize('io_engine', IO_ENGINES)
+def test_sequential_write_and_read_cover_the_file(tmp_path, io_engine):
+    file_path = str(tmp_path / 'test_file')
+    written = run_sequential(file_path, TOTAL_SIZE, 'write', block_size=BLOCK_SIZE, io_engine=io_engine)
+    assert written['bytes'] == os.path.getsize(file_path) == TOTAL_SIZE
+    read = run_sequential(file_path, TOTAL_SIZE, 'read', block_size=BLOCK_SIZE, io_engine=io_engine)
+    assert read['bytes'] == TOTAL_SIZE
+    assert histogram_count(read['histogram']) == TOTAL_SIZE // BLOCK_SIZE
+
+@pytest.mark.skipif(not hasattr(os, 'O_DIRECT'), reason='O_DIRECT is Linux-only')
+def test_direct_pass_bypasses_the_cache_without_dropping_it(tmp_path, monkeypatch):
+    file_path = str(tmp_path / 'test_file')
+    run_sequential(file_path, TOTAL_SIZE, 'write', block_size=BLOCK_SIZE)
+    drops = count_cache_drops(monkeypatch)
+    assert run_sequential(file_path, TOTAL_SIZE, 'read', block_size=BLOCK_SIZE, io_engine='direct')['direct']
+    evict_unless_direct(file_path)
+    assert drops == []
+
+def test_direct_falls_back_to_cache_eviction(tmp_path, monkeypatch):
+    file_path = str(tmp_path / 'test_file')
+    run_sequential(file_path, TOTAL_SIZE, 'write', block_size=BLOCK_SIZE)
+    without_o_direct(monkeypatch)
+    drops = count_cache_drops(monkeypatch)
+    fd, direct = open_target(file_path, 'read', 'direct')
+    os.close(fd)
+    assert not direct
+    assert not run_sequential(file_path, TOTAL_SIZE, 'read', block_size=BLOCK_SIZE, io_engine='direct')['direct']
+    evict_unless_direct(file_path)
+    assert drops == [file_path, file_path]
+
+def test_split_ranges_are_aligned_contiguous_and_cover_the_file():
+    ranges = split_ranges(TOTAL_SIZE + 1000, 3, BLOCK_SIZE)
+    assert ranges[0][0] == 0 and ranges[-1][1] == TOTAL_SIZE + 1000
+    assert all(end == start for (_, end), (start, _) in zip(ranges, ranges[1:]))
+    assert all(start % BLOCK_SIZE == 0 for start, _ in ranges)
+
+def test_queue_depth_workers_each_own_a_range(tmp_path):
+    file_path = str(tmp_path / 'test_file')
+    stats = run_sequential(file_path, TOTAL_SIZE, 'write', queue_depth=4, block_size=BLOCK_SIZE)
+    ranges = split_ranges(TOTAL_SIZE, 4, BLOCK_SIZE)
+    assert [(worker['offset'], worker['offset'] + worker['bytes']) for worker in stats['workers']] == ranges
+    assert stats['queue_depth'] == 4 and stats['bytes'] == TOTAL_SIZE
+    read = run_sequential(file_path, TOTAL_SIZE, 'read', queue_depth=4, block_size=BLOCK_SIZE)
+    assert [worker['bytes'] for worker in read['workers']] == [end - start for start, end in ranges]
+
+@pytest.mark.parametrize('text, size', [('4K', 4096), ('1m', 1024 * 1024), ('4MiB', 4 * 1024 * 1024), ('8192', 8192)])
+def test_parse_block_size(text, size):
+    assert parse_block_size(text) == size
+
+@pytest.mark.parametrize('text', ['2K', '8M', '12K'])
+def test_parse_block_size_rejects_sizes_out_of_range_or_not_a_power_of_two(text):
+    with pytest.raises(ValueError):
+        parse_block_size(text)
+
+def test_worker_buffers_are_page_aligned_and_filled_per_worker():
+    buffers = allocate_worker_buffers(3, BLOCK_SIZE, 'random')
+    assert all(len(buffer) == BLOCK_SIZE for buffer in buffers)
+    assert all(ctypes.addressof(ctypes.c_char.from_buffer(buffer)) % mmap.PAGESIZE == 0 for buffer in buffers)
+    assert len({bytes(buffer) for buffer in buffers}) == 3
+    assert not any(allocate_worker_buffers(1, BLOCK_SIZE)[0][:])
+
+def test_sequential_rejects_missing_or_short_buffers(tmp_path):
+    with pytest.raises(ValueError):
+        run_sequential(str(tmp_path / 'test_file'), TOTAL_SIZE, 'write', queue_depth=2, block_size=BLOCK_SIZE,
+                       buffers=allocate_worker_buffers(1, BLOCK_SIZE))
+    with pytest.raises(ValueError):
+        run_sequential(str(tmp_path / 'test_file'), TOTAL_SIZE, 'write', block_size=BLOCK_SIZE,
+                       buffers=allocate_worker_buffers(1, BLOCK_SIZE // 2))
+
+@pytest.mark.parametrize('distribution', ACCESS_DISTRIBUTIONS)
+def test_offsets_are_aligned_and_in_range(distribution):
+    offsets = generate_offsets(OFFSETS_SIZE, RANDOM_BLOCK_SIZE, COUNT, distribution, seed=1)
+    assert len(offsets) == COUNT
+    assert all(offset % RANDOM_BLOCK_SIZE == 0 and 0 <= offset <= OFFSETS_SIZE - RANDOM_BLOCK_SIZE for offset in offsets)
+
+@pytest.mark.parametrize('distribution', ACCESS_DISTRIBUTIONS)
+def test_offsets_repeat_with_the_same_seed(distribution):
+    assert generate_offsets(OFFSETS_SIZE, RANDOM_BLOCK_SIZE, 100, distribution, seed=7) == generate_offsets(OFFSETS_SIZE, RANDOM_BLOCK_SIZE, 100, distribution, seed=7)
+
+def test_uniform_offsets_cover_the_file():
+    counts = Counter(generate_offsets(OFFSETS_SIZE, RANDOM_BLOCK_SIZE, COUNT, 'uniform', seed=1))
+    assert len(counts) > 0.99 * (OFFSETS_SIZE // RANDOM_BLOCK_SIZE)
+    assert max(counts.values()) < 5 * COUNT / (OFFSETS_SIZE // RANDOM_BLOCK_SIZE)
+
+def test_zipf_offsets_are_skewed_and_scattered():
+    counts = Counter(generate_offsets(OFFSETS_SIZE, RANDOM_BLOCK_SIZE, COUNT, 'zipf', seed=1))
+    hottest = [offset for offset, _ in counts.most_common(10)]
+    assert sum(counts[offset] for offset in hottest) > 0.5 * COUNT
+    # Hot blocks are scattered, not packed at the start of the file
+    assert max(hottest) - min(hottest) > 10 * RANDOM_BLOCK_SIZE
+
+def test_hotset_offsets_send_most_accesses_to_the_hot_set():
+    blocks = OFFSETS_SIZE // RANDOM_BLOCK_SIZE
+    counts = Counter(generate_offsets(OFFSETS_SIZE, RANDOM_BLOCK_SIZE, COUNT, 'hotset', seed=1))
+    hot = counts.most_common(int(blocks * HOT_SET_FRACTION))
+    assert sum(count for _, count in hot) == pytest.approx(HOT_SET_PROBABILITY * COUNT, rel=0.05)
+
+def test_offsets_reject_a_file_smaller_than_a_block():
+    with pytest.raises(ValueError):
+        generate_offsets(RANDOM_BLOCK_SIZE - 1, RANDOM_BLOCK_SIZE, 1)
+
+def test_offsets_reject_an_unknown_distribution():
+    with pytest.raises(ValueError):
+        generate_offsets(OFFSETS_SIZE, RANDOM_BLOCK_SIZE, 1, 'pareto')
+
+def test_op_kinds_follow_the_read_share():
+    assert generate_op_kinds(100, 100) == bytes(100)
+    assert generate_op_kinds(100, 0) == b'\1' * 100
+    assert generate_op_kinds(COUNT, 70, seed=1).count(1) == pytest.approx(0.3 * COUNT, rel=0.05)
+
+@pytest.mark.parametrize('pattern', ['random', 'compressible'])
+def test_random_writes_are_patterned_and_stamped(tmp_path, pattern):
+    file_path = str(tmp_path / 'test_file')
+    generate_test_file(file_path, OFFSETS_SIZE, 'zeros', workers=1)
+    stats = run_random(file_path, OFFSETS_SIZE, queue_depth=4, block_size=2 * SECTOR_SIZE, read_percent=0, ops=200, seed=3, pattern=pattern)
+    assert stats['write_bytes'] == stats['bytes'] == 200 * 2 * SECTOR_SIZE
+    written = set(generate_offsets(OFFSETS_SIZE, 2 * SECTOR_SIZE, 200, seed=3))
+    with open(file_path, 'rb') as f:
+        data = f.read()
+    for offset in range(0, OFFSETS_SIZE, SECTOR_SIZE):
+        sector = data[offset:offset + SECTOR_SIZE]
+        if offset - offset % (2 * SECTOR_SIZE) in written:
+            assert struct.unpack_from('<Q', sector)[0] == offset and sector[8:].strip(b'\0')
+        else:
+            assert not sector.strip(b'\0')
+
+def test_random_mix_reads_and_writes_in_proportion(tmp_path):
+    file_path = str(tmp_path / 'test_file')
+    generate_test_file(file_path, OFFSETS_SIZE, 'random', workers=1)
+    stats = run_random(file_path, OFFSETS_SIZE, queue_depth=2, read_percent=70, ops=COUNT, seed=1)
+    assert stats['read_bytes'] + stats['write_bytes'] == COUNT * RANDOM_BLOCK_SIZE
+    assert stats['read_bytes'] / stats['bytes'] == pytest.approx(0.7, rel=0.05)
+    assert histogram_count(stats['read_histogram']) + histogram_count(stats['write_histogram']) == COUNT
+
+@pytest.mark.parametrize('queue_depth, read_percent, readers', [(2, 50, 1), (4, 75, 3), (4, 99, 3), (8, 1, 1), (10, 30, 3)])
+def test_mixed_split_keeps_a_reader_and_a_writer(queue_depth, read_percent, readers):
+    assert mixed_split(queue_depth, read_percent) == readers
+
+@pytest.mark.parametrize('queue_depth, read_percent', [(1, 50), (4, 0), (4, 100)])
+def test_mixed_split_rejects_runs_without_both_directions(queue_depth, read_percent):
+    with pytest.raises(ValueError):
+        mixed_split(queue_depth, read_percent)
+
+def test_mixed_run_reads_and_writes_separate_regions(tmp_path):
+    file_path = str(tmp_path / 'test_file')
+    generate_test_file(file_path, TOTAL_SIZE, 'zeros', workers=1)
+    stats = run_mixed(file_path, TOTAL_SIZE, read_percent=50, queue_depth=4, block_size=BLOCK_SIZE)
+    assert (stats['readers'], stats['writers']) == (2, 2)
+    assert [worker['operation'] for worker in stats['workers']] == ['read', 'read', 'write', 'write']
+    # Workers wrap around until the last one finishes, so each direction moves at least its own half of the file
+    assert stats['read_bytes'] >= TOTAL_SIZE // 2 and stats['write_bytes'] >= TOTAL_SIZE // 2
+    assert stats['bytes'] == stats['read_bytes'] + stats['write_bytes']
+    assert histogram_count(stats['write_histogram']) == stats['write_bytes'] // BLOCK_SIZE
+    with open(file_path, 'rb') as f:
+        data = f.read()
+    assert len(data) == TOTAL_SIZE and not data[:TOTAL_SIZE // 2].strip(b'\0')
+    for offset in range(TOTAL_SIZE // 2, TOTAL_SIZE, SECTOR_SIZE):
+        assert struct.unpack_from('<Q', data, offset)[0] == offset
+
+@pytest.mark.parametrize('text, steps', [('10,50,100', [10, 50, 100]), ('25%, 110%', [25, 110]), ('12.5', [12.5]), (75, [75])])
+def test_parse_paced_steps(text, steps):
+    assert parse_paced_steps(text) == steps
+
+@pytest.mark.parametrize('text', ['', '0,50', '-10', 'fast'])
+def test_parse_paced_steps_rejects_bad_steps(text):
+    with pytest.raises(ValueError):
+        parse_paced_steps(text)
+
+def test_sequential_offsets_wrap_around_the_range():
+    assert list(sequential_offsets(4 * BLOCK_SIZE, 7 * BLOCK_SIZE, BLOCK_SIZE, 5)) == [4 * BLOCK_SIZE, 5 * BLOCK_SIZE, 6 * BLOCK_SIZE, 4 * BLOCK_SIZE, 5 * BLOCK_SIZE]
+
+def test_paced_run_issues_the_scheduled_operations(tmp_path):
+    file_path = str(tmp_path / 'test_file')
+    generate_test_file(file_path, OFFSETS_SIZE, 'zeros', workers=1)
+    stats = run_paced(file_path, OFFSETS_SIZE, 1000, seconds=0.2, access='random', read_percent=0, queue_depth=2,
+                      block_size=RANDOM_BLOCK_SIZE, seed=3, pattern='random')
+    assert stats['ops'] == 200 and stats['target_iops'] == 1000
+    assert stats['write_bytes'] == stats['bytes'] == 200 * RANDOM_BLOCK_SIZE
+    assert histogram_count(stats['service_histogram']) == 200
+    # Open loop: the run takes as long as the schedule, however fast the device is
+    assert stats['seconds'] >= 0.19
+    with open(file_path, 'rb') as f:
+        data = f.read()
+    for offset in set(generate_offsets(OFFSETS_SIZE, RANDOM_BLOCK_SIZE, 200, seed=3)):
+        assert struct.unpack_from('<Q', data, offset)[0] == offset
+
+def test_paced_latency_counts_a_stall_against_every_operation_behind_it(tmp_path, monkeypatch):
+    file_path = str(tmp_path / 'test_file')
+    generate_test_file(file_path, OFFSETS_SIZE, 'random', workers=1)
+    real_pread_into = traveler_engine.pread_into
+    calls = []
+    def stalling_pread_into(fd, view, offset):
+        calls.append(offset)
+        if len(calls) == 10:
+            time.sleep(0.06)
+        return real_pread_into(fd, view, offset)
+    monkeypatch.setattr(traveler_engine, 'pread_into', stalling_pread_into)
+    stats = run_paced(file_path, OFFSETS_SIZE, 500, seconds=0.4, block_size=RANDOM_BLOCK_SIZE)
+    # Operations due during the 60ms stall wait behind it; their latency runs from when they were due
+    assert stats['late_ops'] >= 10
+    assert latency_summary(stats['read_histogram'])['p99_us'] > 10000
+    assert latency_summary(stats['service_histogram'])['p99_us'] < 10000
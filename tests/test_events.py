@@ -0,0 +1,44 @@
+import time
+import pytest
+import traveler_events
+from traveler_events import TravelCancelled, stop_event, open_event_queue, publish, check_stop
+from traveler_engine import run_sequential
+from traveler_metrics import start_throughput_sampler, stop_throughput_sampler
+
+@pytest.fixture
+def events(monkeypatch):
+    monkeypatch.setattr(traveler_events, '_event_queue', None)
+    return open_event_queue()
+
+def drain(events):
+    drained = []
+    while not events.empty():
+        drained.append(events.get())
+    return drained
+
+def test_publish_without_a_queue_does_nothing(monkeypatch):
+    monkeypatch.setattr(traveler_events, '_event_queue', None)
+    publish('message', text='dropped')
+
+def test_sampler_publishes_progress(events):
+    progress = [0]
+    sampler = start_throughput_sampler(lambda: progress[0], 0.01)
+    progress[0] = 4096
+    time.sleep(0.05)
+    timeline = stop_throughput_sampler(sampler)
+    samples = [(fields['seconds'], fields['bytes']) for kind, fields in drain(events) if kind == 'sample']
+    assert samples[0] == (0.0, 0) and samples[-1][1] == 4096
+    assert samples == timeline[:len(samples)]
+
+def test_stop_cancels_a_running_pass(tmp_path, events):
+    stop_event.set()
+    try:
+        with pytest.raises(TravelCancelled):
+            run_sequential(str(tmp_path / 'test_file'), 1024 * 1024, 'write', block_size=64 * 1024)
+        with pytest.raises(TravelCancelled):
+            check_stop()
+    finally:
+        stop_event.clear()
+    check_stop()
+    publish('done')
+    assert drain(events)[-1] == ('done', {})
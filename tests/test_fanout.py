@@ -0,0 +1,68 @@
+import pytest
+from traveler_results import TravelResult
+from traveler_fanout import aggregate_results, cpu_summary, run_fanout, scaling_report
+
+MIB = 1024 * 1024
+
+def device_result(path, started, seconds, mb_per_s, samples=True, direction='write', **extra):
+    """A pass at a constant rate, with throughput samples every 0.5s unless samples is False."""
+    total = int(mb_per_s * MIB * seconds)
+    timeline = [(t / 2, int(total * t / 2 / seconds)) for t in range(int(seconds * 2) + 1)] if samples else None
+    return TravelResult('sequential', direction, 1, total, seconds, mb_per_s, 'buffered', path, iops=mb_per_s,
+                        block_size=MIB, queue_depth=1, extra=extra, span={'started': started, 'samples': timeline})
+
+def test_aggregate_of_passes_that_ran_together_sums_the_rates():
+    [aggregate] = aggregate_results({'a': [device_result('a', 100.0, 4.0, 500)], 'b': [device_result('b', 100.0, 4.0, 300)]})
+    assert aggregate.mb_per_s == pytest.approx(800)
+    assert aggregate.iops == pytest.approx(800)
+    assert aggregate.extra['overlap_percent'] == pytest.approx(100)
+    assert aggregate.extra['slowest_mb_per_s'] == 300 and aggregate.extra['devices'] == 2 and aggregate.extra['aggregate']
+
+@pytest.mark.parametrize('samples', [True, False])
+def test_aggregate_counts_only_the_overlap_window(samples):
+    # b starts 3s into a's 4s pass: they only ran together for 1s
+    device_results = {'a': [device_result('a', 100.0, 4.0, 500, samples)], 'b': [device_result('b', 103.0, 4.0, 300, samples)]}
+    [aggregate] = aggregate_results(device_results)
+    assert aggregate.seconds == pytest.approx(1.0)
+    assert aggregate.bytes == pytest.approx(800 * MIB, rel=1e-6)
+    assert aggregate.mb_per_s == pytest.approx(800)
+    assert aggregate.extra['overlap_percent'] == pytest.approx(25)
+
+def test_aggregate_follows_the_throughput_samples():
+    # a moved 900MB in its first second and 100MB after; only its second second overlaps b
+    fast_then_slow = TravelResult('sequential', 'write', 1, 1000 * MIB, 2.0, 500, 'buffered', 'a',
+                                  span={'started': 10.0, 'samples': [(0.0, 0), (1.0, 900 * MIB), (2.0, 1000 * MIB)]})
+    [aggregate] = aggregate_results({'a': [fast_then_slow], 'b': [device_result('b', 11.0, 2.0, 200)]})
+    assert aggregate.seconds == pytest.approx(1.0)
+    assert aggregate.mb_per_s == pytest.approx(300)
+
+def test_passes_that_did_not_overlap_get_no_aggregate():
+    assert aggregate_results({'a': [device_result('a', 100.0, 1.0, 500)], 'b': [device_result('b', 102.0, 1.0, 500)]}) == []
+
+def test_passes_are_matched_by_direction_and_backend():
+    device_results = {'a': [device_result('a', 0.0, 2.0, 100, backend='python'), device_result('a', 0.0, 2.0, 100, backend='fio'),
+                            device_result('a', 0.0, 2.0, 100, direction='read', backend='python')],
+                      'b': [device_result('b', 0.0, 2.0, 100, backend='python'), device_result('b', 0.0, 2.0, 100, backend='fio')]}
+    aggregates = aggregate_results(device_results)
+    assert sorted((a.direction, a.extra['backend'], a.extra['devices']) for a in aggregates) == \
+        [('read', 'python', 1), ('write', 'fio', 2), ('write', 'python', 2)]
+
+def test_fanout_runs_every_target_and_isolates_failures():
+    def job(index, target):
+        if target == 'bad':
+            raise OSError('gone')
+        return [index]
+    fanout = run_fanout(['x', 'bad', 'y'], job, cpu_interval=0.01)
+    assert fanout['results'] == {'x': [0], 'bad': [], 'y': [2]}
+
+def test_cpu_summary_flags_a_saturated_core():
+    summary = cpu_summary([{'cpu': 40.0, 'cpu0': 30.0, 'cpu1': 95.0}, {'cpu': 60.0, 'cpu0': 50.0, 'cpu1': 70.0}])
+    assert summary['mean_percent'] == 50.0 and summary['peak_percent'] == 60.0
+    assert summary['busiest_cpu'] == 'cpu1' and summary['saturated']
+    assert cpu_summary([]) is None
+
+def test_scaling_compares_each_pass_with_its_solo_run():
+    solo = {'a': [device_result('a', 0.0, 1.0, 400)]}
+    together = {'a': [device_result('a', 5.0, 1.0, 300)]}
+    [(target, result, fraction)] = scaling_report(solo, together)
+    assert target == 'a' and fraction == pytest.approx(0.75)
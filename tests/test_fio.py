@@ -0,0 +1,63 @@
+import json
+import pytest
+from traveler_fio import build_job, parse_output
+from traveler_metrics import histogram_count, latency_summary
+
+MIB = 1024 * 1024
+
+def options(job):
+    """Return the key=value lines of a job file as a dict."""
+    return dict(line.split('=', 1) for line in job.splitlines() if '=' in line)
+
+def test_sequential_jobs_split_the_file_like_the_python_engine():
+    job = options(build_job('/tmp/test_file', 64 * MIB + 123, 'sequential', 0, queue_depth=4, block_size=MIB, io_engine='direct', dsync=True))
+    assert job['rw'] == 'write' and job['numjobs'] == '4' and job['iodepth'] == '1'
+    assert job['size'] == job['offset_increment'] == str(16 * MIB)
+    assert job['direct'] == '1' and job['sync'] == 'dsync' and job['thread'] == '1'
+
+def test_async_ioengine_splits_the_queue_depth_over_the_processes():
+    job = options(build_job('/tmp/test_file', 64 * MIB, 'sequential', 100, queue_depth=32, processes=4, ioengine='libaio'))
+    assert job['rw'] == 'read' and job['numjobs'] == '4' and job['iodepth'] == '8'
+    assert 'thread' not in job and job['direct'] == '0'
+
+@pytest.mark.parametrize('read_percent, rw', [(100, 'randread'), (0, 'randwrite'), (70, 'randrw')])
+def test_random_jobs(read_percent, rw):
+    job = options(build_job('/tmp/test_file', 64 * MIB, 'random', read_percent, queue_depth=2, block_size=4096, distribution='hotset',
+                            ops=1000, seed=7))
+    assert job['rw'] == rw and job['number_ios'] == '500' and job['randseed'] == '7'
+    assert job['random_distribution'] == 'zoned:90/10:10/90'
+    assert job.get('rwmixread') == ('70' if rw == 'randrw' else None)
+
+def test_zipf_theta_is_passed_through():
+    assert options(build_job('/tmp/test_file', 64 * MIB, 'random', distribution='zipf'))['random_distribution'] == 'zipf:1.2'
+
+def test_write_buffers_follow_the_data_pattern():
+    def write_job(pattern):
+        return options(build_job('/tmp/test_file', 64 * MIB, 'sequential', 0, pattern=pattern))
+    assert write_job('zeros')['zero_buffers'] == '1' and write_job('zeros')['scramble_buffers'] == '0'
+    assert write_job('compressible')['buffer_compress_percentage'] == '50'
+    assert write_job('compressible')['buffer_compress_chunk'] == '4096'
+    assert not {'zero_buffers', 'buffer_compress_percentage'} & set(write_job('random'))
+    assert 'zero_buffers' not in options(build_job('/tmp/test_file', 64 * MIB, 'sequential', 100, pattern='zeros'))
+    with pytest.raises(ValueError):
+        write_job('ones')
+
+def test_paths_with_colons_are_escaped():
+    assert options(build_job('/mnt/a:b/test_file', MIB))['filename'] == '/mnt/a\\:b/test_file'
+
+def test_output_maps_to_engine_stats():
+    output = {'fio version': 'fio-3.36', 'jobs': [{
+        'read': {'io_bytes': 7 * MIB, 'runtime': 2000, 'clat_ns': {'bins': {'10000': 6, '2000000': 1}}},
+        'write': {'io_bytes': 3 * MIB, 'runtime': 2500, 'clat_ns': {'bins': {'50000': 3}}}}]}
+    stats = parse_output('fio: some warning\n' + json.dumps(output))
+    assert stats['fio_version'] == 'fio-3.36'
+    assert stats['read_bytes'] == 7 * MIB and stats['write_bytes'] == 3 * MIB and stats['bytes'] == 10 * MIB
+    assert stats['seconds'] == 2.5
+    assert histogram_count(stats['read_histogram']) == 7 and histogram_count(stats['histogram']) == 10
+    assert latency_summary(stats['write_histogram'])['mean_us'] == 50.0
+    assert latency_summary(stats['read_histogram'])['max_us'] == 2000.0
+
+def test_output_of_a_read_only_job():
+    stats = parse_output(json.dumps({'jobs': [{'read': {'io_bytes': MIB, 'runtime': 500, 'clat_ns': {}}}]}))
+    assert stats['bytes'] == MIB and stats['seconds'] == 0.5 and stats['write_bytes'] == 0
+    assert histogram_count(stats['histogram']) == 0
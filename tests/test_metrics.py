@@ -0,0 +1,84 @@
+import random
+import pytest
+from traveler_metrics import (HISTOGRAM_BUCKETS, new_histogram, record_latency, record_latencies, bucket_bounds, merge_histograms,
+                              histogram_count, histogram_percentile, latency_summary, analyze_timeline)
+
+def histogram_of(latencies):
+    histogram = new_histogram()
+    for ns in latencies:
+        record_latency(histogram, ns)
+    return histogram
+
+@pytest.mark.parametrize('ns', [0, 1, 15, 16, 17, 1000, 123456, 10 ** 9, 2 ** 40 + 12345])
+def test_every_latency_lands_in_a_bucket_that_covers_it(ns):
+    histogram = histogram_of([ns])
+    [index] = [index for index in range(HISTOGRAM_BUCKETS) if histogram[index]]
+    low, high = bucket_bounds(index)
+    assert low <= ns <= high
+    assert high - low <= low / 8
+
+def test_percentiles_are_within_a_bucket_of_the_exact_value():
+    rng = random.Random(1)
+    latencies = [rng.randrange(1000, 10 ** 7) for _ in range(1000)]
+    histogram = histogram_of(latencies)
+    ordered = sorted(latencies)
+    for percentile in [50, 99, 99.9]:
+        exact = ordered[int(-(-len(ordered) * percentile // 100)) - 1]
+        assert histogram_percentile(histogram, percentile) == pytest.approx(exact, rel=0.125)
+    assert histogram_percentile(histogram, 100) <= max(latencies)
+
+def test_summary_reports_exact_mean_and_max_in_microseconds():
+    summary = latency_summary(histogram_of([1000, 2000, 3000, 100000]))
+    assert summary['ops'] == 4
+    assert summary['mean_us'] == 26.5
+    assert summary['max_us'] == 100.0
+    assert summary['p50_us'] == pytest.approx(2.0, rel=0.125)
+
+def test_empty_histogram_summarizes_to_zeros():
+    summary = latency_summary(new_histogram())
+    assert summary['ops'] == 0 and summary['mean_us'] == 0.0 and summary['p99_us'] == 0
+
+def test_merged_histograms_equal_one_histogram_of_every_sample():
+    first, second = [5, 500, 50000], [7, 700000, 3]
+    assert merge_histograms([histogram_of(first), None, histogram_of(second)]) == histogram_of(first + second)
+
+def test_record_latencies_adds_repeated_samples():
+    histogram = new_histogram()
+    record_latencies(histogram, 4000, 10)
+    record_latencies(histogram, 9000, 0)
+    assert histogram == histogram_of([4000] * 10)
+    assert histogram_count(histogram) == 10
+
+MIB = 1024 * 1024
+
+def timeline(rates, interval=0.1):
+    """Cumulative (seconds, bytes) samples for a list of per-interval MB/s rates."""
+    samples, total = [(0.0, 0)], 0
+    for i, rate in enumerate(rates, 1):
+        total += int(rate * MIB * interval)
+        samples.append((i * interval, total))
+    return samples
+
+def test_cache_cliff_and_steady_state_are_found():
+    analysis = analyze_timeline(timeline([2000] * 20 + [500] * 40))
+    assert analysis['burst_mb_per_s'] == pytest.approx(2000, rel=0.01)
+    assert analysis['cliff_seconds'] == pytest.approx(2.0)
+    assert analysis['cache_bytes'] == pytest.approx(20 * 0.1 * 2000 * MIB, rel=0.01)
+    assert analysis['sustained_mb_per_s'] == pytest.approx(500, rel=0.01)
+    assert analysis['steady_start'] == pytest.approx(2.0) and analysis['steady_end'] == pytest.approx(6.0)
+
+def test_flat_run_has_no_cliff():
+    analysis = analyze_timeline(timeline([1000, 1050, 980, 1020] * 10))
+    assert analysis['cliff_seconds'] is None and analysis['cache_bytes'] is None
+    assert analysis['steady_start'] == 0.0
+    assert analysis['sustained_mb_per_s'] == pytest.approx(1012.5, rel=0.01)
+
+def test_short_dip_is_not_a_cliff():
+    analysis = analyze_timeline(timeline([2000] * 20 + [300] * 3 + [2000] * 20))
+    assert analysis['cliff_seconds'] is None
+    assert analysis['sustained_mb_per_s'] == pytest.approx(2000, rel=0.01)
+
+def test_short_run_reports_its_mean():
+    analysis = analyze_timeline(timeline([100, 300]))
+    assert analysis['burst_mb_per_s'] == analysis['sustained_mb_per_s'] == pytest.approx(200, rel=0.01)
+    assert analysis['cliff_seconds'] is None and analysis['steady_start'] is None
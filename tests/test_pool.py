@@ -0,0 +1,46 @@
+import struct
+import pytest
+from traveler_data import generate_test_file
+from traveler_engine import SECTOR_SIZE, split_ranges, generate_offsets
+from traveler_pool import run_sequential_processes, run_random_processes
+
+BLOCK_SIZE = 64 * 1024
+TOTAL_SIZE = 32 * BLOCK_SIZE
+
+def read_sectors(file_path):
+    with open(file_path, 'rb') as f:
+        data = f.read()
+    return [data[offset:offset + SECTOR_SIZE] for offset in range(0, len(data), SECTOR_SIZE)]
+
+def test_sequential_processes_cover_the_file_with_stamped_blocks(tmp_path):
+    file_path = str(tmp_path / 'test_file')
+    stats = run_sequential_processes(file_path, TOTAL_SIZE, 'write', 2, 4, BLOCK_SIZE, pattern='random', sample_interval=0.01)
+    assert stats['bytes'] == stats['write_bytes'] == TOTAL_SIZE
+    assert stats['processes'] == 2 and stats['queue_depth'] == 4
+    assert [worker['offset'] for worker in stats['workers']] == [start for start, _ in split_ranges(TOTAL_SIZE, 4, BLOCK_SIZE)[::2]]
+    assert stats['timeline'][-1][1] == TOTAL_SIZE
+    sectors = read_sectors(file_path)
+    assert [struct.unpack_from('<Q', sector)[0] for sector in sectors] == [i * SECTOR_SIZE for i in range(len(sectors))]
+    assert len(set(sectors)) == len(sectors)
+    read = run_sequential_processes(file_path, TOTAL_SIZE, 'read', 2, 4, BLOCK_SIZE)
+    assert read['bytes'] == read['read_bytes'] == TOTAL_SIZE
+
+def test_random_processes_write_the_pattern_at_the_generated_offsets(tmp_path):
+    file_path = str(tmp_path / 'test_file')
+    generate_test_file(file_path, TOTAL_SIZE, 'zeros', workers=1)
+    stats = run_random_processes(file_path, TOTAL_SIZE, 2, 2, SECTOR_SIZE, read_percent=0, ops=100, seed=5, pattern='compressible')
+    assert stats['write_bytes'] == 100 * SECTOR_SIZE and stats['read_bytes'] == 0
+    written = set(generate_offsets(TOTAL_SIZE, SECTOR_SIZE, 100, seed=5))
+    for index, sector in enumerate(read_sectors(file_path)):
+        offset = index * SECTOR_SIZE
+        if offset in written:
+            assert struct.unpack_from('<Q', sector)[0] == offset and sector[8:].strip(b'\0')
+        else:
+            assert not sector.strip(b'\0')
+
+@pytest.mark.parametrize('queue_depth, processes', [(4, 3), (2, 4)])
+def test_queue_depth_must_split_evenly_over_the_processes(tmp_path, queue_depth, processes):
+    with pytest.raises(ValueError):
+        run_sequential_processes(str(tmp_path / 'test_file'), TOTAL_SIZE, 'write', processes, queue_depth, BLOCK_SIZE)
+    with pytest.raises(ValueError):
+        run_random_processes(str(tmp_path / 'test_file'), TOTAL_SIZE, processes, queue_depth)
@@ -0,0 +1,45 @@
+import csv
+import json
+from traveler_metrics import new_histogram, record_latencies
+from traveler_results import make_result, result_record, write_results, read_results
+
+MIB = 1024 * 1024
+
+def result(tmp_path, direction='write', **extra):
+    histogram = new_histogram()
+    record_latencies(histogram, 50000, 256)
+    stats = {'bytes': 256 * MIB, 'seconds': 2.0, 'histogram': histogram}
+    return make_result('sequential', direction, 1, stats, 'direct', str(tmp_path / 'test_file'), MIB, 4, **extra)
+
+def test_make_result_derives_rates_and_latency(tmp_path):
+    made = result(tmp_path, backend='python')
+    assert made.mb_per_s == 128.0 and made.iops == 128.0
+    assert made.latency['ops'] == 256 and made.latency['mean_us'] == 50.0
+    assert made.extra == {'backend': 'python'}
+    assert made.host['hostname'] and made.device['path'].endswith(tmp_path.name)
+
+def test_jsonl_round_trip(tmp_path):
+    results_path = str(tmp_path / 'results.jsonl')
+    written = [result(tmp_path), result(tmp_path, 'read', backend='fio')]
+    write_results(results_path, written[:1])
+    write_results(results_path, written[1:])
+    with open(results_path) as f:
+        assert all('span' not in json.loads(line) for line in f)
+    assert [result_record(r) for r in read_results(results_path)] == [result_record(r) for r in written]
+
+def test_csv_appends_keep_the_union_of_columns(tmp_path):
+    results_path = str(tmp_path / 'results.csv')
+    write_results(results_path, [result(tmp_path)])
+    write_results(results_path, [result(tmp_path, 'read', read_percent=70)])
+    with open(results_path, newline='') as f:
+        reader = csv.DictReader(f)
+        rows = list(reader)
+    assert 'extra_read_percent' in reader.fieldnames and 'latency_p99_us' in reader.fieldnames and 'span' not in reader.fieldnames
+    assert [row['direction'] for row in rows] == ['write', 'read']
+    assert [row['extra_read_percent'] for row in rows] == ['', '70']
+    assert rows[0]['mb_per_s'] == '128.0'
+
+def test_no_results_write_nothing(tmp_path):
+    results_path = tmp_path / 'results.jsonl'
+    write_results(str(results_path), [])
+    assert not results_path.exists()
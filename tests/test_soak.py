@@ -0,0 +1,78 @@
+import json
+import pytest
+from traveler_results import TravelResult
+from traveler_soak import (parse_duration, new_state, load_state, save_state, data_matches, record_cycle, budget_exhausted,
+                           state_results, drift_summary, format_drift)
+
+def result(cycle, mb_per_s, test='sequential', direction='write', engine='buffered', **extra):
+    return TravelResult(test, direction, cycle, 1024, 1.0, mb_per_s, engine, '/tmp/test_file', extra=extra)
+
+@pytest.mark.parametrize('text, seconds', [('90', 90), ('90s', 90), ('30m', 1800), ('8H', 28800), ('2d', 172800), (' 1.5h ', 5400)])
+def test_parse_duration(text, seconds):
+    assert parse_duration(text) == seconds
+
+@pytest.mark.parametrize('text', ['0', '-5m', 'soon', '5w'])
+def test_parse_duration_rejects_bad_durations(text):
+    with pytest.raises(ValueError):
+        parse_duration(text)
+
+def test_state_survives_a_checkpoint_round_trip(tmp_path):
+    data_path = tmp_path / 'test_file'
+    data_path.write_bytes(b'x' * 4096)
+    state_path = str(tmp_path / 'state.json')
+    state = new_state({'test': 'sequential'}, [str(data_path)])
+    record_cycle(state, [result(1, 100.0, backend='python')], 12.5, [str(data_path)])
+    save_state(state_path, state)
+    loaded = load_state(state_path)
+    assert loaded == json.loads(json.dumps(state))
+    assert loaded['cycles_completed'] == 1 and loaded['elapsed_seconds'] == 12.5
+    assert state_results(loaded)[0].mb_per_s == 100.0 and 'span' not in loaded['results'][0]
+    assert data_matches(loaded, [str(data_path)])
+
+def test_replaced_test_data_no_longer_matches(tmp_path):
+    data_path = tmp_path / 'test_file'
+    data_path.write_bytes(b'x' * 4096)
+    state = new_state({}, [str(data_path)])
+    data_path.write_bytes(b'x' * 4096)  # Rewritten in place: same file
+    assert data_matches(state, [str(data_path)])
+    data_path.unlink()
+    (tmp_path / 'test_file').write_bytes(b'x' * 8192)
+    assert not data_matches(state, [str(data_path)])
+
+def test_missing_or_unsupported_state(tmp_path):
+    assert load_state(str(tmp_path / 'none.json')) is None
+    (tmp_path / 'old.json').write_text(json.dumps({'version': 0}))
+    with pytest.raises(ValueError):
+        load_state(str(tmp_path / 'old.json'))
+
+def test_budget_by_cycles_or_time():
+    state = {'cycles_completed': 3, 'elapsed_seconds': 50.0}
+    assert budget_exhausted(state, max_cycles=3)
+    assert not budget_exhausted(state, max_cycles=4)
+    assert budget_exhausted(state, max_seconds=50.0)
+    assert not budget_exhausted(state, max_seconds=60.0)
+    assert not budget_exhausted(state)
+
+def test_drift_of_a_steady_decline():
+    drift = drift_summary([result(cycle, 100.0 - 5 * cycle) for cycle in [3, 1, 2, 4]])[('sequential', 'write', 'buffered', None)]
+    assert drift['cycles'] == 4
+    assert (drift['first_mb_per_s'], drift['last_mb_per_s']) == (95.0, 80.0)
+    assert (drift['min_mb_per_s'], drift['max_mb_per_s']) == (80.0, 95.0)
+    assert drift['change_percent'] == pytest.approx(-15 / 95 * 100)
+    assert drift['slope_percent_per_cycle'] == pytest.approx(-5 / 87.5 * 100)
+    assert format_drift(drift).endswith(' - drifting')
+
+def test_drift_keeps_python_and_fio_apart():
+    results = []
+    for cycle in [1, 2, 3]:
+        results += [result(cycle, 100.0, backend='python'), result(cycle, 400.0 + cycle, backend='fio'),
+                    result(cycle, 900.0, aggregate=True)]
+    summary = drift_summary(results)
+    assert set(summary) == {('sequential', 'write', 'buffered', 'python'), ('sequential', 'write', 'buffered', 'fio')}
+    python = summary[('sequential', 'write', 'buffered', 'python')]
+    assert python['cycles'] == 3 and python['change_percent'] == 0.0 and python['slope_percent_per_cycle'] == 0.0
+    assert summary[('sequential', 'write', 'buffered', 'fio')]['last_mb_per_s'] == 403.0
+
+def test_single_cycle_has_no_trend():
+    drift = drift_summary([result(1, 50.0)])[('sequential', 'write', 'buffered', None)]
+    assert drift['slope_percent_per_cycle'] == 0.0 and 'drifting' not in format_drift(drift)
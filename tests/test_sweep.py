@@ -0,0 +1,70 @@
+import argparse
+import pytest
+from traveler_results import TravelResult
+from traveler_sweep import option_values, expand_matrix, schedule_points, summarize_sweep, pivot_table
+
+AXES = ['queue_depth', 'block_size']
+POINTS = [{'queue_depth': 1, 'block_size': '4K'}, {'queue_depth': 1, 'block_size': '1M'},
+          {'queue_depth': 8, 'block_size': '4K'}, {'queue_depth': 8, 'block_size': '1M'}]
+
+def result(mb_per_s, backend=None, test='sequential', direction='read', engine='direct', **extra):
+    if backend:
+        extra['backend'] = backend
+    return TravelResult(test, direction, 1, 1024, 1.0, mb_per_s, engine, '/tmp/test_file', extra=extra)
+
+def test_matrix_expands_to_every_combination_in_spec_order():
+    assert expand_matrix({'queue_depth': [1, 8], 'block_size': ['4K', '1M'], 'io_engine': 'direct'}) == \
+        [{**point, 'io_engine': 'direct'} for point in POINTS]
+
+def test_points_sharing_test_data_run_back_to_back():
+    points = [{'file_size': 1, 'queue_depth': 1}, {'file_size': 2, 'queue_depth': 1},
+              {'file_size': 1, 'queue_depth': 8}, {'file_size': 2, 'queue_depth': 8}]
+    order = schedule_points(points, {'data_pattern': 'random'}, repeat=2)
+    assert [index for index, _ in order] == [0, 0, 2, 2, 1, 1, 3, 3]
+    shuffled = schedule_points(points, {}, repeat=2, randomize=True, seed=3)
+    assert sorted(shuffled, key=lambda entry: entry[0]) == sorted(order, key=lambda entry: entry[0])
+    sizes = [point['file_size'] for _, point in shuffled]
+    assert sizes[:4] == [sizes[0]] * 4 and sizes[4:] == [sizes[4]] * 4
+    assert shuffled == schedule_points(points, {}, repeat=2, randomize=True, seed=3)
+
+def test_spec_options_are_converted_like_the_command_line():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--queue-depth', type=int)
+    parser.add_argument('--io-engine', choices=['buffered', 'direct'])
+    parser.add_argument('--targets', nargs='+')
+    assert option_values(parser, {'--queue-depth': '8', 'io-engine': 'direct'}) == {'queue_depth': 8, 'io_engine': 'direct'}
+    for options in [{'io_engine': 'mmap'}, {'bogus': 1}, {'targets': ['/mnt/a']}]:
+        with pytest.raises(ValueError):
+            option_values(parser, options)
+
+def test_repeats_of_a_point_are_averaged():
+    records = [(0, POINTS[0], result(100.0, 'python')), (0, POINTS[0], result(200.0, 'python'))]
+    [row] = summarize_sweep(records, AXES)
+    assert row['runs'] == 2
+    assert row['mb_per_s'] == 150.0
+    assert row['spread_percent'] == 100 / 150 * 100
+
+def test_python_and_fio_passes_are_not_merged():
+    records = [(0, POINTS[0], result(100.0, 'python')), (0, POINTS[0], result(300.0, 'fio'))]
+    rows = summarize_sweep(records, AXES)
+    assert {(row['backend'], row['mb_per_s'], row['runs']) for row in rows} == {('python', 100.0, 1), ('fio', 300.0, 1)}
+
+def test_rows_come_back_in_matrix_order():
+    records = [(index, point, result(float(index), 'python')) for index, point in reversed(list(enumerate(POINTS)))]
+    rows = summarize_sweep(records, AXES)
+    assert [(row['queue_depth'], row['block_size']) for row in rows] == [(p['queue_depth'], p['block_size']) for p in POINTS]
+
+def test_copies_without_a_backend_and_aggregates():
+    records = [(0, POINTS[0], result(50.0, test='internal', direction='copy', engine='sendfile')),
+               (0, POINTS[0], result(100.0, 'python')),
+               (0, POINTS[0], result(400.0, 'python', aggregate=True))]
+    rows = summarize_sweep(records, AXES)
+    assert [(row['test'], row['backend'], row['mb_per_s']) for row in rows] == [('internal', None, 50.0), ('sequential', 'python', 100.0)]
+
+def test_pivot_keeps_one_grid_per_backend():
+    records = [(index, point, result(100.0 + index, backend)) for index, point in enumerate(POINTS) for backend in ['python', 'fio']]
+    grids = pivot_table(summarize_sweep(records, AXES), AXES, 'queue_depth', 'block_size')
+    assert set(grids) == {('sequential', 'read', 'direct', 'python', ()), ('sequential', 'read', 'direct', 'fio', ())}
+    row_values, column_values, cells = grids[('sequential', 'read', 'direct', 'python', ())]
+    assert row_values == [1, 8] and column_values == ['4K', '1M']
+    assert cells[(8, '1M')] == 103.0
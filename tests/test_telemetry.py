@@ -0,0 +1,43 @@
+import time
+import pytest
+from traveler_telemetry import (SECTOR_SIZE, cpu_utilization, disk_rates, smart_changes, start_telemetry, stop_telemetry,
+                                telemetry_window, timeline_telemetry)
+
+def test_cpu_utilization_between_snapshots():
+    before = {'cpu': (100, 1000), 'cpu0': (50, 500), 'cpu1': (50, 500)}
+    after = {'cpu': (400, 2000), 'cpu0': (50, 1000), 'cpu1': (350, 1000), 'cpu2': (10, 20)}
+    assert cpu_utilization(before, after) == {'cpu': 30.0, 'cpu0': 0.0, 'cpu1': 60.0}
+
+def test_disk_rates_over_a_window():
+    before = (1000, 8000, 500, 4000, 1000, 4000)
+    after = (3000, 8000 + 2048 * 1024 * 1024 // SECTOR_SIZE, 1500, 4000, 2500, 10000)
+    rates = disk_rates(before, after, 2.0)
+    assert (rates['read_iops'], rates['write_iops']) == (1000.0, 500.0)
+    assert (rates['read_mb_per_s'], rates['write_mb_per_s']) == (1024.0, 0.0)
+    assert rates['util_percent'] == 75.0 and rates['queue_depth'] == 3.0
+
+def test_only_grown_smart_counters_are_reported():
+    device = {'smart_start': {'media_errors': 0, 'warning_temp_time': 3, 'temperature': 40},
+              'smart_end': {'media_errors': 0, 'warning_temp_time': 7, 'temperature': 60}}
+    assert smart_changes(device) == {'warning_temp_time': 4}
+    assert smart_changes({'smart_start': None}) == {}
+
+def test_windows_and_timelines_are_joined_to_the_samples(tmp_path):
+    assert telemetry_window(str(tmp_path), time.perf_counter(), 1.0) is None
+    collector = start_telemetry([str(tmp_path)], interval=0.05)
+    try:
+        started = time.perf_counter()
+        time.sleep(0.2)
+        summary = telemetry_window(str(tmp_path), started, time.perf_counter() - started)
+        rows = timeline_telemetry([(0.0, 0), (0.1, 100), (0.2, 200)], started)
+    finally:
+        stop_telemetry(collector)
+    assert summary['samples'] >= 3
+    if 'cpu_mean_percent' in summary:
+        assert 0.0 <= summary['cpu_mean_percent'] <= summary['cpu_peak_percent'] <= 100.0
+    assert len(rows) == 2
+    assert telemetry_window(str(tmp_path), started, 0.1) is None
+
+@pytest.mark.parametrize('timeline, started', [([], 0.0), ([(0.0, 0), (0.1, 1)], None)])
+def test_no_timeline_telemetry_without_a_timeline(timeline, started):
+    assert timeline_telemetry(timeline, started) is None
@@ -0,0 +1,55 @@
+import os
+import filecmp
+import pytest
+from traveler_events import stop_event
+from traveler_tree import SIZE_DISTRIBUTIONS, file_sizes, tree_directory, generate_tree, copy_tree, _copy_batch
+
+@pytest.mark.parametrize('distribution', SIZE_DISTRIBUTIONS)
+def test_file_sizes_have_the_requested_mean(distribution):
+    sizes = file_sizes(20000, 64 * 1024, distribution, seed=1)
+    assert len(sizes) == 20000 and min(sizes) >= 0
+    assert sum(sizes) / len(sizes) == pytest.approx(64 * 1024, rel=0.05)
+
+def test_tree_directories_spread_files_over_every_leaf():
+    leaves = {tree_directory('root', index, 2, 4) for index in range(64)}
+    assert len(leaves) == 16
+    assert tree_directory('root', 5, 2, 4) == os.path.join('root', 'd01', 'd01')
+    assert tree_directory('root', 5, 0, 4) == 'root'
+
+def test_generated_tree_matches_its_stats(tmp_path):
+    root = str(tmp_path / 'test_tree')
+    stats = generate_tree(root, 200, 8 * 1024, 'uniform', depth=2, fanout=3, workers=4, seed=1)
+    paths = [os.path.join(directory, name) for directory, _, names in os.walk(root) for name in names]
+    assert stats['files'] == len(paths) == 200 and stats['directories'] == 9
+    assert stats['bytes'] == sum(os.path.getsize(path) for path in paths) == sum(file_sizes(200, 8 * 1024, 'uniform', seed=1))
+
+def test_copied_tree_is_identical(tmp_path):
+    source, destination = str(tmp_path / 'test_tree'), str(tmp_path / 'copy')
+    generated = generate_tree(source, 150, 4 * 1024, depth=2, fanout=2, workers=2, seed=1)
+    stats = copy_tree(source, destination, workers=3, batch_size=16)
+    assert stats['files'] == 150 and stats['bytes'] == generated['bytes'] and stats['directories'] == 7
+    comparison = filecmp.dircmp(source, destination)
+    assert not comparison.left_only and not comparison.right_only
+    for directory, _, names in os.walk(source):
+        relative = os.path.relpath(directory, source)
+        _, mismatch, errors = filecmp.cmpfiles(directory, os.path.join(destination, relative), names, shallow=False)
+        assert not mismatch and not errors
+
+class StopAfterFirstFile(dict):
+    """Progress dict that asks the copy to stop once the first file is done."""
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        stop_event.set()
+
+def test_stopped_batch_counts_only_the_files_it_copied(tmp_path):
+    batch = []
+    for i in range(3):
+        source = tmp_path / f'f{i}'
+        source.write_bytes(b'x' * 100)
+        batch.append((str(source), str(tmp_path / f'copy{i}'), 100))
+    try:
+        stats = _copy_batch(batch, StopAfterFirstFile())
+    finally:
+        stop_event.clear()
+    assert stats['files'] == 1 and stats['bytes'] == 100
+    assert os.path.exists(tmp_path / 'copy0') and not os.path.exists(tmp_path / 'copy1')
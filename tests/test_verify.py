@@ -0,0 +1,66 @@
+import os
+import shutil
+import pytest
+from traveler_verify import verify_copies, start_verification, finish_verification
+
+CHUNK = 64 * 1024
+
+def write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+
+@pytest.fixture
+def source(tmp_path):
+    path = str(tmp_path / 'test_file')
+    write(path, os.urandom(4 * CHUNK + 100))
+    return path
+
+def test_identical_copies_pass(tmp_path, source):
+    copies = [str(tmp_path / 'copy1'), str(tmp_path / 'copy2')]
+    for copy in copies:
+        shutil.copyfile(source, copy)
+    stats = verify_copies(source, copies, 'crc32', chunk_size=CHUNK)
+    assert stats['mismatches'] == [] and stats['copies'] == 2 and stats['files'] == 1
+    assert stats['bytes'] == 3 * os.path.getsize(source) and stats['algorithm'] == 'crc32'
+
+def test_mismatches_name_the_copy_and_chunk(tmp_path, source):
+    corrupt, short, missing = str(tmp_path / 'corrupt'), str(tmp_path / 'short'), str(tmp_path / 'missing')
+    shutil.copyfile(source, corrupt)
+    with open(corrupt, 'r+b') as f:
+        f.seek(2 * CHUNK + 7)
+        byte = f.read(1)
+        f.seek(-1, os.SEEK_CUR)
+        f.write(bytes([byte[0] ^ 1]))
+    with open(source, 'rb') as f:
+        write(short, f.read(CHUNK))
+    mismatches = verify_copies(source, [corrupt, short, missing], 'crc32', chunk_size=CHUNK)['mismatches']
+    assert len(mismatches) == 3
+    assert f"{missing} is missing" in mismatches
+    assert f"{short} is {CHUNK} bytes instead of {os.path.getsize(source)}" in mismatches
+    assert any(mismatch.startswith(corrupt) and f"offset {2 * CHUNK}" in mismatch for mismatch in mismatches)
+
+def test_trees_are_compared_file_by_file(tmp_path):
+    source, copy = str(tmp_path / 'test_tree'), str(tmp_path / 'copy')
+    for name in ['a', os.path.join('d', 'b'), os.path.join('d', 'empty')]:
+        write(os.path.join(source, name), os.urandom(100) if name != os.path.join('d', 'empty') else b'')
+    shutil.copytree(source, copy)
+    assert verify_copies(source, [copy], 'crc32')['mismatches'] == []
+    write(os.path.join(copy, 'd', 'b'), os.urandom(100))
+    [mismatch] = verify_copies(source, [copy], 'crc32')['mismatches']
+    assert mismatch.startswith(os.path.join(copy, 'd', 'b'))
+
+def test_source_is_hashed_once_per_digest_cache(tmp_path, source):
+    copy = str(tmp_path / 'copy')
+    shutil.copyfile(source, copy)
+    digests = {}
+    size = os.path.getsize(source)
+    assert verify_copies(source, [copy], 'crc32', chunk_size=CHUNK, source_digests=digests)['bytes'] == 2 * size
+    assert verify_copies(source, [copy], 'crc32', chunk_size=CHUNK, source_digests=digests)['bytes'] == size
+
+def test_background_verification_reports_errors(tmp_path, source):
+    copy = str(tmp_path / 'copy')
+    shutil.copyfile(source, copy)
+    assert finish_verification(start_verification(source, [copy], 'crc32'))['mismatches'] == []
+    with pytest.raises(FileNotFoundError):
+        finish_verification(start_verification(str(tmp_path / 'gone'), [copy], 'crc32'))
@@ -0,0 +1,138 @@
+import os
+import json
+import time
+import zlib
+import shutil
+import logging
+from traveler_engine import format_size
+
+CACHE_DIR = 'traveler_cache'
+MANIFEST_FILE = 'manifest.json'
+SAMPLE_COUNT = 64
+SAMPLE_SIZE = 64 * 1024
+FREE_SPACE_RESERVE = 0.05  # Fraction of the filesystem kept free when making room for a new test file
+
+def cache_directory(target_path):
+    """Return the test-file cache directory on a target path."""
+    return os.path.join(target_path, CACHE_DIR)
+
+def cache_name(size, pattern):
+    """Name of the cached test file for a size and data pattern."""
+    return f"test_file_{format_size(size)}_{pattern}"
+
+def load_manifest(cache_dir):
+    """Load the cache manifest, dropping entries whose files are gone."""
+    manifest = {'entries': {}}
+    manifest_path = os.path.join(cache_dir, MANIFEST_FILE)
+    if os.path.exists(manifest_path):
+        try:
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Ignoring unreadable test-file cache manifest {manifest_path}: {e}")
+    manifest['entries'] = {name: entry for name, entry in manifest.get('entries', {}).items()
+                           if os.path.exists(os.path.join(cache_dir, name))}
+    return manifest
+
+def save_manifest(cache_dir, manifest):
+    """Write the cache manifest atomically."""
+    manifest_path = os.path.join(cache_dir, MANIFEST_FILE)
+    with open(manifest_path + '.tmp', 'w') as f:
+        json.dump(manifest, f, indent=1)
+    os.replace(manifest_path + '.tmp', manifest_path)
+
+def sample_checksum(file_path, samples=SAMPLE_COUNT, sample_size=SAMPLE_SIZE):
+    """CRC32 of evenly spaced samples of a file (including its first and last bytes), cheap even for huge files."""
+    size = os.path.getsize(file_path)
+    checksum = zlib.crc32(size.to_bytes(8, 'little'))
+    with open(file_path, 'rb', buffering=0) as f:
+        for i in range(samples):
+            f.seek(max(0, (size - sample_size) * i // max(1, samples - 1)))
+            checksum = zlib.crc32(f.read(sample_size), checksum)
+    return f"{checksum:08x}"
+
+def make_room(cache_dir, manifest, needed, quota=None, keep=None):
+    """Evict least recently used test files until needed bytes fit under the quota and in the free space.
+
+    Returns the names of the evicted files.
+    """
+    evicted = []
+    usage = shutil.disk_usage(cache_dir)
+    reserve = int(usage.total * FREE_SPACE_RESERVE)
+    free = usage.free
+    cached = sum(entry['size'] for entry in manifest['entries'].values())
+    for name, entry in sorted(manifest['entries'].items(), key=lambda item: item[1]['last_used']):
+        if (quota is None or cached + needed <= quota) and free - needed >= reserve:
+            break
+        if name == keep:
+            continue
+        os.remove(os.path.join(cache_dir, name))
+        del manifest['entries'][name]
+        cached -= entry['size']
+        free += entry['size']
+        evicted.append(name)
+    return evicted
+
+def lookup_test_file(target_path, size, pattern, quota=None):
+    """Find a valid cached test file for size and pattern.
+
+    Returns (path, hit). On a miss the stale file is removed and room is made for a new one at path, which the
+    caller creates and then registers with store_test_file.
+    """
+    cache_dir = cache_directory(target_path)
+    os.makedirs(cache_dir, exist_ok=True)
+    manifest = load_manifest(cache_dir)
+    name = cache_name(size, pattern)
+    file_path = os.path.join(cache_dir, name)
+    entry = manifest['entries'].get(name)
+
+    if (entry is not None and not entry.get('writing') and os.path.getsize(file_path) == size
+            and sample_checksum(file_path) == entry['checksum']):
+        entry['last_used'] = time.time()
+        save_manifest(cache_dir, manifest)
+        return file_path, True
+
+    if entry is not None:
+        logging.warning(f"Cached test file {file_path} failed validation and will be regenerated.")
+        del manifest['entries'][name]
+    if os.path.exists(file_path):
+        os.remove(file_path)
+    for evicted in make_room(cache_dir, manifest, size, quota, keep=name):
+        logging.info(f"Evicted cached test file {evicted}.")
+    save_manifest(cache_dir, manifest)
+    return file_path, False
+
+def store_test_file(target_path, file_path, size, pattern):
+    """Register a freshly generated test file with its checksum; call it before any test writes to the file."""
+    cache_dir = cache_directory(target_path)
+    manifest = load_manifest(cache_dir)
+    entry = manifest['entries'].setdefault(os.path.basename(file_path), {'created': time.time()})
+    entry.update({'size': size, 'pattern': pattern, 'checksum': sample_checksum(file_path), 'last_used': time.time()})
+    save_manifest(cache_dir, manifest)
+
+def claim_test_file(target_path, file_path):
+    """Mark a cached test file that a write test is about to change, so a run that is interrupted before
+    release_test_file cannot leave it labelled as valid; the next lookup then regenerates it."""
+    cache_dir = cache_directory(target_path)
+    manifest = load_manifest(cache_dir)
+    entry = manifest['entries'].get(os.path.basename(file_path))
+    if entry is not None:
+        entry['writing'] = True
+        save_manifest(cache_dir, manifest)
+
+def release_test_file(target_path, file_path, written=False):
+    """Mark a cached test file as used after a run.
+
+    The write tests rewrite the file with the same data pattern at the same size, so a file they changed stays
+    reusable; it is checksummed again and its entry kept.
+    """
+    cache_dir = cache_directory(target_path)
+    manifest = load_manifest(cache_dir)
+    entry = manifest['entries'].get(os.path.basename(file_path))
+    if entry is None:
+        return
+    if written:
+        entry.pop('writing', None)
+        entry.update({'size': os.path.getsize(file_path), 'checksum': sample_checksum(file_path)})
+    entry['last_used'] = time.time()
+    save_manifest(cache_dir, manifest)
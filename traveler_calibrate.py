@@ -0,0 +1,125 @@
+import os
+import json
+import logging
+import datetime
+from traveler_engine import format_size
+from traveler_results import host_metadata
+from traveler_telemetry import mount_info
+
+CALIBRATION_VERSION = 1
+DEFAULT_CALIBRATION_FILE = 'traveler_calibration.json'
+DEFAULT_CALIBRATION_TARGET = '/dev/shm'
+RAM_FILESYSTEMS = ['tmpfs', 'ramfs']
+CEILING_MARGIN = 0.8  # A device result at 80% or more of the engine's RAM ceiling may be measuring Traveler, not the drive
+REGRESSION_THRESHOLD = 10.0  # Percent slower than the previous calibration worth flagging
+
+def calibration_key(result):
+    """Identify the engine configuration of a result, or None for results that are not flat-out engine passes.
+
+    Copies are keyed by copy engine only, so internal and external transfers share the ceiling of their engine. fio passes
+    have no key: the calibration measures Traveler's own engines, and fio's ceiling is not theirs.
+    """
+    if result.extra.get('backend') == 'fio':
+        return None
+    if result.test in ['internal', 'external'] and result.direction != 'verify':
+        return f"copy/{result.engine}"
+    if result.test not in ['sequential', 'random'] or result.extra.get('aggregate'):
+        return None
+    key = f"{result.test}/{result.direction}/{result.engine}/{format_size(result.block_size)}/QD{result.queue_depth}"
+    read_percent = result.extra.get('read_percent')
+    if read_percent not in (None, 0, 100):
+        key += f"/mix{read_percent}"
+    if result.extra.get('processes'):
+        key += f"/P{result.extra['processes']}"
+    return key
+
+def is_ram_backed(path):
+    """Return True if path is on a RAM-backed filesystem such as tmpfs."""
+    return mount_info(path).get('fs_type') in RAM_FILESYSTEMS
+
+def build_calibration(results, target):
+    """Turn the results of a calibration run into {engine key: ceiling} with the per-operation cost of each engine.
+
+    op_us is the wall time per operation of one worker (queue depth / IOPS), io_us the mean time inside the read or write
+    call, and overhead_us the difference: what the engine adds to every operation on top of the system call.
+    """
+    engines = {}
+    for result in results:
+        key = calibration_key(result)
+        if key is None:
+            continue
+        entry = {'mb_per_s': result.mb_per_s, 'iops': result.iops}
+        if result.iops and result.queue_depth and result.latency:
+            entry['op_us'] = result.queue_depth / result.iops * 1e6
+            entry['io_us'] = result.latency['mean_us']
+            entry['overhead_us'] = max(0.0, entry['op_us'] - entry['io_us'])
+        # Keep the faster of repeated passes (e.g. the internal copy run once per cycle)
+        if key not in engines or entry['mb_per_s'] > engines[key]['mb_per_s']:
+            engines[key] = entry
+    return {
+        'version': CALIBRATION_VERSION,
+        'created': datetime.datetime.now().astimezone().isoformat(timespec='seconds'),
+        'host': host_metadata(),
+        'target': mount_info(target),
+        'engines': engines,
+    }
+
+def load_calibration(calibration_path):
+    """Load a calibration file, or return None if there is none or it cannot be used."""
+    if not calibration_path or not os.path.exists(calibration_path):
+        return None
+    try:
+        with open(calibration_path) as f:
+            calibration = json.load(f)
+    except (OSError, ValueError) as e:
+        logging.warning(f"Ignoring unreadable calibration file {calibration_path}: {e}")
+        return None
+    if calibration.get('version') != CALIBRATION_VERSION:
+        logging.warning(f"Ignoring calibration file {calibration_path} with an unsupported version.")
+        return None
+    return calibration
+
+def save_calibration(calibration_path, calibration):
+    """Write a calibration file atomically."""
+    with open(calibration_path + '.tmp', 'w') as f:
+        json.dump(calibration, f, indent=1)
+    os.replace(calibration_path + '.tmp', calibration_path)
+
+def find_ceiling(calibration, result):
+    """Return the calibration entry of the engine configuration that produced result, or None."""
+    if calibration is None or calibration.get('host', {}).get('hostname') != host_metadata()['hostname']:
+        return None
+    key = calibration_key(result)
+    return calibration['engines'].get(key) if key else None
+
+def compare_calibrations(previous, current, threshold=REGRESSION_THRESHOLD):
+    """Compare two calibrations of the same host: return (key, previous MB/s, current MB/s, change percent) per engine
+    that got slower by more than threshold percent."""
+    regressions = []
+    for key, entry in current['engines'].items():
+        before = previous['engines'].get(key)
+        if before is None or not before['mb_per_s']:
+            continue
+        change = (entry['mb_per_s'] / before['mb_per_s'] - 1) * 100
+        if change <= -threshold:
+            regressions.append((key, before['mb_per_s'], entry['mb_per_s'], change))
+    return regressions
+
+def calibration_rows(calibration):
+    """Arrange a calibration as table rows, one per engine configuration."""
+    return [{'engine': key, 'mb_per_s': entry['mb_per_s'], 'iops': entry['iops'], 'op_us': entry.get('op_us'),
+             'io_us': entry.get('io_us'), 'overhead_us': entry.get('overhead_us')} for key, entry in sorted(calibration['engines'].items())]
+
+def flag_ceilings(results, calibration, margin=CEILING_MARGIN):
+    """Record in each result how close it came to its engine's RAM ceiling; return the results at margin or above."""
+    flagged = []
+    for result in results:
+        ceiling = find_ceiling(calibration, result)
+        if ceiling is None or not ceiling['mb_per_s']:
+            continue
+        result.extra['ceiling_mb_per_s'] = ceiling['mb_per_s']
+        result.extra['ceiling_percent'] = result.mb_per_s / ceiling['mb_per_s'] * 100
+        result.extra['near_ceiling'] = result.mb_per_s >= margin * ceiling['mb_per_s']
+        if result.extra['near_ceiling']:
+            flagged.append(result)
+    return flagged
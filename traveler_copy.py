@@ -0,0 +1,161 @@
+import os
+import sys
+import time
+import errno
+import queue
+import shutil
+import logging
+import threading
+from traveler_engine import allocate_aligned_buffer
+from traveler_events import stop_event, check_stop
+from traveler_metrics import new_histogram, record_latency, start_throughput_sampler, stop_throughput_sampler
+
+COPY_ENGINES = ['shutil', 'copy_file_range', 'sendfile', 'pipeline']
+COPY_CHUNK_SIZE = 8 * 1024 * 1024
+DEFAULT_COPY_BUFFERS = 4
+
+def available_copy_engines():
+    """Return the copy engines this platform supports."""
+    engines = ['shutil']
+    if hasattr(os, 'copy_file_range'):
+        engines.append('copy_file_range')
+    if hasattr(os, 'sendfile') and sys.platform.startswith('linux'):
+        # Only Linux can sendfile() into a regular file
+        engines.append('sendfile')
+    engines.append('pipeline')
+    return engines
+
+def _copy_shutil(source, destination, copy_buffers, histograms):
+    """Baseline: shutil.copy2, the same path as an Explorer/Finder-style copy (no per-chunk timing)."""
+    shutil.copy2(source, destination)
+    return os.path.getsize(destination)
+
+def _copy_sendfile(source, destination, copy_buffers, histograms):
+    """Copy inside the kernel with sendfile."""
+    return _copy_kernel(source, destination, copy_buffers, histograms, use_sendfile=True)
+
+def _copy_kernel(source, destination, copy_buffers, histograms, use_sendfile=False):
+    """Copy inside the kernel with copy_file_range (reflink/server-side capable) or sendfile."""
+    histogram = histograms['write'] = new_histogram()
+    clock = time.perf_counter_ns
+    with open(source, 'rb', buffering=0) as src, open(destination, 'wb', buffering=0) as dst:
+        in_fd, out_fd = src.fileno(), dst.fileno()
+        remaining = os.fstat(in_fd).st_size
+        copied = 0
+        while remaining > 0 and not stop_event.is_set():
+            count = min(COPY_CHUNK_SIZE, remaining)
+            issue_ns = clock()
+            if use_sendfile:
+                n = os.sendfile(out_fd, in_fd, None, count)
+            else:
+                n = os.copy_file_range(in_fd, out_fd, count)
+            record_latency(histogram, clock() - issue_ns)
+            if not n:
+                break
+            copied += n
+            remaining -= n
+    return copied
+
+def _copy_pipeline(source, destination, copy_buffers, histograms):
+    """Copy with a reader and a writer thread sharing copy_buffers in-flight aligned buffers."""
+    read_histogram = histograms['read'] = new_histogram()
+    write_histogram = histograms['write'] = new_histogram()
+    clock = time.perf_counter_ns
+    free_buffers = queue.Queue()
+    filled = queue.Queue()
+    for _ in range(max(1, copy_buffers)):
+        free_buffers.put(memoryview(allocate_aligned_buffer(COPY_CHUNK_SIZE)))
+    errors = []
+
+    def reader(src):
+        try:
+            while not errors and not stop_event.is_set():
+                view = free_buffers.get()
+                issue_ns = clock()
+                n = src.readinto(view)
+                record_latency(read_histogram, clock() - issue_ns)
+                if not n:
+                    break
+                filled.put((view, n))
+        except Exception as e:
+            errors.append(e)
+        finally:
+            filled.put((None, 0))
+
+    with open(source, 'rb', buffering=0) as src, open(destination, 'wb', buffering=0) as dst:
+        thread = threading.Thread(target=reader, args=(src,), daemon=True)
+        thread.start()
+        copied = 0
+        try:
+            while True:
+                view, n = filled.get()
+                if view is None:
+                    break
+                written = 0
+                issue_ns = clock()
+                while written < n:
+                    written += dst.write(view[written:n])
+                record_latency(write_histogram, clock() - issue_ns)
+                copied += n
+                free_buffers.put(view)
+        except Exception as e:
+            errors.append(e)
+            free_buffers.put(view)
+            raise
+        finally:
+            thread.join()
+    if errors:
+        raise errors[0]
+    return copied
+
+_COPY_FUNCTIONS = {
+    'shutil': _copy_shutil,
+    'copy_file_range': _copy_kernel,
+    'sendfile': _copy_sendfile,
+    'pipeline': _copy_pipeline,
+}
+
+def _destination_size(destination):
+    """Return how many bytes have reached the destination so far."""
+    try:
+        return os.path.getsize(destination)
+    except FileNotFoundError:
+        return 0
+
+def copy_file(source, destination, engine='shutil', copy_buffers=DEFAULT_COPY_BUFFERS, sample_interval=None):
+    """Copy source to destination with the chosen engine and return the timing stats."""
+    if engine not in COPY_ENGINES:
+        raise ValueError(f"Invalid copy engine. Use one of: {', '.join(COPY_ENGINES)}.")
+    if engine not in available_copy_engines():
+        raise ValueError(f"Copy engine {engine} is not supported on this platform.")
+
+    histograms = {}
+    # Every engine grows the destination as it goes, so its size is the progress counter
+    sampler = start_throughput_sampler(lambda: _destination_size(destination), sample_interval) if sample_interval else None
+    try:
+        start_time = time.perf_counter()
+        try:
+            copied = _COPY_FUNCTIONS[engine](source, destination, copy_buffers, histograms)
+        except OSError as e:
+            # copy_file_range/sendfile refuse some filesystem pairs (e.g. across devices on older kernels)
+            if engine == 'shutil' or e.errno not in (errno.EXDEV, errno.EINVAL, errno.ENOSYS, errno.EOPNOTSUPP):
+                raise
+            logging.warning(f"{engine} failed from {source} to {destination} ({e}), falling back to pipeline.")
+            engine = 'pipeline'
+            histograms = {}
+            start_time = time.perf_counter()
+            copied = _copy_pipeline(source, destination, copy_buffers, histograms)
+        end_time = time.perf_counter()
+    finally:
+        timeline = stop_throughput_sampler(sampler) if sampler else None
+    check_stop()
+
+    return {
+        'bytes': copied,
+        'seconds': end_time - start_time,
+        'started': start_time,
+        'engine': engine,
+        'histogram': histograms.get('write'),
+        'read_histogram': histograms.get('read'),
+        'timeline': timeline,
+    }
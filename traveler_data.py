@@ -0,0 +1,76 @@
+import os
+import time
+import errno
+import random
+import concurrent.futures
+from traveler_events import stop_event, check_stop
+from traveler_engine import (DEFAULT_BLOCK_SIZE, DATA_PATTERNS, SHARED_FD, open_target, pwrite_from, split_ranges,
+                             allocate_aligned_buffer, fill_pattern_buffer, stamp_block)
+
+def preallocate(fd, size):
+    """Reserve size bytes of physical space for fd where the platform supports it."""
+    if hasattr(os, 'posix_fallocate'):
+        try:
+            os.posix_fallocate(fd, 0, size)
+            return True
+        except OSError as e:
+            if e.errno not in (errno.EOPNOTSUPP, errno.EINVAL, getattr(errno, 'ENOTSUP', errno.EOPNOTSUPP)):
+                raise
+    return False
+
+def _fill_worker(fd, file_path, start, end, block_size, pattern, seed):
+    """Fill [start, end) with stamped pattern blocks and return the bytes written."""
+    handle = None
+    if fd is None:
+        own_fd, _ = open_target(file_path, 'write')
+        handle = fd = open(own_fd, 'wb', buffering=0)
+    buffer = allocate_aligned_buffer(block_size)
+    fill_pattern_buffer(buffer, pattern, seed)
+    view = memoryview(buffer)
+    written = 0
+    try:
+        offset = start
+        while offset < end and not stop_event.is_set():
+            chunk = view if end - offset >= block_size else view[:end - offset]
+            if pattern != 'zeros':
+                stamp_block(chunk, offset)
+            written += pwrite_from(fd, chunk, offset)
+            offset += len(chunk)
+    finally:
+        if handle is not None:
+            handle.close()
+    return written
+
+def generate_test_file(file_path, total_size, pattern='random', workers=None, block_size=DEFAULT_BLOCK_SIZE, seed=None):
+    """Write a fully allocated test file of the given data pattern in parallel and return the fill stats."""
+    if pattern not in DATA_PATTERNS:
+        raise ValueError(f"Invalid data pattern. Use one of: {', '.join(DATA_PATTERNS)}.")
+    workers = workers or os.cpu_count() or 1
+    if seed is None:
+        seed = random.randrange(1 << 32)
+
+    start_time = time.perf_counter()
+    fd, _ = open_target(file_path, 'write')
+    try:
+        os.ftruncate(fd, 0)
+        preallocated = preallocate(fd, total_size)
+        ranges = split_ranges(total_size, workers, block_size)
+        shared_fd = fd if SHARED_FD else None
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_fill_worker, shared_fd, file_path, start, end, block_size, pattern, seed + i)
+                       for i, (start, end) in enumerate(ranges) if end > start]
+            written = sum(future.result() for future in futures)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    check_stop()
+    elapsed = time.perf_counter() - start_time
+
+    return {
+        'bytes': written,
+        'seconds': elapsed,
+        'pattern': pattern,
+        'seed': seed,
+        'workers': workers,
+        'preallocated': preallocated,
+    }
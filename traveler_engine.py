@@ -0,0 +1,652 @@
+import os
+import sys
+import math
+import mmap
+import time
+import random
+import struct
+from array import array
+import errno
+import logging
+import threading
+import concurrent.futures
+from traveler_events import stop_event, check_stop
+from traveler_metrics import (SUM_SLOT, new_histogram, record_latency, merge_histograms, start_throughput_sampler,
+                              stop_throughput_sampler)
+
+IO_ENGINES = ['buffered', 'direct']
+MIN_BLOCK_SIZE = 4 * 1024
+MAX_BLOCK_SIZE = 4 * 1024 * 1024
+DEFAULT_BLOCK_SIZE = 1024 * 1024
+ACCESS_DISTRIBUTIONS = ['uniform', 'zipf', 'hotset']
+DEFAULT_RANDOM_BLOCK_SIZE = 4 * 1024
+DEFAULT_RANDOM_OPS = 256 * 1024
+ZIPF_THETA = 1.2  # Skew of the zipf distribution (>1: a few blocks take most accesses)
+HOT_SET_FRACTION = 0.1  # hotset: 90% of accesses go to 10% of the file
+HOT_SET_PROBABILITY = 0.9
+PACED_STEPS = [10, 25, 50, 75, 90, 100, 110]  # Paced rates, in percent of the flat-out rate
+DEFAULT_PACED_SECONDS = 5.0
+SATURATION_RATIO = 0.9  # A paced step that completes less than 90% of its target rate is saturated
+PACED_START_DELAY = 0.01  # seconds, so every worker is waiting before the first operation is due
+BLOCK_SIZES = ['4K', '8K', '16K', '32K', '64K', '128K', '256K', '512K', '1M', '2M', '4M']
+O_BINARY = getattr(os, 'O_BINARY', 0)  # Windows opens fds in text mode otherwise
+DATA_PATTERNS = ['zeros', 'compressible', 'random']
+SECTOR_SIZE = 4096  # Granularity at which controllers compress and dedupe
+_STAMP = struct.Struct('<Q')
+
+def allocate_aligned_buffer(size):
+    """Allocate a page-aligned buffer (anonymous mmap) usable with O_DIRECT."""
+    return mmap.mmap(-1, size)
+
+def open_target(file_path, operation, io_engine='buffered', dsync=False):
+    """Open a file for the given operation and return (fd, direct_io_active)."""
+    if operation == 'read':
+        flags = os.O_RDONLY | O_BINARY
+    elif operation in ['write', 'readwrite']:
+        flags = (os.O_WRONLY if operation == 'write' else os.O_RDWR) | os.O_CREAT | O_BINARY
+        if dsync:
+            flags |= getattr(os, 'O_DSYNC', getattr(os, 'O_SYNC', 0))
+    else:
+        raise ValueError("Invalid operation. Use 'write', 'read' or 'readwrite'.")
+
+    if io_engine not in IO_ENGINES:
+        raise ValueError(f"Invalid I/O engine. Use one of: {', '.join(IO_ENGINES)}.")
+
+    if io_engine == 'direct' and hasattr(os, 'O_DIRECT'):
+        try:
+            return os.open(file_path, flags | os.O_DIRECT, 0o644), True
+        except OSError as e:
+            if e.errno not in (errno.EINVAL, errno.EOPNOTSUPP):
+                raise
+            logging.warning(f"O_DIRECT is not supported for {file_path}, falling back to cache eviction.")
+
+    fd = os.open(file_path, flags, 0o644)
+    if io_engine == 'direct':
+        # macOS has no O_DIRECT but can disable caching per descriptor
+        try:
+            import fcntl
+            if hasattr(fcntl, 'F_NOCACHE'):
+                fcntl.fcntl(fd, fcntl.F_NOCACHE, 1)
+        except (ImportError, OSError):
+            pass
+    return fd, False
+
+def drop_file_cache(file_path):
+    """Flush a file and evict it from the page cache so the next pass hits the device."""
+    fd = os.open(file_path, os.O_RDONLY | O_BINARY)
+    try:
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        if hasattr(os, 'posix_fadvise'):
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    finally:
+        os.close(fd)
+
+    # Dropping the clean caches system-wide needs root, so this is best effort
+    if sys.platform.startswith('linux'):
+        try:
+            os.sync()
+            with open('/proc/sys/vm/drop_caches', 'w') as f:
+                f.write('1')
+        except OSError:
+            pass
+
+def evict_unless_direct(file_path):
+    """Evict a file from the page cache before a direct pass, but only where O_DIRECT is unavailable for it."""
+    fd, direct = open_target(file_path, 'read', 'direct')
+    os.close(fd)
+    if not direct:
+        drop_file_cache(file_path)
+
+if hasattr(os, 'pwrite') and hasattr(os, 'preadv'):
+    SHARED_FD = True
+
+    def pwrite_from(fd, view, offset):
+        """Write view at offset without moving the shared file position."""
+        return os.pwrite(fd, view, offset)
+
+    def pread_into(fd, view, offset):
+        """Read into view at offset without moving the shared file position."""
+        return os.preadv(fd, [view], offset)
+else:
+    # Windows has no pread/pwrite, so every worker gets its own raw file object and seeks
+    SHARED_FD = False
+
+    def pwrite_from(handle, view, offset):
+        """Write view at offset on a worker-private raw file object."""
+        handle.seek(offset)
+        return handle.write(view)
+
+    def pread_into(handle, view, offset):
+        """Read into view at offset on a worker-private raw file object."""
+        handle.seek(offset)
+        return handle.readinto(view)
+
+def parse_size(text):
+    """Parse a size such as 4096, 4K, 1M, 2G or 1T into bytes."""
+    text = str(text).strip().upper().rstrip('B').rstrip('I')
+    units = {'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3, 'T': 1024 ** 4}
+    if text and text[-1] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(text)
+
+def format_size(size):
+    """Format a byte count the way block sizes are written on the command line (4K, 1M)."""
+    for unit, factor in (('G', 1024 ** 3), ('M', 1024 ** 2), ('K', 1024)):
+        if size >= factor and size % factor == 0:
+            return f"{size // factor}{unit}"
+    return str(size)
+
+def parse_block_size(text):
+    """Parse and validate a block size: a power of two from 4K to 4M."""
+    block_size = parse_size(text)
+    if block_size < MIN_BLOCK_SIZE or block_size > MAX_BLOCK_SIZE or block_size & (block_size - 1):
+        raise ValueError(f"Block size must be a power of two between {format_size(MIN_BLOCK_SIZE)} and {format_size(MAX_BLOCK_SIZE)}: {text}")
+    return block_size
+
+def parse_paced_steps(text):
+    """Parse comma-separated paced rates such as 10,50,100 (percent of the flat-out rate) into a list of positive numbers."""
+    steps = [float(step) for step in str(text).replace('%', '').split(',') if step.strip()]
+    if not steps or any(step <= 0 for step in steps):
+        raise ValueError(f"Paced steps must be positive percentages: {text}")
+    return [int(step) if step.is_integer() else step for step in steps]
+
+def allocate_worker_buffers(workers, block_size, pattern=None):
+    """Preallocate one aligned buffer per worker so the hot loops never allocate, filled with pattern if given."""
+    buffers = [allocate_aligned_buffer(block_size) for _ in range(workers)]
+    for seed, buffer in enumerate(buffers if pattern else []):
+        fill_pattern_buffer(buffer, pattern, seed)
+    return buffers
+
+def fill_pattern_buffer(buffer, pattern='random', seed=0):
+    """Fill a buffer with the base block of a data pattern."""
+    size = len(buffer)
+    if pattern == 'zeros':
+        buffer[:size] = bytes(size)
+    elif pattern == 'random':
+        buffer[:size] = random.Random(seed).randbytes(size)
+    elif pattern == 'compressible':
+        # Half of every sector is random, half is zeros: roughly 2:1 for any compressor
+        half = SECTOR_SIZE // 2
+        noise = random.Random(seed).randbytes(size)
+        compressible = bytearray(size)
+        for offset in range(0, size, SECTOR_SIZE):
+            compressible[offset:offset + half] = noise[offset:offset + half]
+        buffer[:size] = compressible
+    else:
+        raise ValueError(f"Invalid data pattern. Use one of: {', '.join(DATA_PATTERNS)}.")
+
+def stamp_block(view, offset):
+    """Write the file offset of every sector into its first bytes so no two sectors are identical."""
+    pack_into = _STAMP.pack_into
+    for sector in range(0, len(view), SECTOR_SIZE):
+        pack_into(view, sector, offset + sector)
+
+def open_worker_handle(file_path, operation, io_engine='buffered', dsync=False):
+    """Open a worker-private raw file object for platforms without positional I/O."""
+    fd, _ = open_target(file_path, operation, io_engine, dsync)
+    return open(fd, {'read': 'rb', 'write': 'wb', 'readwrite': 'r+b'}[operation], buffering=0)
+
+def split_ranges(total_size, workers, alignment):
+    """Split total_size into per-worker (start, end) ranges on alignment boundaries."""
+    blocks = -(-total_size // alignment)
+    ranges = []
+    for i in range(workers):
+        start = min(blocks * i // workers * alignment, total_size)
+        end = min(blocks * (i + 1) // workers * alignment, total_size)
+        ranges.append((start, end))
+    return ranges
+
+def _finish_pass(overlap, index):
+    """Record that a mixed-run worker covered its range once; return True once every worker has."""
+    with overlap['lock']:
+        overlap['finished'].add(index)
+        if len(overlap['finished']) == overlap['workers']:
+            overlap['done'].set()
+    return overlap['done'].is_set()
+
+def _sequential_worker(fd, file_path, operation, start, end, buffer, block_size, io_engine, dsync, progress, index, overlap=None, stamp=False):
+    """Transfer the byte range [start, end) in block_size blocks and return the timing stats.
+
+    With overlap (mixed runs), a worker that finishes its range early starts over from its beginning and keeps going
+    until every worker has covered its range once, so reads and writes overlap for the whole measurement. With stamp,
+    every written block is stamped with its offset, as in the test file.
+    """
+    handle = None
+    if fd is None:
+        handle = fd = open_worker_handle(file_path, operation, io_engine, dsync)
+    transfer = pwrite_from if operation == 'write' else pread_into
+    clock = time.perf_counter_ns
+    stopped = stop_event.is_set if overlap is None else lambda: stop_event.is_set() or overlap['done'].is_set()
+    view = memoryview(buffer)[:block_size]
+    histogram = new_histogram()
+    transferred = 0
+    try:
+        start_ns = clock()
+        offset = start
+        while not stopped():
+            if offset >= end:
+                if overlap is None or _finish_pass(overlap, index):
+                    break
+                offset = start
+            chunk = view if end - offset >= block_size else view[:end - offset]
+            if stamp:
+                stamp_block(chunk, offset)
+            issue_ns = clock()
+            n = transfer(fd, chunk, offset)
+            record_latency(histogram, clock() - issue_ns)
+            if not n:
+                break
+            offset += n
+            transferred += n
+            progress[index] = transferred
+        end_ns = clock()
+    finally:
+        if handle is not None:
+            handle.close()
+    return {'offset': start, 'bytes': transferred, 'seconds': (end_ns - start_ns) / 1e9, 'operation': operation,
+            'io_seconds': histogram[SUM_SLOT] / 1e9, 'histogram': histogram}
+
+def run_sequential(file_path, total_size, operation, queue_depth=1, block_size=DEFAULT_BLOCK_SIZE, io_engine='buffered', dsync=False, buffers=None, sample_interval=None, pattern='random'):
+    """Run a sequential read or write with queue_depth workers, each owning a disjoint offset range.
+
+    Writes carry the data pattern as in run_random: buffers passed in must already hold it.
+    """
+    if queue_depth < 1:
+        raise ValueError("Queue depth must be at least 1.")
+    if buffers is None:
+        buffers = allocate_worker_buffers(queue_depth, block_size, pattern)
+    elif len(buffers) < queue_depth or any(len(buffer) < block_size for buffer in buffers):
+        raise ValueError("Need one preallocated buffer of at least block_size per worker.")
+    if operation == 'read':
+        total_size = min(total_size, os.path.getsize(file_path))
+
+    fd, direct = open_target(file_path, operation, io_engine, dsync)
+    if operation == 'read' and io_engine == 'direct' and not direct:
+        # Without O_DIRECT the pass would be served from the page cache
+        drop_file_cache(file_path)
+    ranges = split_ranges(total_size, queue_depth, block_size)
+    progress = [0] * queue_depth  # Bytes completed per worker, read by the throughput sampler
+    sampler = start_throughput_sampler(lambda: sum(progress), sample_interval) if sample_interval else None
+    try:
+        shared_fd = fd if SHARED_FD else None
+        start_time = time.perf_counter()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=queue_depth) as executor:
+            futures = [executor.submit(_sequential_worker, shared_fd, file_path, operation, start, end,
+                                       buffers[i], block_size, io_engine, dsync, progress, i,
+                                       stamp=operation == 'write' and pattern != 'zeros')
+                       for i, (start, end) in enumerate(ranges)]
+            workers = [future.result() for future in futures]
+        if operation == 'write' and io_engine == 'direct' and not direct:
+            # Without O_DIRECT the data is still dirty in the cache; include the flush
+            os.fsync(fd)
+        end_time = time.perf_counter()
+    finally:
+        os.close(fd)
+        timeline = stop_throughput_sampler(sampler) if sampler else None
+    check_stop()
+
+    if operation == 'write' and io_engine == 'direct' and not direct:
+        drop_file_cache(file_path)
+
+    # Share of worker time spent in Python rather than inside the read/write syscalls
+    worker_seconds = sum(worker['seconds'] for worker in workers)
+    io_seconds = sum(worker['io_seconds'] for worker in workers)
+    overhead = 1.0 - io_seconds / worker_seconds if worker_seconds else 0.0
+
+    return {
+        'bytes': sum(worker['bytes'] for worker in workers),
+        'seconds': end_time - start_time,
+        'started': start_time,
+        'histogram': merge_histograms(worker['histogram'] for worker in workers),
+        'direct': direct,
+        'queue_depth': queue_depth,
+        'block_size': block_size,
+        'python_overhead': overhead,
+        'timeline': timeline,
+        'workers': workers,
+    }
+
+def mixed_split(queue_depth, read_percent):
+    """Return how many of queue_depth mixed-run workers read: read_percent of them, but at least one reader and one writer."""
+    if queue_depth < 2:
+        raise ValueError("A mixed read/write run needs a queue depth of at least 2 (one reader and one writer).")
+    if not 0 < read_percent < 100:
+        raise ValueError("The read share of a mixed run must be between 1 and 99 percent.")
+    return min(queue_depth - 1, max(1, round(queue_depth * read_percent / 100)))
+
+def run_mixed(file_path, total_size, read_percent=50, queue_depth=2, block_size=DEFAULT_BLOCK_SIZE, io_engine='buffered', dsync=False, buffers=None, sample_interval=None, pattern='random'):
+    """Run sequential reads and writes at the same time on separate regions of the file.
+
+    The file is split into queue_depth ranges as in run_sequential; read_percent of the workers read the leading ranges
+    while the others write the rest. Workers that finish early wrap around until the last one completes, so both
+    directions are under load for the whole run, and bytes and latency are reported per direction. Writes carry
+    pattern as in run_sequential.
+    """
+    readers = mixed_split(queue_depth, read_percent)
+    if buffers is None:
+        buffers = allocate_worker_buffers(queue_depth, block_size, pattern)
+    if len(buffers) < queue_depth or any(len(buffer) < block_size for buffer in buffers):
+        raise ValueError("Need one preallocated buffer of at least block_size per worker.")
+    total_size = min(total_size, os.path.getsize(file_path))
+
+    fd, direct = open_target(file_path, 'readwrite', io_engine, dsync)
+    if io_engine == 'direct' and not direct:
+        drop_file_cache(file_path)
+    ranges = split_ranges(total_size, queue_depth, block_size)
+    progress = [0] * queue_depth
+    overlap = {'lock': threading.Lock(), 'finished': set(), 'workers': queue_depth, 'done': threading.Event()}
+    sampler = start_throughput_sampler(lambda: sum(progress), sample_interval) if sample_interval else None
+    try:
+        shared_fd = fd if SHARED_FD else None
+        start_time = time.perf_counter()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=queue_depth) as executor:
+            futures = [executor.submit(_sequential_worker, shared_fd, file_path, 'read' if i < readers else 'write', start, end,
+                                       buffers[i], block_size, io_engine, dsync, progress, i, overlap,
+                                       i >= readers and pattern != 'zeros')
+                       for i, (start, end) in enumerate(ranges)]
+            workers = [future.result() for future in futures]
+        if io_engine == 'direct' and not direct:
+            os.fsync(fd)
+        end_time = time.perf_counter()
+    finally:
+        os.close(fd)
+        timeline = stop_throughput_sampler(sampler) if sampler else None
+    check_stop()
+
+    if io_engine == 'direct' and not direct:
+        drop_file_cache(file_path)
+    stats = {'seconds': end_time - start_time, 'started': start_time, 'direct': direct, 'queue_depth': queue_depth,
+             'block_size': block_size, 'readers': readers, 'writers': queue_depth - readers, 'timeline': timeline, 'workers': workers}
+    for direction in ['read', 'write']:
+        stats[f'{direction}_bytes'] = sum(worker['bytes'] for worker in workers if worker['operation'] == direction)
+        stats[f'{direction}_histogram'] = merge_histograms(worker['histogram'] for worker in workers if worker['operation'] == direction)
+    stats['bytes'] = stats['read_bytes'] + stats['write_bytes']
+    stats['histogram'] = merge_histograms([stats['read_histogram'], stats['write_histogram']])
+    worker_seconds = sum(worker['seconds'] for worker in workers)
+    io_seconds = sum(worker['io_seconds'] for worker in workers)
+    stats['python_overhead'] = 1.0 - io_seconds / worker_seconds if worker_seconds else 0.0
+    return stats
+
+def _coprime_stride(blocks):
+    """Return a large stride coprime with blocks, used to scatter hot ranks across the file."""
+    stride = 2654435761 % blocks if blocks > 1 else 1
+    while blocks > 1 and math.gcd(stride, blocks) != 1:
+        stride += 1
+    return stride
+
+def generate_offsets(total_size, block_size, count, distribution='uniform', seed=None):
+    """Precompute count block-aligned offsets for a random workload so the hot loop only indexes an array."""
+    blocks = total_size // block_size
+    if blocks < 1:
+        raise ValueError("The test file is smaller than one block.")
+    rng = random.Random(seed)
+    if distribution == 'uniform':
+        below = rng.randrange
+        indexes = [below(blocks) for _ in range(count)]
+    elif distribution == 'zipf':
+        # Inverse CDF of the continuous zipf approximation, then scatter ranks so hot blocks are not adjacent
+        exponent = 1.0 - ZIPF_THETA
+        scale = blocks ** exponent - 1.0
+        inverse = 1.0 / exponent
+        stride = _coprime_stride(blocks)
+        uniform = rng.random
+        indexes = [(min(int((scale * uniform() + 1.0) ** inverse), blocks) - 1) * stride % blocks for _ in range(count)]
+    elif distribution == 'hotset':
+        hot_blocks = max(1, int(blocks * HOT_SET_FRACTION))
+        cold_blocks = blocks - hot_blocks
+        stride = _coprime_stride(blocks)
+        uniform, below = rng.random, rng.randrange
+        indexes = [(below(hot_blocks) if uniform() < HOT_SET_PROBABILITY or not cold_blocks
+                    else hot_blocks + below(cold_blocks)) * stride % blocks for _ in range(count)]
+    else:
+        raise ValueError(f"Invalid access distribution. Use one of: {', '.join(ACCESS_DISTRIBUTIONS)}.")
+    return array('Q', [index * block_size for index in indexes])
+
+def generate_op_kinds(count, read_percent, seed=None):
+    """Precompute the read (0) / write (1) decision of every operation for a read/write mix."""
+    if read_percent >= 100:
+        return bytes(count)
+    if read_percent <= 0:
+        return b'\1' * count
+    uniform = random.Random(seed).random
+    threshold = read_percent / 100
+    return bytes(uniform() >= threshold for _ in range(count))
+
+def _random_worker(fd, file_path, operation, offsets, kinds, buffer, block_size, io_engine, dsync, progress, index, stamp=False):
+    """Issue the precomputed random operations of one worker and return per-direction timing stats.
+
+    With stamp, every block is stamped with its offset before it is written, as in the test file, so random writes
+    cannot be compressed or deduplicated away.
+    """
+    handle = None
+    if fd is None:
+        handle = fd = open_worker_handle(file_path, operation, io_engine, dsync)
+    clock = time.perf_counter_ns
+    stopped = stop_event.is_set
+    view = memoryview(buffer)[:block_size]
+    histograms = (new_histogram(), new_histogram())  # (read, write)
+    transferred = [0, 0]
+    try:
+        start_ns = clock()
+        for offset, kind in zip(offsets, kinds):
+            if stopped():
+                break
+            if kind and stamp:
+                stamp_block(view, offset)
+            issue_ns = clock()
+            if kind:
+                n = pwrite_from(fd, view, offset)
+            else:
+                n = pread_into(fd, view, offset)
+            record_latency(histograms[kind], clock() - issue_ns)
+            transferred[kind] += n
+            progress[index] += n
+        end_ns = clock()
+    finally:
+        if handle is not None:
+            handle.close()
+    return {'read_bytes': transferred[0], 'write_bytes': transferred[1], 'seconds': (end_ns - start_ns) / 1e9,
+            'read_histogram': histograms[0], 'write_histogram': histograms[1]}
+
+def run_random(file_path, total_size, queue_depth=1, block_size=DEFAULT_RANDOM_BLOCK_SIZE, io_engine='buffered', read_percent=100,
+               distribution='uniform', ops=DEFAULT_RANDOM_OPS, seed=None, dsync=False, buffers=None, sample_interval=None,
+               pattern='random'):
+    """Run a random-access workload of ops block_size operations with queue_depth workers.
+
+    Writes carry the data pattern of the test file: buffers passed in must already hold it, and every written block is
+    stamped with its offset unless the pattern is zeros.
+    """
+    if queue_depth < 1:
+        raise ValueError("Queue depth must be at least 1.")
+    if buffers is None:
+        buffers = allocate_worker_buffers(queue_depth, block_size, pattern)
+    elif len(buffers) < queue_depth or any(len(buffer) < block_size for buffer in buffers):
+        raise ValueError("Need one preallocated buffer of at least block_size per worker.")
+    total_size = min(total_size, os.path.getsize(file_path))
+    operation = 'read' if read_percent >= 100 else 'write' if read_percent <= 0 else 'readwrite'
+
+    # Everything random is decided up front, outside the timed region
+    offsets = generate_offsets(total_size, block_size, ops, distribution, seed)
+    kinds = generate_op_kinds(ops, read_percent, None if seed is None else seed + 1)
+    ranges = split_ranges(ops, queue_depth, 1)
+
+    fd, direct = open_target(file_path, operation, io_engine, dsync)
+    if io_engine == 'direct' and not direct:
+        drop_file_cache(file_path)
+    progress = [0] * queue_depth
+    sampler = start_throughput_sampler(lambda: sum(progress), sample_interval) if sample_interval else None
+    try:
+        shared_fd = fd if SHARED_FD else None
+        start_time = time.perf_counter()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=queue_depth) as executor:
+            futures = [executor.submit(_random_worker, shared_fd, file_path, operation,
+                                       memoryview(offsets)[start:end], memoryview(kinds)[start:end],
+                                       buffers[i], block_size, io_engine, dsync, progress, i, pattern != 'zeros')
+                       for i, (start, end) in enumerate(ranges)]
+            workers = [future.result() for future in futures]
+        if operation != 'read' and io_engine == 'direct' and not direct:
+            os.fsync(fd)
+        end_time = time.perf_counter()
+    finally:
+        os.close(fd)
+        timeline = stop_throughput_sampler(sampler) if sampler else None
+    check_stop()
+
+    read_histogram = merge_histograms(worker['read_histogram'] for worker in workers)
+    write_histogram = merge_histograms(worker['write_histogram'] for worker in workers)
+    worker_seconds = sum(worker['seconds'] for worker in workers)
+    io_seconds = (read_histogram[SUM_SLOT] + write_histogram[SUM_SLOT]) / 1e9
+    read_bytes = sum(worker['read_bytes'] for worker in workers)
+    write_bytes = sum(worker['write_bytes'] for worker in workers)
+
+    return {
+        'bytes': read_bytes + write_bytes,
+        'read_bytes': read_bytes,
+        'write_bytes': write_bytes,
+        'seconds': end_time - start_time,
+        'started': start_time,
+        'histogram': merge_histograms([read_histogram, write_histogram]),
+        'read_histogram': read_histogram,
+        'write_histogram': write_histogram,
+        'direct': direct,
+        'queue_depth': queue_depth,
+        'block_size': block_size,
+        'python_overhead': 1.0 - io_seconds / worker_seconds if worker_seconds else 0.0,
+        'timeline': timeline,
+        'workers': workers,
+    }
+
+def sequential_offsets(start, end, block_size, count):
+    """Return count consecutive block offsets in [start, end), wrapping around at the end of the range."""
+    blocks = max(1, (end - start) // block_size)
+    return array('Q', [start + k % blocks * block_size for k in range(count)])
+
+def _paced_worker(fd, file_path, operation, offsets, kinds, due_ns, period_ns, buffer, block_size, io_engine, dsync, progress, index, stamp=False):
+    """Issue operations on a fixed schedule, operation k being due at due_ns + k * period_ns, and return timing stats.
+
+    Latency is counted from when an operation was due, not from when it was issued. A worker that falls behind issues
+    the overdue operations back to back without moving the schedule, so a stall shows up in the latency of everything
+    queued behind it instead of hiding it (coordinated omission). An operation the worker had to wait for is counted
+    from its issue, so timer slack is not charged to the device. With stamp, written blocks are stamped as in _random_worker.
+    """
+    handle = None
+    if fd is None:
+        handle = fd = open_worker_handle(file_path, operation, io_engine, dsync)
+    clock = time.perf_counter_ns
+    sleep = time.sleep
+    stopped = stop_event.is_set
+    view = memoryview(buffer)[:block_size]
+    histograms = (new_histogram(), new_histogram())  # (read, write), from when each operation was due
+    service_histogram = new_histogram()  # From issue to completion
+    transferred = [0, 0]
+    late = 0
+    try:
+        for k, (offset, kind) in enumerate(zip(offsets, kinds)):
+            if stopped():
+                break
+            due = due_ns + k * period_ns
+            issue_ns = clock()
+            if issue_ns < due:
+                sleep((due - issue_ns) / 1e9)
+                issue_ns = due = clock()
+            elif issue_ns - due > period_ns:
+                late += 1
+            if kind and stamp:
+                stamp_block(view, offset)
+            if kind:
+                n = pwrite_from(fd, view, offset)
+            else:
+                n = pread_into(fd, view, offset)
+            done_ns = clock()
+            record_latency(histograms[kind], done_ns - due)
+            record_latency(service_histogram, done_ns - issue_ns)
+            transferred[kind] += n
+            progress[index] += n
+    finally:
+        if handle is not None:
+            handle.close()
+    return {'read_bytes': transferred[0], 'write_bytes': transferred[1], 'late_ops': late, 'read_histogram': histograms[0],
+            'write_histogram': histograms[1], 'service_histogram': service_histogram}
+
+def run_paced(file_path, total_size, rate, seconds=DEFAULT_PACED_SECONDS, access='sequential', read_percent=100, queue_depth=1,
+              block_size=DEFAULT_BLOCK_SIZE, io_engine='buffered', distribution='uniform', seed=None, dsync=False, buffers=None,
+              sample_interval=None, pattern='random'):
+    """Run an open-loop workload that issues rate operations per second for seconds, whatever the device does.
+
+    Arrivals are spread evenly over queue_depth workers (worker i takes every queue_depth-th arrival). access is
+    'sequential' (each worker streams through its own range of the file, wrapping around) or 'random' (offsets from
+    generate_offsets). Writes carry pattern as in run_random. Returns the run_random stats plus the target and the
+    per-operation service latency.
+    """
+    if queue_depth < 1:
+        raise ValueError("Queue depth must be at least 1.")
+    if rate <= 0 or seconds <= 0:
+        raise ValueError("The paced rate and duration must be positive.")
+    if buffers is None:
+        buffers = allocate_worker_buffers(queue_depth, block_size, pattern)
+    elif len(buffers) < queue_depth or any(len(buffer) < block_size for buffer in buffers):
+        raise ValueError("Need one preallocated buffer of at least block_size per worker.")
+    total_size = min(total_size, os.path.getsize(file_path))
+    operation = 'read' if read_percent >= 100 else 'write' if read_percent <= 0 else 'readwrite'
+
+    # The whole schedule is decided up front, outside the timed region
+    per_worker = max(1, int(rate * seconds) // queue_depth)
+    ops = per_worker * queue_depth
+    if access == 'sequential':
+        offsets = [sequential_offsets(start, end, block_size, per_worker) for start, end in split_ranges(total_size, queue_depth, block_size)]
+    else:
+        all_offsets = generate_offsets(total_size, block_size, ops, distribution, seed)
+        offsets = [memoryview(all_offsets)[i * per_worker:(i + 1) * per_worker] for i in range(queue_depth)]
+    kinds = generate_op_kinds(ops, read_percent, None if seed is None else seed + 1)
+
+    fd, direct = open_target(file_path, operation, io_engine, dsync)
+    if io_engine == 'direct' and not direct:
+        drop_file_cache(file_path)
+    progress = [0] * queue_depth
+    interval_ns = int(1e9 / rate)
+    sampler = start_throughput_sampler(lambda: sum(progress), sample_interval) if sample_interval else None
+    try:
+        shared_fd = fd if SHARED_FD else None
+        start_time = time.perf_counter() + PACED_START_DELAY
+        start_ns = int(start_time * 1e9)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=queue_depth) as executor:
+            futures = [executor.submit(_paced_worker, shared_fd, file_path, operation, offsets[i],
+                                       memoryview(kinds)[i * per_worker:(i + 1) * per_worker], start_ns + i * interval_ns,
+                                       interval_ns * queue_depth, buffers[i], block_size, io_engine, dsync, progress, i,
+                                       pattern != 'zeros')
+                       for i in range(queue_depth)]
+            workers = [future.result() for future in futures]
+        if operation != 'read' and io_engine == 'direct' and not direct:
+            os.fsync(fd)
+        end_time = time.perf_counter()
+    finally:
+        os.close(fd)
+        timeline = stop_throughput_sampler(sampler) if sampler else None
+    check_stop()
+
+    read_histogram = merge_histograms(worker['read_histogram'] for worker in workers)
+    write_histogram = merge_histograms(worker['write_histogram'] for worker in workers)
+    read_bytes = sum(worker['read_bytes'] for worker in workers)
+    write_bytes = sum(worker['write_bytes'] for worker in workers)
+    return {
+        'bytes': read_bytes + write_bytes,
+        'read_bytes': read_bytes,
+        'write_bytes': write_bytes,
+        'seconds': end_time - start_time,
+        'started': start_time,
+        'histogram': merge_histograms([read_histogram, write_histogram]),
+        'read_histogram': read_histogram,
+        'write_histogram': write_histogram,
+        'service_histogram': merge_histograms(worker['service_histogram'] for worker in workers),
+        'target_iops': rate,
+        'ops': ops,
+        'late_ops': sum(worker['late_ops'] for worker in workers),
+        'direct': direct,
+        'queue_depth': queue_depth,
+        'block_size': block_size,
+        'timeline': timeline,
+        'workers': workers,
+    }
@@ -0,0 +1,26 @@
+import queue
+import threading
+
+# Set to stop the running tests early; the engine loops check it between blocks, chunks and files
+stop_event = threading.Event()
+_event_queue = None
+
+class TravelCancelled(Exception):
+    """Raised by an engine that stopped early because stop_event was set."""
+
+def open_event_queue():
+    """Start collecting progress events and return the queue to drain them from."""
+    global _event_queue
+    _event_queue = queue.SimpleQueue()
+    return _event_queue
+
+def publish(kind, **fields):
+    """Queue a (kind, fields) event for whoever drains the queue; never blocks, and does nothing without a queue."""
+    event_queue = _event_queue
+    if event_queue is not None:
+        event_queue.put((kind, fields))
+
+def check_stop():
+    """Raise TravelCancelled if a stop was requested."""
+    if stop_event.is_set():
+        raise TravelCancelled("Tests stopped by the user.")
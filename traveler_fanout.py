@@ -0,0 +1,163 @@
+import time
+import logging
+import threading
+import concurrent.futures
+from traveler_results import TravelResult, host_metadata
+from traveler_telemetry import read_cpu_times, cpu_utilization
+
+DEFAULT_CPU_INTERVAL = 0.5
+CPU_SATURATION = 90.0  # Percent busy at which the host, not the drives, is likely the limit
+MIN_OVERLAP_PERCENT = 80.0  # Below this share of the longest pass, the devices mostly did not run the pass together
+
+def start_cpu_sampler(interval=DEFAULT_CPU_INTERVAL):
+    """Start a thread that records CPU utilization every interval seconds."""
+    sampler = {'samples': [], 'stop': threading.Event(), 'thread': None}
+    if read_cpu_times() is None:
+        return sampler
+
+    def sample():
+        previous = read_cpu_times()
+        while not sampler['stop'].wait(interval):
+            current = read_cpu_times()
+            sampler['samples'].append(cpu_utilization(previous, current))
+            previous = current
+
+    sampler['thread'] = threading.Thread(target=sample, daemon=True)
+    sampler['thread'].start()
+    return sampler
+
+def stop_cpu_sampler(sampler):
+    """Stop a CPU sampler and return its samples."""
+    sampler['stop'].set()
+    if sampler['thread'] is not None:
+        sampler['thread'].join()
+    return sampler['samples']
+
+def cpu_summary(samples):
+    """Summarize CPU samples: mean and peak total utilization and the busiest single CPU."""
+    totals = [sample['cpu'] for sample in samples if 'cpu' in sample]
+    if not totals:
+        return None
+    busiest = max((percent, cpu) for sample in samples for cpu, percent in sample.items() if cpu != 'cpu')
+    return {
+        'mean_percent': sum(totals) / len(totals),
+        'peak_percent': max(totals),
+        'busiest_cpu': busiest[1],
+        'busiest_cpu_percent': busiest[0],
+        'saturated': max(totals) >= CPU_SATURATION or busiest[0] >= CPU_SATURATION,
+    }
+
+def format_cpu_summary(summary):
+    """Format a cpu_summary for a one-line report."""
+    if summary is None:
+        return "CPU utilization not available on this platform"
+    text = (f"CPU mean {summary['mean_percent']:.0f}%, peak {summary['peak_percent']:.0f}%, "
+            f"busiest {summary['busiest_cpu']} {summary['busiest_cpu_percent']:.0f}%")
+    if summary['saturated']:
+        text += " (host CPU saturated: aggregate results may be CPU-bound rather than drive-bound)"
+    return text
+
+def run_fanout(targets, job, cpu_interval=DEFAULT_CPU_INTERVAL):
+    """Run job(index, target) for every target at once, each in its own thread, and return the results per target."""
+    sampler = start_cpu_sampler(cpu_interval)
+    device_results = {}
+    start_time = time.perf_counter()
+    try:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(targets), thread_name_prefix='device') as executor:
+            futures = {target: executor.submit(job, index, target) for index, target in enumerate(targets)}
+            for target, future in futures.items():
+                try:
+                    device_results[target] = future.result()
+                except Exception as e:
+                    logging.error(f"Tests on {target} failed: {e}")
+                    device_results[target] = []
+    finally:
+        samples = stop_cpu_sampler(sampler)
+    return {
+        'results': device_results,
+        'seconds': time.perf_counter() - start_time,
+        'cpu': cpu_summary(samples),
+    }
+
+def _result_key(result):
+    """Identify the same measured pass across devices."""
+    return (result.test, result.direction, result.cycle, result.extra.get('read_percent'), result.extra.get('backend'))
+
+def _progress_at(samples, seconds):
+    """Bytes completed at seconds into a pass, interpolated between its (seconds, bytes) throughput samples."""
+    if seconds <= samples[0][0]:
+        return samples[0][1]
+    for (t0, b0), (t1, b1) in zip(samples, samples[1:]):
+        if seconds <= t1:
+            return b0 + (b1 - b0) * (seconds - t0) / (t1 - t0) if t1 > t0 else b1
+    return samples[-1][1]
+
+def _bytes_between(result, start, end):
+    """Bytes a pass moved between two perf_counter times: from its throughput samples when it has them, else at its
+    average rate."""
+    samples = result.span.get('samples')
+    if samples and len(samples) >= 2 and samples[-1][1] == result.bytes:
+        started = result.span['started']
+        return _progress_at(samples, end - started) - _progress_at(samples, start - started)
+    return result.bytes * (end - start) / result.seconds if result.seconds else 0
+
+def aggregate_results(device_results, cpu=None):
+    """Combine the concurrent per-device results of each pass into one aggregate result.
+
+    The devices go through their tests independently, so the same pass starts and ends at different times on each.
+    The aggregate only counts the window in which the pass ran on every device at once: the bytes each device moved in
+    that window over its length. Passes that did not overlap at all get no aggregate.
+    """
+    groups = {}
+    for results in device_results.values():
+        for result in results:
+            groups.setdefault(_result_key(result), []).append(result)
+
+    aggregates = []
+    for group in groups.values():
+        first = group[0]
+        spans = [result for result in group if result.span is not None]
+        if len(spans) != len(group):
+            continue
+        start = max(result.span['started'] for result in group)
+        end = min(result.span['started'] + result.seconds for result in group)
+        if end <= start:
+            logging.warning(f"The {first.test} {first.direction} passes of cycle {first.cycle} did not overlap across devices; no aggregate.")
+            continue
+        window = end - start
+        moved = [_bytes_between(result, start, end) for result in group]
+        # Operations in the window are in proportion to the bytes, since a pass uses one block size
+        operations = [result.iops * result.seconds * part / result.bytes for result, part in zip(group, moved)
+                      if result.iops is not None and result.bytes]
+        aggregates.append(TravelResult(
+            test=first.test,
+            direction=first.direction,
+            cycle=first.cycle,
+            bytes=int(sum(moved)),
+            seconds=window,
+            mb_per_s=sum(moved) / (1024 * 1024) / window,
+            iops=sum(operations) / window if operations else None,
+            engine=first.engine,
+            path=';'.join(result.path for result in group),
+            block_size=first.block_size,
+            queue_depth=first.queue_depth,
+            extra={'aggregate': True, 'devices': len(group), 'slowest_mb_per_s': min(result.mb_per_s for result in group),
+                   'overlap_seconds': window, 'overlap_percent': window / max(result.seconds for result in group) * 100,
+                   'read_percent': first.extra.get('read_percent'), 'backend': first.extra.get('backend'), 'cpu': cpu},
+            host=host_metadata(),
+        ))
+    return aggregates
+
+def scaling_report(solo_results, concurrent_results):
+    """Pair each concurrent result with the same pass run alone on the same device.
+
+    Returns (target, result, fraction of the solo rate kept when all devices run together).
+    """
+    scaling = []
+    for target, results in concurrent_results.items():
+        solo = {_result_key(result): result for result in solo_results.get(target, [])}
+        for result in results:
+            alone = solo.get(_result_key(result))
+            if alone is not None and alone.mb_per_s:
+                scaling.append((target, result, result.mb_per_s / alone.mb_per_s))
+    return scaling
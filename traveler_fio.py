@@ -0,0 +1,139 @@
+import os
+import sys
+import json
+import shutil
+import tempfile
+import subprocess
+from traveler_metrics import new_histogram, record_latencies, merge_histograms
+from traveler_engine import (DEFAULT_BLOCK_SIZE, DEFAULT_RANDOM_OPS, ZIPF_THETA, HOT_SET_FRACTION, HOT_SET_PROBABILITY, DATA_PATTERNS,
+                             SECTOR_SIZE)
+
+FIO_SUBMODULE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fio')
+SYNC_IOENGINES = ['sync', 'psync', 'vsync', 'pvsync', 'pvsync2']
+DEFAULT_FIO_IOENGINE = 'sync' if sys.platform == 'win32' else 'psync'
+
+def find_fio(fio_path=None):
+    """Locate the fio binary: an explicit path, fio on PATH, or a build of the fio submodule."""
+    candidates = [fio_path] if fio_path else [shutil.which('fio'), os.path.join(FIO_SUBMODULE, 'fio'),
+                                              os.path.join(FIO_SUBMODULE, 'fio.exe')]
+    for candidate in candidates:
+        if candidate and os.path.isfile(candidate) and os.access(candidate, os.X_OK):
+            return candidate
+    raise FileNotFoundError("fio not found. Install fio or build the fio submodule (git submodule update --init fio, then make in fio/).")
+
+def fio_version(fio_path):
+    """Return the version string reported by fio."""
+    return subprocess.run([fio_path, '--version'], capture_output=True, text=True).stdout.strip()
+
+def _fio_filename(file_path):
+    """Escape a path for a fio job file, where ':' separates file names."""
+    return os.path.abspath(file_path).replace(':', '\\:')
+
+def _random_distribution(distribution):
+    """Translate a Traveler access distribution to fio's random_distribution."""
+    if distribution == 'zipf':
+        return f'zipf:{ZIPF_THETA}'
+    if distribution == 'hotset':
+        hot = round(HOT_SET_PROBABILITY * 100)
+        size = round(HOT_SET_FRACTION * 100)
+        return f'zoned:{hot}/{size}:{100 - hot}/{100 - size}'
+    return 'random'
+
+def _buffer_options(pattern):
+    """Translate a Traveler data pattern to fio's write buffer options."""
+    if pattern == 'zeros':
+        # No scrambling either: the Python engines write zeros unstamped
+        return ['zero_buffers=1', 'scramble_buffers=0']
+    if pattern == 'compressible':
+        # Half of every sector compressible, as in fill_pattern_buffer
+        return ['buffer_compress_percentage=50', f'buffer_compress_chunk={SECTOR_SIZE}']
+    if pattern == 'random':
+        return []
+    raise ValueError(f"Invalid data pattern. Use one of: {', '.join(DATA_PATTERNS)}.")
+
+def build_job(file_path, total_size, test='sequential', read_percent=100, queue_depth=1, block_size=DEFAULT_BLOCK_SIZE,
+              io_engine='buffered', distribution='uniform', ops=DEFAULT_RANDOM_OPS, dsync=False, seed=None, processes=0,
+              ioengine=DEFAULT_FIO_IOENGINE, pattern='random'):
+    """Translate a Traveler sequential or random test into the text of a fio job file."""
+    if ioengine in SYNC_IOENGINES:
+        # One job per worker, each issuing one I/O at a time, like the Python engines
+        jobs, iodepth = queue_depth, 1
+    else:
+        jobs = max(1, processes)
+        iodepth = max(1, queue_depth // jobs)
+    blocks = total_size // block_size
+    lines = ['[global]',
+             f'filename={_fio_filename(file_path)}',
+             f'ioengine={ioengine}',
+             f'bs={block_size}',
+             f'iodepth={iodepth}',
+             f'numjobs={jobs}',
+             f'direct={int(io_engine == "direct")}',
+             'group_reporting=1',
+             'fallocate=none']
+    if not processes:
+        lines.append('thread=1')
+    if dsync:
+        lines.append('sync=dsync')
+    if seed is not None:
+        lines.append(f'randseed={seed}')
+    if read_percent < 100:
+        lines += _buffer_options(pattern)
+
+    if test == 'sequential':
+        # Every job owns a disjoint, block-aligned range of the file, as in split_ranges
+        job_size = max(1, blocks // jobs) * block_size
+        lines += [f'rw={"read" if read_percent >= 100 else "write"}', f'size={job_size}', f'offset_increment={job_size}']
+    else:
+        rw = 'randread' if read_percent >= 100 else 'randwrite' if read_percent <= 0 else 'randrw'
+        lines += [f'rw={rw}', f'size={blocks * block_size}', f'number_ios={max(1, ops // jobs)}',
+                  f'random_distribution={_random_distribution(distribution)}', 'norandommap=1']
+        if rw == 'randrw':
+            lines.append(f'rwmixread={read_percent}')
+    lines += ['', f'[traveler-{test}]', '']
+    return '\n'.join(lines)
+
+def _histogram_from_bins(clat):
+    """Rebuild a Traveler latency histogram from fio's json+ completion latency bins."""
+    histogram = new_histogram()
+    for ns, count in clat.get('bins', {}).items():
+        record_latencies(histogram, int(ns), count)
+    return histogram
+
+def parse_output(output):
+    """Map fio's JSON output to the stats dict returned by the Python engines."""
+    data = json.loads(output[output.index('{'):])  # fio may print warnings before the JSON
+    job = data['jobs'][0]
+    stats = {'fio_version': data.get('fio version')}
+    seconds = 0.0
+    for direction in ['read', 'write']:
+        section = job.get(direction, {})
+        stats[f'{direction}_bytes'] = section.get('io_bytes', 0)
+        stats[f'{direction}_histogram'] = _histogram_from_bins(section.get('clat_ns', {}))
+        seconds = max(seconds, section.get('runtime', 0) / 1000)
+    stats['bytes'] = stats['read_bytes'] + stats['write_bytes']
+    stats['seconds'] = seconds
+    stats['histogram'] = merge_histograms([stats['read_histogram'], stats['write_histogram']])
+    return stats
+
+def run_fio(file_path, total_size, test='sequential', read_percent=100, queue_depth=1, block_size=DEFAULT_BLOCK_SIZE,
+            io_engine='buffered', distribution='uniform', ops=DEFAULT_RANDOM_OPS, dsync=False, seed=None, processes=0,
+            ioengine=DEFAULT_FIO_IOENGINE, fio_path=None, pattern='random'):
+    """Run a Traveler test with fio and return its stats in the same shape as run_sequential/run_random."""
+    fio_path = find_fio(fio_path)
+    total_size = min(total_size, os.path.getsize(file_path))
+    job = build_job(file_path, total_size, test, read_percent, queue_depth, block_size, io_engine, distribution, ops,
+                    dsync, seed, processes, ioengine, pattern)
+    with tempfile.NamedTemporaryFile('w', suffix='.fio', delete=False) as f:
+        f.write(job)
+    try:
+        completed = subprocess.run([fio_path, '--output-format=json+', f.name], capture_output=True, text=True)
+    finally:
+        os.remove(f.name)
+    if completed.returncode != 0:
+        raise RuntimeError(f"fio failed: {completed.stderr.strip() or completed.stdout.strip()}")
+
+    stats = parse_output(completed.stdout)
+    stats.update({'direct': io_engine == 'direct', 'queue_depth': queue_depth, 'block_size': block_size,
+                  'ioengine': ioengine, 'timeline': None, 'workers': [], 'job': job})
+    return stats
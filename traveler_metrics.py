@@ -0,0 +1,226 @@
+import csv
+import time
+import threading
+from traveler_events import publish
+
+SUB_BUCKET_BITS = 3  # 8 sub-buckets per power of two, so a bucket is at most 12.5% wide
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+HISTOGRAM_BUCKETS = 64 * SUB_BUCKETS
+SUM_SLOT = HISTOGRAM_BUCKETS  # Total of all recorded latencies in ns
+MAX_SLOT = HISTOGRAM_BUCKETS + 1  # Largest recorded latency in ns
+HISTOGRAM_SIZE = HISTOGRAM_BUCKETS + 2
+PERCENTILES = [50, 99, 99.9]
+
+def new_histogram():
+    """Return an empty log-bucketed latency histogram (a flat list, cheap to merge and share)."""
+    return [0] * HISTOGRAM_SIZE
+
+def record_latency(histogram, ns):
+    """Add one latency sample in nanoseconds to a histogram."""
+    if ns < 2 * SUB_BUCKETS:
+        index = ns
+    else:
+        shift = ns.bit_length() - SUB_BUCKET_BITS - 1
+        index = (shift << SUB_BUCKET_BITS) + (ns >> shift)
+    histogram[index] += 1
+    histogram[SUM_SLOT] += ns
+    if ns > histogram[MAX_SLOT]:
+        histogram[MAX_SLOT] = ns
+
+def record_latencies(histogram, ns, count):
+    """Add count samples of the same latency, e.g. from another tool's histogram bins."""
+    if ns < 2 * SUB_BUCKETS:
+        index = ns
+    else:
+        shift = ns.bit_length() - SUB_BUCKET_BITS - 1
+        index = (shift << SUB_BUCKET_BITS) + (ns >> shift)
+    histogram[index] += count
+    histogram[SUM_SLOT] += ns * count
+    if count and ns > histogram[MAX_SLOT]:
+        histogram[MAX_SLOT] = ns
+
+def bucket_bounds(index):
+    """Return the (low, high) latency range in ns covered by a bucket."""
+    if index < 2 * SUB_BUCKETS:
+        return index, index
+    shift = (index >> SUB_BUCKET_BITS) - 1
+    top = (index & (SUB_BUCKETS - 1)) + SUB_BUCKETS
+    return top << shift, ((top + 1) << shift) - 1
+
+def merge_histograms(histograms):
+    """Merge per-worker histograms into a new one."""
+    merged = new_histogram()
+    for histogram in histograms:
+        if histogram is None:
+            continue
+        for index in range(HISTOGRAM_BUCKETS):
+            merged[index] += histogram[index]
+        merged[SUM_SLOT] += histogram[SUM_SLOT]
+        merged[MAX_SLOT] = max(merged[MAX_SLOT], histogram[MAX_SLOT])
+    return merged
+
+def histogram_count(histogram):
+    """Return the number of samples in a histogram."""
+    return sum(histogram[:HISTOGRAM_BUCKETS])
+
+def histogram_percentile(histogram, percentile):
+    """Return the latency in ns at the given percentile (bucket midpoint, capped at the max)."""
+    count = histogram_count(histogram)
+    if not count:
+        return 0
+    rank = max(1, -(-count * percentile // 100))
+    seen = 0
+    for index in range(HISTOGRAM_BUCKETS):
+        seen += histogram[index]
+        if seen >= rank:
+            low, high = bucket_bounds(index)
+            return min((low + high) // 2, histogram[MAX_SLOT])
+    return histogram[MAX_SLOT]
+
+def latency_summary(histogram):
+    """Summarize a histogram as op count, mean, p50/p99/p99.9 and max in microseconds."""
+    count = histogram_count(histogram)
+    summary = {'ops': count, 'mean_us': histogram[SUM_SLOT] / count / 1000 if count else 0.0}
+    for percentile in PERCENTILES:
+        summary[f'p{percentile:g}_us'] = histogram_percentile(histogram, percentile) / 1000
+    summary['max_us'] = histogram[MAX_SLOT] / 1000
+    return summary
+
+def format_latency(summary):
+    """Format a latency summary for the terminal and the log."""
+    return (f"p50 {summary['p50_us']:.1f}us, p99 {summary['p99_us']:.1f}us, "
+            f"p99.9 {summary['p99.9_us']:.1f}us, max {summary['max_us']:.1f}us")
+
+def throughput_summary(size_bytes, seconds, histogram=None):
+    """Return MB/s and, when a histogram is given, IOPS for a transfer."""
+    summary = {'mb_per_s': size_bytes / (1024 * 1024) / seconds if seconds else 0.0}
+    if histogram is not None:
+        summary['iops'] = histogram_count(histogram) / seconds if seconds else 0.0
+    return summary
+
+DEFAULT_SAMPLE_INTERVAL = 0.1  # seconds
+CLIFF_RATIO = 0.7  # A sustained drop below 70% of burst bandwidth marks the cache cliff
+STEADY_TOLERANCE = 0.2  # Steady state: samples within +/-20% of the window mean
+MIN_WINDOW = 5
+
+def start_throughput_sampler(read_progress, interval=DEFAULT_SAMPLE_INTERVAL):
+    """Sample read_progress() (bytes completed so far) every interval on a background thread."""
+    sampler = {'read_progress': read_progress, 'interval': interval, 'samples': [],
+               'stop': threading.Event(), 'start': time.perf_counter()}
+    sampler['thread'] = threading.Thread(target=_sample_loop, args=(sampler,), daemon=True)
+    sampler['thread'].start()
+    return sampler
+
+def _sample_loop(sampler):
+    """Append (seconds, bytes) samples until the sampler is stopped."""
+    samples, read_progress, start = sampler['samples'], sampler['read_progress'], sampler['start']
+    samples.append((0.0, 0))
+    publish('sample', seconds=0.0, bytes=0)
+    while not sampler['stop'].wait(sampler['interval']):
+        try:
+            samples.append((time.perf_counter() - start, read_progress()))
+            publish('sample', seconds=samples[-1][0], bytes=samples[-1][1])
+        except OSError:
+            pass
+
+def stop_throughput_sampler(sampler):
+    """Stop a sampler, take a final sample and return the (seconds, bytes) time series."""
+    sampler['stop'].set()
+    sampler['thread'].join()
+    try:
+        sampler['samples'].append((time.perf_counter() - sampler['start'], sampler['read_progress']()))
+    except OSError:
+        pass
+    return sampler['samples']
+
+def timeline_rates(samples):
+    """Convert cumulative (seconds, bytes) samples into per-interval (seconds, bytes, MB/s) rows."""
+    rows = []
+    for (t0, b0), (t1, b1) in zip(samples, samples[1:]):
+        if t1 > t0:
+            rows.append((t1, b1, (b1 - b0) / (1024 * 1024) / (t1 - t0)))
+    return rows
+
+def _median(values):
+    """Return the median of a non-empty list."""
+    ordered = sorted(values)
+    middle = len(ordered) // 2
+    return ordered[middle] if len(ordered) % 2 else (ordered[middle - 1] + ordered[middle]) / 2
+
+def analyze_timeline(samples):
+    """Detect the write-cache cliff and the steady-state window in a throughput time series."""
+    rows = timeline_rates(samples)
+    rates = [rate for _, _, rate in rows]
+    analysis = {'burst_mb_per_s': None, 'sustained_mb_per_s': None, 'cache_bytes': None,
+                'cliff_seconds': None, 'steady_start': None, 'steady_end': None}
+    if len(rates) < 2 * MIN_WINDOW:
+        if rates:
+            analysis['burst_mb_per_s'] = analysis['sustained_mb_per_s'] = sum(rates) / len(rates)
+        return analysis
+
+    burst = _median(rates[:max(MIN_WINDOW, len(rates) // 10)])
+    analysis['burst_mb_per_s'] = burst
+
+    # The cliff is the first point after which the rolling median stays below CLIFF_RATIO of burst
+    suffix_sums = [0.0] * (len(rates) + 1)
+    for i in range(len(rates) - 1, -1, -1):
+        suffix_sums[i] = suffix_sums[i + 1] + rates[i]
+    for i in range(len(rates) - MIN_WINDOW + 1):
+        if _median(rates[i:i + MIN_WINDOW]) < CLIFF_RATIO * burst and \
+                suffix_sums[i] / (len(rates) - i) < CLIFF_RATIO * burst:
+            # A window can straddle the drop; the cliff is its first slow sample
+            i = next(j for j in range(i, i + MIN_WINDOW) if rates[j] < CLIFF_RATIO * burst)
+            analysis['cliff_seconds'] = rows[i - 1][0] if i else 0.0
+            analysis['cache_bytes'] = rows[i - 1][1] if i else 0
+            break
+
+    # Grow the steady-state window backwards from the end while samples stay within tolerance
+    start = len(rates) - MIN_WINDOW
+    window = rates[start:]
+    mean = sum(window) / len(window)
+    if all(abs(rate - mean) <= STEADY_TOLERANCE * mean for rate in window):
+        while start > 0:
+            candidate = rates[start - 1]
+            if abs(candidate - mean) > STEADY_TOLERANCE * mean:
+                break
+            start -= 1
+            mean = sum(rates[start:]) / len(rates[start:])
+        analysis['steady_start'] = rows[start - 1][0] if start else 0.0
+        analysis['steady_end'] = rows[-1][0]
+        analysis['sustained_mb_per_s'] = mean
+    else:
+        # No steady window; fall back to the mean after the cliff (or over the whole run)
+        tail = rates[len(rates) // 2:] if analysis['cliff_seconds'] is None else \
+            [rate for t, _, rate in rows if t > analysis['cliff_seconds']]
+        tail = tail or rates
+        analysis['sustained_mb_per_s'] = sum(tail) / len(tail)
+    return analysis
+
+def format_timeline_analysis(analysis):
+    """Format a timeline analysis for the terminal and the log."""
+    if analysis['burst_mb_per_s'] is None:
+        return "Not enough throughput samples for burst/sustained analysis."
+    message = f"Burst {analysis['burst_mb_per_s']:.2f} MB/s, sustained {analysis['sustained_mb_per_s']:.2f} MB/s"
+    if analysis['cache_bytes'] is not None:
+        message += f", cache cliff after {analysis['cache_bytes'] / (1024 ** 3):.2f}GB at {analysis['cliff_seconds']:.1f}s"
+    else:
+        message += ", no cache cliff detected"
+    if analysis['steady_start'] is not None:
+        message += f", steady state {analysis['steady_start']:.1f}s-{analysis['steady_end']:.1f}s"
+    return message + "."
+
+def write_timeline_csv(path, samples, telemetry=None):
+    """Export a throughput time series as CSV (seconds, cumulative bytes, MB/s).
+
+    telemetry, one dict per row as returned by timeline_telemetry, adds the device and CPU readings of each row.
+    """
+    rows = timeline_rates(samples)
+    telemetry = telemetry or [{}] * len(rows)
+    columns = []
+    for readings in telemetry:
+        columns.extend(column for column in readings if column not in columns)
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['seconds', 'bytes', 'mb_per_s'] + columns)
+        for (seconds, size_bytes, rate), readings in zip(rows, telemetry):
+            writer.writerow([f"{seconds:.3f}", size_bytes, f"{rate:.2f}"] + [readings.get(column, '') for column in columns])
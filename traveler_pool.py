@@ -0,0 +1,202 @@
+import os
+import time
+import logging
+import multiprocessing
+import concurrent.futures
+from array import array
+from multiprocessing import shared_memory
+from traveler_metrics import (SUM_SLOT, HISTOGRAM_SIZE, merge_histograms, start_throughput_sampler,
+                              stop_throughput_sampler)
+from traveler_engine import (DEFAULT_BLOCK_SIZE, DEFAULT_RANDOM_BLOCK_SIZE, DEFAULT_RANDOM_OPS, SHARED_FD,
+                             open_target, drop_file_cache, evict_unless_direct, split_ranges, allocate_worker_buffers, fill_pattern_buffer,
+                             generate_offsets, generate_op_kinds, _sequential_worker, _random_worker)
+
+# Per-process record in shared memory, followed by the read and the write histogram
+START_NS, END_NS, READ_BYTES, WRITE_BYTES, WORKER_NS, DIRECT = range(6)
+RECORD_HEADER = 6
+RECORD_SIZE = RECORD_HEADER + 2 * HISTOGRAM_SIZE
+
+def available_cpus():
+    """Return the CPUs this process may run on, in order."""
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+def _pin_to_cpu(cpu):
+    """Pin the calling process to one CPU where the platform allows it."""
+    if hasattr(os, 'sched_setaffinity'):
+        os.sched_setaffinity(0, {cpu})
+        return True
+    return False
+
+def _process_entry(kind, shm_name, progress_slots, slot, threads, first_index, cpu, barrier, file_path, operation, work,
+                   block_size, io_engine, dsync, pattern):
+    """Body of one pool process: set up, wait for the common start, run the thread workers, publish results."""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        # The block starts with one progress counter per pool thread, followed by one record per process
+        words = shm.buf.cast('Q')
+        progress = words[:progress_slots]
+        record = words[progress_slots + slot * RECORD_SIZE:progress_slots + (slot + 1) * RECORD_SIZE]
+        if cpu is not None and not _pin_to_cpu(cpu):
+            logging.warning("CPU pinning is not supported on this platform.")
+
+        buffers = allocate_worker_buffers(threads, block_size)
+        if pattern:
+            for i, buffer in enumerate(buffers):
+                fill_pattern_buffer(buffer, pattern, first_index + i)
+        stamp = operation != 'read' and pattern not in (None, 'zeros')
+        fd, direct = open_target(file_path, operation, io_engine, dsync)
+        shared_fd = fd if SHARED_FD else None
+        try:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=threads) as executor:
+                barrier.wait()
+                record[START_NS] = time.perf_counter_ns()
+                if kind == 'sequential':
+                    futures = [executor.submit(_sequential_worker, shared_fd, file_path, operation, start, end, buffers[i],
+                                               block_size, io_engine, dsync, progress, first_index + i, stamp=stamp)
+                               for i, (start, end) in enumerate(work)]
+                else:
+                    futures = [executor.submit(_random_worker, shared_fd, file_path, operation, array('Q', offsets),
+                                               kinds, buffers[i], block_size, io_engine, dsync, progress, first_index + i, stamp)
+                               for i, (offsets, kinds) in enumerate(work)]
+                workers = [future.result() for future in futures]
+            if operation != 'read' and io_engine == 'direct' and not direct:
+                os.fsync(fd)
+            record[END_NS] = time.perf_counter_ns()
+        finally:
+            os.close(fd)
+
+        if kind == 'sequential':
+            histograms = [worker['histogram'] for worker in workers]
+            read_hist = merge_histograms(histograms if operation == 'read' else [])
+            write_hist = merge_histograms(histograms if operation == 'write' else [])
+            record[READ_BYTES if operation == 'read' else WRITE_BYTES] = sum(worker['bytes'] for worker in workers)
+        else:
+            read_hist = merge_histograms(worker['read_histogram'] for worker in workers)
+            write_hist = merge_histograms(worker['write_histogram'] for worker in workers)
+            record[READ_BYTES] = sum(worker['read_bytes'] for worker in workers)
+            record[WRITE_BYTES] = sum(worker['write_bytes'] for worker in workers)
+        record[WORKER_NS] = int(sum(worker['seconds'] for worker in workers) * 1e9)
+        record[DIRECT] = int(direct)
+        record[RECORD_HEADER:RECORD_HEADER + HISTOGRAM_SIZE] = array('Q', read_hist)
+        record[RECORD_HEADER + HISTOGRAM_SIZE:] = array('Q', write_hist)
+        del progress, record, words
+    finally:
+        shm.close()
+
+def _threads_per_process(queue_depth, processes):
+    """Return the threads each pool process runs, refusing a queue depth the processes cannot share evenly."""
+    if processes < 1:
+        raise ValueError("Process count must be at least 1.")
+    if queue_depth < processes or queue_depth % processes:
+        raise ValueError(f"Queue depth {queue_depth} must be a multiple of the process count {processes}, so every process runs "
+                         f"the same number of threads.")
+    return queue_depth // processes
+
+def _run_pool(kind, file_path, operation, processes, threads, work, block_size, io_engine, dsync, pin_cpus,
+              sample_interval, pattern=None):
+    """Start one process per work list, release them together and aggregate their shared-memory records."""
+    total_threads = processes * threads
+    shm = shared_memory.SharedMemory(create=True, size=(total_threads + processes * RECORD_SIZE) * 8)
+    context = multiprocessing.get_context('spawn')  # Safe with threads and identical on Windows
+    barrier = context.Barrier(processes + 1)
+    cpus = available_cpus()
+    try:
+        words = shm.buf.cast('Q')
+        words[:] = array('Q', bytes(len(words) * 8))
+        progress = words[:total_threads]
+        children = []
+        for slot in range(processes):
+            cpu = cpus[slot % len(cpus)] if pin_cpus else None
+            child = context.Process(target=_process_entry, args=(
+                kind, shm.name, total_threads, slot, threads, slot * threads, cpu, barrier, file_path, operation,
+                work[slot * threads:(slot + 1) * threads], block_size, io_engine, dsync, pattern), daemon=True)
+            child.start()
+            children.append(child)
+
+        try:
+            barrier.wait(timeout=120)
+        except Exception:
+            for child in children:
+                child.terminate()
+            raise RuntimeError("Pool processes failed to start.")
+        started = time.perf_counter()
+        sampler = start_throughput_sampler(lambda progress=progress: sum(progress), sample_interval) if sample_interval else None
+        try:
+            for child in children:
+                child.join()
+        finally:
+            timeline = stop_throughput_sampler(sampler) if sampler else None
+        failed = [child.exitcode for child in children if child.exitcode != 0]
+        if failed:
+            raise RuntimeError(f"{len(failed)} pool process(es) failed (exit codes {failed}).")
+
+        records = [words[total_threads + slot * RECORD_SIZE:total_threads + (slot + 1) * RECORD_SIZE].tolist()
+                   for slot in range(processes)]
+        # The sampler's lambda holds a view of the block too; every view must go before it can be closed
+        del progress, words, sampler
+    finally:
+        shm.close()
+        shm.unlink()
+
+    read_histogram = merge_histograms(record[RECORD_HEADER:RECORD_HEADER + HISTOGRAM_SIZE] for record in records)
+    write_histogram = merge_histograms(record[RECORD_HEADER + HISTOGRAM_SIZE:] for record in records)
+    worker_seconds = sum(record[WORKER_NS] for record in records) / 1e9
+    io_seconds = (read_histogram[SUM_SLOT] + write_histogram[SUM_SLOT]) / 1e9
+    read_bytes = sum(record[READ_BYTES] for record in records)
+    write_bytes = sum(record[WRITE_BYTES] for record in records)
+    seconds = (max(record[END_NS] for record in records) - min(record[START_NS] for record in records)) / 1e9
+    return {
+        'bytes': read_bytes + write_bytes,
+        'read_bytes': read_bytes,
+        'write_bytes': write_bytes,
+        'seconds': seconds,
+        'started': started,
+        'histogram': merge_histograms([read_histogram, write_histogram]),
+        'read_histogram': read_histogram,
+        'write_histogram': write_histogram,
+        'direct': all(record[DIRECT] for record in records),
+        'processes': processes,
+        'queue_depth': total_threads,
+        'block_size': block_size,
+        'python_overhead': 1.0 - io_seconds / worker_seconds if worker_seconds else 0.0,
+        'timeline': timeline,
+        'workers': [{'bytes': record[READ_BYTES] + record[WRITE_BYTES],
+                     'seconds': (record[END_NS] - record[START_NS]) / 1e9} for record in records],
+    }
+
+def run_sequential_processes(file_path, total_size, operation, processes, queue_depth=1, block_size=DEFAULT_BLOCK_SIZE,
+                             io_engine='buffered', dsync=False, pin_cpus=False, sample_interval=None, pattern=None):
+    """Run the sequential engine across processes, each with its own fd and queue_depth/processes threads."""
+    threads = _threads_per_process(queue_depth, processes)
+    if operation == 'read':
+        total_size = min(total_size, os.path.getsize(file_path))
+        if io_engine == 'direct':
+            evict_unless_direct(file_path)
+    work = split_ranges(total_size, processes * threads, block_size)
+    stats = _run_pool('sequential', file_path, operation, processes, threads, work, block_size, io_engine, dsync,
+                      pin_cpus, sample_interval, pattern)
+    for slot, worker in enumerate(stats['workers']):
+        worker['offset'] = work[slot * threads][0]
+    if operation == 'write' and io_engine == 'direct' and not stats['direct']:
+        drop_file_cache(file_path)
+    return stats
+
+def run_random_processes(file_path, total_size, processes, queue_depth=1, block_size=DEFAULT_RANDOM_BLOCK_SIZE,
+                         io_engine='buffered', read_percent=100, distribution='uniform', ops=DEFAULT_RANDOM_OPS,
+                         seed=None, dsync=False, pin_cpus=False, sample_interval=None, pattern='random'):
+    """Run the random engine across processes, each with its own fd and queue_depth/processes threads.
+
+    As in run_random, written blocks carry the data pattern and are stamped with their offset unless it is zeros.
+    """
+    threads = _threads_per_process(queue_depth, processes)
+    total_size = min(total_size, os.path.getsize(file_path))
+    operation = 'read' if read_percent >= 100 else 'write' if read_percent <= 0 else 'readwrite'
+    offsets = generate_offsets(total_size, block_size, ops, distribution, seed)
+    kinds = generate_op_kinds(ops, read_percent, None if seed is None else seed + 1)
+    work = [(offsets[start:end].tobytes(), kinds[start:end]) for start, end in split_ranges(ops, processes * threads, 1)]
+    if io_engine == 'direct':
+        evict_unless_direct(file_path)
+    return _run_pool('random', file_path, operation, processes, threads, work, block_size, io_engine, dsync,
+                     pin_cpus, sample_interval, pattern)
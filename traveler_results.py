@@ -0,0 +1,155 @@
+import os
+import csv
+import sys
+import json
+import time
+import socket
+import platform
+import datetime
+from dataclasses import dataclass, field, asdict
+from typing import Optional
+from traveler_events import publish
+from traveler_metrics import latency_summary, throughput_summary, analyze_timeline
+from traveler_telemetry import cpu_environment, mount_info, block_device, device_identity, telemetry_window
+
+@dataclass
+class TravelResult:
+    """One measured pass of a test: a single direction of a single cycle."""
+    test: str
+    direction: str
+    cycle: int
+    bytes: int
+    seconds: float
+    mb_per_s: float
+    engine: str
+    path: str
+    iops: Optional[float] = None
+    block_size: Optional[int] = None
+    queue_depth: Optional[int] = None
+    latency: Optional[dict] = None
+    timeline: Optional[dict] = None
+    telemetry: Optional[dict] = None
+    extra: dict = field(default_factory=dict)
+    host: dict = field(default_factory=dict)
+    device: dict = field(default_factory=dict)
+    timestamp: str = field(default_factory=lambda: datetime.datetime.now().astimezone().isoformat(timespec='seconds'))
+    # Start (perf_counter) and raw (seconds, bytes) throughput samples of the pass; kept in memory only, for fan-out
+    span: Optional[dict] = field(default=None, repr=False)
+
+_HOST_METADATA = None
+
+def host_metadata():
+    """Return (and cache) a description of the machine running the test."""
+    global _HOST_METADATA
+    if _HOST_METADATA is None:
+        _HOST_METADATA = {
+            'hostname': socket.gethostname(),
+            'platform': platform.platform(),
+            'processor': platform.processor() or platform.machine(),
+            'cpu_count': os.cpu_count(),
+            'python': sys.version.split()[0],
+            **cpu_environment(),
+        }
+    return _HOST_METADATA
+
+def device_metadata(path):
+    """Describe the filesystem and block device that hold path, as far as the platform tells us."""
+    metadata = {'path': os.path.abspath(path)}
+    try:
+        usage = os.statvfs(path) if hasattr(os, 'statvfs') else None
+        if usage is not None:
+            metadata['total_bytes'] = usage.f_blocks * usage.f_frsize
+            metadata['free_bytes'] = usage.f_bavail * usage.f_frsize
+    except OSError:
+        pass
+
+    metadata.update(mount_info(path))
+    device = block_device(path)
+    if device is not None:
+        metadata['block_device'] = device['name']
+        metadata.update(device_identity(device))
+    return metadata
+
+def make_result(test, direction, cycle, stats, engine, path, block_size=None, queue_depth=None, **extra):
+    """Build a TravelResult from the stats dict returned by an engine."""
+    histogram = stats.get('histogram')
+    throughput = throughput_summary(stats['bytes'], stats['seconds'], histogram)
+    if 'files' in stats:
+        extra.setdefault('files', stats['files'])
+        extra.setdefault('files_per_s', stats['files'] / stats['seconds'] if stats['seconds'] else 0.0)
+    timeline = stats.get('timeline')
+    latency = latency_summary(histogram) if histogram is not None else None
+    # Engines without a start time (fio) are assumed to have just finished
+    started = stats.get('started') or time.perf_counter() - stats['seconds']
+    publish('result', test=test, direction=direction, cycle=cycle, mb_per_s=throughput['mb_per_s'], p99_us=latency['p99_us'] if latency else None)
+    return TravelResult(
+        test=test,
+        direction=direction,
+        cycle=cycle,
+        bytes=stats['bytes'],
+        seconds=stats['seconds'],
+        mb_per_s=throughput['mb_per_s'],
+        iops=throughput.get('iops'),
+        engine=engine,
+        path=path,
+        block_size=block_size,
+        queue_depth=queue_depth,
+        latency=latency,
+        timeline=analyze_timeline(timeline) if timeline else None,
+        telemetry=telemetry_window(os.path.dirname(path) or '.', started, stats['seconds']),
+        extra=extra,
+        host=host_metadata(),
+        device=device_metadata(os.path.dirname(path) or '.'),
+        span={'started': started, 'samples': timeline},
+    )
+
+def result_record(result):
+    """Return a result as a plain dict for writing out, without its in-memory span."""
+    record = asdict(result)
+    del record['span']
+    return record
+
+def flatten_result(result):
+    """Flatten a TravelResult into a single-level dict for CSV (nested keys joined with '_')."""
+    row = {}
+    for key, value in result_record(result).items():
+        if isinstance(value, dict):
+            for sub_key, sub_value in value.items():
+                row[f"{key}_{sub_key}"] = sub_value
+        else:
+            row[key] = value
+    return row
+
+def write_results(results_path, results):
+    """Append results to a JSON Lines file, or to a CSV file when the path ends in .csv."""
+    if not results:
+        return
+    if results_path.lower().endswith('.csv'):
+        rows = []
+        columns = []
+        if os.path.exists(results_path) and os.path.getsize(results_path):
+            # Rewrite with the union of columns so appended runs stay aligned
+            with open(results_path, newline='') as f:
+                reader = csv.DictReader(f)
+                columns = list(reader.fieldnames or [])
+                rows = list(reader)
+        rows += [flatten_result(result) for result in results]
+        for row in rows:
+            columns.extend(column for column in row if column not in columns)
+        with open(results_path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=columns)
+            writer.writeheader()
+            writer.writerows(rows)
+    else:
+        with open(results_path, 'a') as f:
+            for result in results:
+                f.write(json.dumps(result_record(result)) + '\n')
+
+def read_results(results_path):
+    """Load TravelResults back from a JSON Lines file."""
+    results = []
+    with open(results_path) as f:
+        for line in f:
+            if line.strip():
+                results.append(TravelResult(**json.loads(line)))
+    return results
@@ -0,0 +1,130 @@
+import os
+import json
+import datetime
+from traveler_results import TravelResult, result_record
+
+STATE_VERSION = 1
+DEFAULT_STATE_FILE = 'traveler_soak_state.json'
+DRIFT_WARNING = 10.0  # Percent change between the first and last cycles worth flagging
+_DURATION_UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+def parse_duration(text):
+    """Parse a duration such as 90, 90s, 30m, 8h or 2d into seconds."""
+    text = text.strip().lower()
+    if text and text[-1] in _DURATION_UNITS:
+        seconds = float(text[:-1]) * _DURATION_UNITS[text[-1]]
+    else:
+        seconds = float(text)
+    if seconds <= 0:
+        raise ValueError("Duration must be positive.")
+    return seconds
+
+def file_fingerprint(path):
+    """Describe a test file (or test tree root) well enough to tell whether it was replaced outside the soak.
+
+    The modification time is left out on purpose: the sequential write test rewrites the file in place, and an
+    interrupted rewrite still leaves a valid, fully allocated test file.
+    """
+    if not os.path.exists(path):
+        return None
+    stat = os.stat(path)
+    return {'path': os.path.abspath(path), 'size': stat.st_size if os.path.isfile(path) else None, 'inode': stat.st_ino}
+
+def new_state(config, data_paths):
+    """Return a fresh soak state for the given run configuration and prepared test data."""
+    return {
+        'version': STATE_VERSION,
+        'config': config,
+        'started': datetime.datetime.now().astimezone().isoformat(timespec='seconds'),
+        'data': [file_fingerprint(path) for path in data_paths],
+        'cycles_completed': 0,
+        'elapsed_seconds': 0.0,
+        'completed': False,
+        'results': [],
+    }
+
+def load_state(state_path):
+    """Load a soak state file, or return None if there is none."""
+    if not os.path.exists(state_path):
+        return None
+    with open(state_path) as f:
+        state = json.load(f)
+    if state.get('version') != STATE_VERSION:
+        raise ValueError(f"Unsupported soak state version in {state_path}.")
+    return state
+
+def save_state(state_path, state):
+    """Write the soak state atomically, so a crash mid-write leaves the previous checkpoint intact."""
+    temporary_path = state_path + '.tmp'
+    with open(temporary_path, 'w') as f:
+        json.dump(state, f, indent=1)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary_path, state_path)
+
+def data_matches(state, data_paths):
+    """Return True if the test data on disk is the data recorded at the last checkpoint."""
+    return [file_fingerprint(path) for path in data_paths] == state['data']
+
+def update_data(state, data_paths):
+    """Record the fingerprint of the test data as it is now."""
+    state['data'] = [file_fingerprint(path) for path in data_paths]
+
+def record_cycle(state, results, seconds, data_paths):
+    """Add a completed cycle, its results and the current test data fingerprint to the state."""
+    state['cycles_completed'] += 1
+    state['elapsed_seconds'] += seconds
+    state['results'] += [result_record(result) for result in results]
+    update_data(state, data_paths)
+
+def budget_exhausted(state, max_cycles=None, max_seconds=None):
+    """Return True once the cycle or time budget of the soak is used up."""
+    if max_cycles is not None and state['cycles_completed'] >= max_cycles:
+        return True
+    return max_seconds is not None and state['elapsed_seconds'] >= max_seconds
+
+def state_results(state):
+    """Return the TravelResults recorded in a soak state."""
+    return [TravelResult(**result) for result in state['results']]
+
+def drift_summary(results):
+    """Summarize throughput drift across cycles for each test, direction, engine and backend.
+
+    Python and fio passes of a cross-checked soak form separate series. Returns {(test, direction, engine, backend): {...}} with the first, last, min and max MB/s, the change from the first to the last
+    cycle and the least-squares slope per cycle, both in percent of the mean.
+    """
+    series = {}
+    for result in results:
+        if result.extra.get('aggregate'):
+            continue
+        key = (result.test, result.direction, result.engine, result.extra.get('backend'))
+        series.setdefault(key, []).append((result.cycle, result.mb_per_s))
+
+    summary = {}
+    for key, points in series.items():
+        points.sort()
+        rates = [rate for _, rate in points]
+        mean = sum(rates) / len(rates)
+        cycles = [cycle for cycle, _ in points]
+        mean_cycle = sum(cycles) / len(cycles)
+        spread = sum((cycle - mean_cycle) ** 2 for cycle in cycles)
+        slope = sum((cycle - mean_cycle) * (rate - mean) for cycle, rate in points) / spread if spread else 0.0
+        summary[key] = {
+            'cycles': len(points),
+            'first_mb_per_s': rates[0],
+            'last_mb_per_s': rates[-1],
+            'min_mb_per_s': min(rates),
+            'max_mb_per_s': max(rates),
+            'change_percent': (rates[-1] - rates[0]) / rates[0] * 100 if rates[0] else 0.0,
+            'slope_percent_per_cycle': slope / mean * 100 if mean else 0.0,
+        }
+    return summary
+
+def format_drift(drift):
+    """Format one drift_summary entry for a one-line report."""
+    text = (f"{drift['first_mb_per_s']:.2f} -> {drift['last_mb_per_s']:.2f} MB/s over {drift['cycles']} cycles "
+            f"({drift['change_percent']:+.1f}%, trend {drift['slope_percent_per_cycle']:+.2f}%/cycle, "
+            f"range {drift['min_mb_per_s']:.2f}-{drift['max_mb_per_s']:.2f} MB/s)")
+    if abs(drift['change_percent']) >= DRIFT_WARNING:
+        text += " - drifting"
+    return text
@@ -0,0 +1,200 @@
+import os
+import csv
+import json
+import time
+import random
+import itertools
+from traveler_engine import SHARED_FD, DEFAULT_BLOCK_SIZE, allocate_aligned_buffer, open_target, open_worker_handle, pread_into
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+# Options that change the test data, so points sharing them can share one prepared test file or tree
+PREP_OPTIONS = ['file_size', 'data_pattern', 'workload', 'tree_files', 'tree_file_size', 'tree_size_distribution', 'tree_depth',
+                'tree_fanout', 'cache']
+# Options that do not make sense per point: they name the device or the run as a whole
+RUN_OPTIONS = {'spec', 'primary_ssd_path', 'targets', 'solo_baseline', 'soak', 'duration', 'resume', 'state_file', 'results',
+               'log_file', 'heatmap', 'dry_run', 'telemetry_interval', 'calibration'}
+SPEC_KEYS = {'matrix', 'base', 'repeat', 'randomize', 'seed', 'warmup', 'cooldown'}
+
+def load_spec(spec_path):
+    """Load a sweep spec from JSON, or from YAML when PyYAML is installed."""
+    with open(spec_path) as f:
+        if spec_path.lower().endswith(('.yaml', '.yml')):
+            if yaml is None:
+                raise ValueError("YAML sweep specs need PyYAML (pip install pyyaml); use a JSON spec instead.")
+            spec = yaml.safe_load(f)
+        else:
+            spec = json.load(f)
+    if not isinstance(spec, dict) or not isinstance(spec.get('matrix'), dict) or not spec['matrix']:
+        raise ValueError(f"Sweep spec {spec_path} needs a non-empty 'matrix' of option: [values].")
+    unknown = set(spec) - SPEC_KEYS
+    if unknown:
+        raise ValueError(f"Unknown keys in sweep spec {spec_path}: {', '.join(sorted(unknown))}")
+    return spec
+
+def option_values(parser, options):
+    """Convert {option: value} from a spec to argparse destinations, applying the option's type and choices.
+
+    Options may be written as on the command line (block-size, --block-size) or as destinations (block_size).
+    """
+    actions = {action.dest: action for action in parser._actions}
+    values = {}
+    for name, value in options.items():
+        dest = name.lstrip('-').replace('-', '_')
+        if dest not in actions or dest == 'help':
+            raise ValueError(f"Unknown option in sweep spec: {name}")
+        if dest in RUN_OPTIONS:
+            raise ValueError(f"Option {name} applies to the whole sweep and cannot be set in a sweep spec.")
+        action = actions[dest]
+        if action.type is not None and isinstance(value, str):
+            value = action.type(value)
+        if action.choices is not None and value not in action.choices:
+            raise ValueError(f"Invalid value for {name} in sweep spec: {value} (choose from {', '.join(map(str, action.choices))})")
+        values[dest] = value
+    return values
+
+def expand_matrix(matrix):
+    """Return every combination of the matrix as a list of {option: value} dicts, in spec order."""
+    axes = list(matrix)
+    levels = [values if isinstance(values, list) else [values] for values in matrix.values()]
+    return [dict(zip(axes, combination)) for combination in itertools.product(*levels)]
+
+def prep_key(options):
+    """The part of a point's options that determines its test data."""
+    return tuple(options.get(name) for name in PREP_OPTIONS)
+
+def schedule_points(points, base, repeat=1, randomize=False, seed=None):
+    """Order sweep points so points sharing test data run back to back.
+
+    Each point is repeated repeat times. With randomize, the order of the data groups and of the points within each
+    group is shuffled, so slow drift (heat, SLC cache state) does not line up with one axis of the matrix.
+    Returns a list of (point index, point) pairs, the index being the point's position in the expanded matrix.
+    """
+    groups = {}
+    for index, point in enumerate(points):
+        groups.setdefault(prep_key({**base, **point}), []).extend([(index, point)] * repeat)
+    ordered = list(groups.values())
+    if randomize:
+        shuffle = random.Random(seed)
+        shuffle.shuffle(ordered)
+        for group in ordered:
+            shuffle.shuffle(group)
+    return [entry for group in ordered for entry in group]
+
+def warm_up(file_path, seconds, block_size=DEFAULT_BLOCK_SIZE):
+    """Read file_path sequentially with direct I/O for seconds, wrapping around, and return the bytes read.
+
+    Brings the drive out of its idle power state before a measured point; the reads are not recorded.
+    """
+    size = os.path.getsize(file_path)
+    if not size or seconds <= 0:
+        return 0
+    handle = None
+    if SHARED_FD:
+        fd, _ = open_target(file_path, 'read', 'direct')
+    else:
+        handle = fd = open_worker_handle(file_path, 'read', 'direct')
+    view = memoryview(allocate_aligned_buffer(block_size))
+    transferred = 0
+    offset = 0
+    deadline = time.perf_counter() + seconds
+    try:
+        while time.perf_counter() < deadline:
+            n = pread_into(fd, view, offset)
+            offset = offset + n if n and offset + n < size else 0
+            transferred += n or 0
+    finally:
+        if handle is not None:
+            handle.close()
+        else:
+            os.close(fd)
+    return transferred
+
+def point_label(point):
+    """Format a point's matrix values for the terminal and the log."""
+    return ', '.join(f"{name}={value}" for name, value in point.items())
+
+def summarize_sweep(records, axes):
+    """Collapse (point index, point, TravelResult) records into one row per point, test, direction, engine and backend.
+
+    Repeats of a point are averaged; rows come back in matrix order. Python and fio passes of a cross-check stay separate rows.
+    """
+    grouped = {}
+    for index, point, result in records:
+        if result.extra.get('aggregate'):
+            continue
+        key = (index, result.test, result.direction, result.engine, result.extra.get('backend'))
+        grouped.setdefault(key, (point, []))[1].append(result)
+
+    rows = []
+    for (index, test, direction, engine, backend), (point, results) in sorted(grouped.items(), key=lambda item: tuple('' if value is None else value for value in item[0])):
+        row = {axis: point[axis] for axis in axes}
+        row.update({'test': test, 'direction': direction, 'engine': engine, 'backend': backend, 'runs': len(results),
+                    'mb_per_s': sum(result.mb_per_s for result in results) / len(results)})
+        iops = [result.iops for result in results if result.iops is not None]
+        row['iops'] = sum(iops) / len(iops) if iops else None
+        p99 = [result.latency['p99_us'] for result in results if result.latency]
+        row['p99_us'] = sum(p99) / len(p99) if p99 else None
+        if len(results) > 1:
+            mean = row['mb_per_s']
+            row['spread_percent'] = (max(r.mb_per_s for r in results) - min(r.mb_per_s for r in results)) / mean * 100 if mean else 0.0
+        rows.append(row)
+    return rows
+
+def format_table(rows):
+    """Format summary rows as an aligned text table."""
+    if not rows:
+        return ''
+    columns = []
+    for row in rows:
+        columns.extend(column for column in row if column not in columns)
+    cells = [[_format_cell(row.get(column)) for column in columns] for row in rows]
+    widths = [max(len(column), *(len(line[i]) for line in cells)) for i, column in enumerate(columns)]
+    lines = ['  '.join(column.ljust(width) for column, width in zip(columns, widths)).rstrip()]
+    lines.append('  '.join('-' * width for width in widths))
+    lines += ['  '.join(cell.ljust(width) for cell, width in zip(line, widths)).rstrip() for line in cells]
+    return '\n'.join(lines)
+
+def _format_cell(value):
+    """Format one table cell."""
+    if value is None:
+        return '-'
+    if isinstance(value, float):
+        return f"{value:.2f}"
+    return str(value)
+
+def pivot_table(rows, axes, row_axis, column_axis, metric='mb_per_s'):
+    """Arrange one metric as a grid over two matrix axes, one grid per test, direction, engine, backend and value of the other axes.
+
+    Returns {(test, direction, engine, backend, other axis values): (row values, column values, {(row value, column value): metric})}.
+    """
+    grids = {}
+    for row in rows:
+        others = tuple((axis, row[axis]) for axis in axes if axis not in (row_axis, column_axis))
+        row_values, column_values, cells = grids.setdefault((row['test'], row['direction'], row['engine'], row.get('backend'), others), ([], [], {}))
+        if row[row_axis] not in row_values:
+            row_values.append(row[row_axis])
+        if row[column_axis] not in column_values:
+            column_values.append(row[column_axis])
+        cells[(row[row_axis], row[column_axis])] = row[metric]
+    return grids
+
+def format_pivot(row_axis, column_axis, grid):
+    """Format one pivot_table grid as text, rows down and columns across."""
+    row_values, column_values, cells = grid
+    rows = [{f"{row_axis} \\ {column_axis}": row_value, **{str(column_value): cells.get((row_value, column_value)) for column_value in column_values}}
+            for row_value in row_values]
+    return format_table(rows)
+
+def write_heatmap_csv(csv_path, rows):
+    """Write the sweep summary as a tidy CSV: one row per matrix cell, test and direction, ready to pivot into a heatmap."""
+    columns = []
+    for row in rows:
+        columns.extend(column for column in row if column not in columns)
+    with open(csv_path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(rows)
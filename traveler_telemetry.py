@@ -0,0 +1,383 @@
+import os
+import re
+import csv
+import glob
+import json
+import time
+import shutil
+import threading
+import subprocess
+from traveler_metrics import timeline_rates
+
+DEFAULT_TELEMETRY_INTERVAL = 1.0  # seconds
+SECTOR_SIZE = 512  # /proc/diskstats counts 512-byte sectors whatever the device's block size
+NVME_CLI_TIMEOUT = 10
+# nvme smart-log fields worth keeping; counters are compared between the start and the end of a run
+SMART_FIELDS = ['critical_warning', 'temperature', 'avail_spare', 'percent_used', 'data_units_read', 'data_units_written',
+                'media_errors', 'num_err_log_entries', 'warning_temp_time', 'critical_comp_time',
+                'thm_temp1_trans_count', 'thm_temp2_trans_count', 'thm_temp1_total_time', 'thm_temp2_total_time']
+SMART_COUNTERS = ['media_errors', 'num_err_log_entries', 'warning_temp_time', 'critical_comp_time', 'thm_temp1_trans_count',
+                  'thm_temp2_trans_count', 'thm_temp1_total_time', 'thm_temp2_total_time']
+_collector = None
+
+def _read_text(path):
+    """Return the stripped contents of a small sysfs/procfs file, or None if it cannot be read."""
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+def read_cpu_times():
+    """Return {cpu: (busy, total)} jiffies from /proc/stat, or None where it is not available."""
+    if not os.path.exists('/proc/stat'):
+        return None
+    times = {}
+    with open('/proc/stat') as f:
+        for line in f:
+            if not line.startswith('cpu'):
+                break
+            fields = line.split()
+            values = [int(value) for value in fields[1:]]
+            idle = values[3] + (values[4] if len(values) > 4 else 0)  # idle + iowait
+            total = sum(values[:8])  # Guest time is already counted in user/nice
+            times[fields[0]] = (total - idle, total)
+    return times
+
+def cpu_utilization(before, after):
+    """Return {cpu: percent busy} between two read_cpu_times snapshots."""
+    utilization = {}
+    for cpu, (busy, total) in after.items():
+        if cpu in before and total > before[cpu][1]:
+            utilization[cpu] = (busy - before[cpu][0]) / (total - before[cpu][1]) * 100
+    return utilization
+
+def cpu_frequencies():
+    """Return the current frequency of every CPU in MHz, from cpufreq or else /proc/cpuinfo (empty if neither exists)."""
+    frequencies = []
+    for path in glob.glob('/sys/devices/system/cpu/cpu[0-9]*/cpufreq/scaling_cur_freq'):
+        value = _read_text(path)
+        if value and value.isdigit():
+            frequencies.append(int(value) / 1000)
+    if not frequencies and os.path.exists('/proc/cpuinfo'):
+        with open('/proc/cpuinfo') as f:
+            frequencies = [float(line.split(':')[1]) for line in f if line.startswith('cpu MHz')]
+    return frequencies
+
+def cpu_environment():
+    """Describe the CPU frequency policy: scaling governor and maximum frequency, where cpufreq exposes them."""
+    environment = {}
+    governor = _read_text('/sys/devices/system/cpu/cpu0/cpufreq/scaling_governor')
+    if governor:
+        environment['cpu_governor'] = governor
+    max_frequency = _read_text('/sys/devices/system/cpu/cpu0/cpufreq/cpuinfo_max_freq')
+    if max_frequency and max_frequency.isdigit():
+        environment['cpu_max_mhz'] = int(max_frequency) / 1000
+    return environment
+
+def mount_point(path):
+    """Return the mount point that contains path."""
+    path = os.path.realpath(path)
+    while not os.path.ismount(path):
+        parent = os.path.dirname(path)
+        if parent == path:
+            break
+        path = parent
+    return path
+
+def mount_info(path):
+    """Return the mount point, source device, filesystem type and mount options of the filesystem holding path."""
+    info = {'mount': mount_point(path)}
+    if os.path.exists('/proc/mounts'):
+        with open('/proc/mounts') as f:
+            for line in f:
+                fields = line.split()
+                if len(fields) >= 4 and fields[1] == info['mount']:
+                    info.update({'device': fields[0], 'fs_type': fields[2], 'mount_options': fields[3]})
+    return info
+
+def block_device(path):
+    """Find the block device holding path in sysfs.
+
+    Returns {'name': device as named in /proc/diskstats, 'disk': whole disk, 'sysfs': sysfs directory of the disk},
+    or None for filesystems without a block device (tmpfs, network filesystems) and platforms without sysfs.
+    """
+    try:
+        st_dev = os.stat(path).st_dev
+    except OSError:
+        return None
+    sysfs = os.path.realpath(f"/sys/dev/block/{os.major(st_dev)}:{os.minor(st_dev)}")
+    if not os.path.isdir(sysfs):
+        return None
+    name = os.path.basename(sysfs)
+    disk = os.path.dirname(sysfs) if os.path.exists(os.path.join(sysfs, 'partition')) else sysfs
+    return {'name': name, 'disk': os.path.basename(disk), 'sysfs': disk}
+
+def device_identity(device):
+    """Return the model, firmware revision and I/O scheduler of a block_device, as far as sysfs reports them."""
+    identity = {}
+    model = _read_text(os.path.join(device['sysfs'], 'device', 'model'))
+    firmware = _read_text(os.path.join(device['sysfs'], 'device', 'firmware_rev')) or _read_text(os.path.join(device['sysfs'], 'device', 'rev'))
+    scheduler = _read_text(os.path.join(device['sysfs'], 'queue', 'scheduler'))
+    if model:
+        identity['model'] = model
+    if firmware:
+        identity['firmware'] = firmware
+    if scheduler:
+        selected = re.search(r'\[(\S+)\]', scheduler)
+        identity['scheduler'] = selected.group(1) if selected else scheduler
+    return identity
+
+def temperature_sensor(device):
+    """Return the hwmon temperature input of a disk (NVMe controllers, and SATA drives with drivetemp), or None."""
+    for pattern in ['device/hwmon*/temp1_input', 'device/hwmon/hwmon*/temp1_input']:
+        sensors = sorted(glob.glob(os.path.join(device['sysfs'], pattern)))
+        if sensors:
+            return sensors[0]
+    return None
+
+def read_temperature(sensor):
+    """Read an hwmon temperature input in degrees Celsius, or None."""
+    value = _read_text(sensor)
+    return int(value) / 1000 if value and value.lstrip('-').isdigit() else None
+
+def nvme_controller(device):
+    """Return the /dev path of the NVMe controller of a disk such as nvme0n1, or None for other disks."""
+    match = re.match(r'(nvme\d+)(c\d+)?n\d+$', device['disk'])
+    return f"/dev/{match.group(1)}" if match else None
+
+def read_smart(device):
+    """Read the NVMe SMART/health log of a disk with nvme-cli, or return None when nvme-cli is missing or fails.
+
+    The composite temperature is also returned in Celsius as temperature_c (nvme-cli reports Kelvin).
+    """
+    controller = nvme_controller(device)
+    nvme = shutil.which('nvme')
+    if controller is None or nvme is None:
+        return None
+    try:
+        output = subprocess.run([nvme, 'smart-log', controller, '-o', 'json'], capture_output=True, text=True,
+                                timeout=NVME_CLI_TIMEOUT, check=True).stdout
+        log = json.loads(output)
+    except (OSError, subprocess.SubprocessError, ValueError):
+        return None
+    smart = {field: log[field] for field in SMART_FIELDS if isinstance(log.get(field), (int, float))}
+    if 'temperature' in smart:
+        smart['temperature_c'] = smart['temperature'] - 273 if smart['temperature'] > 200 else smart['temperature']
+    return smart
+
+def read_diskstats():
+    """Return {device: (reads, read sectors, writes, write sectors, io ms, weighted io ms)} from /proc/diskstats."""
+    if not os.path.exists('/proc/diskstats'):
+        return {}
+    stats = {}
+    with open('/proc/diskstats') as f:
+        for line in f:
+            fields = line.split()
+            if len(fields) >= 14:
+                stats[fields[2]] = (int(fields[3]), int(fields[5]), int(fields[7]), int(fields[9]), int(fields[12]), int(fields[13]))
+    return stats
+
+def disk_rates(before, after, seconds):
+    """Return device-level IOPS, MB/s, utilization and average queue depth between two read_diskstats entries."""
+    reads, read_sectors, writes, write_sectors, io_ms, queue_ms = (b - a for a, b in zip(before, after))
+    return {
+        'read_iops': reads / seconds,
+        'write_iops': writes / seconds,
+        'read_mb_per_s': read_sectors * SECTOR_SIZE / (1024 * 1024) / seconds,
+        'write_mb_per_s': write_sectors * SECTOR_SIZE / (1024 * 1024) / seconds,
+        'util_percent': min(100.0, io_ms / (seconds * 10)),
+        'queue_depth': queue_ms / (seconds * 1000),
+    }
+
+def environment(paths):
+    """Describe the CPU policy and, per path, the filesystem and device that hold it."""
+    described = cpu_environment()
+    described['paths'] = {}
+    for path in paths:
+        info = mount_info(path)
+        device = block_device(path)
+        if device is not None:
+            info.update({'block_device': device['name'], **device_identity(device)})
+        described['paths'][path] = info
+    return described
+
+def start_telemetry(paths, interval=DEFAULT_TELEMETRY_INTERVAL):
+    """Start sampling the devices holding paths, and the CPU, every interval seconds on a background thread.
+
+    While the collector runs, make_result attaches telemetry_window summaries to every result.
+    """
+    global _collector
+    devices = {}
+    for path in paths:
+        device = block_device(path)
+        if device is not None and device['name'] not in devices:
+            device['sensor'] = temperature_sensor(device)
+            device['smart_start'] = read_smart(device)
+            devices[device['name']] = device
+    collector = {'devices': devices, 'environment': environment(paths), 'interval': interval, 'samples': [],
+                 'lock': threading.Lock(), 'stop': threading.Event(), 'start': time.perf_counter(),
+                 'diskstats': read_diskstats(), 'cpu_times': read_cpu_times()}
+    collector['last'] = collector['start']
+    collector['thread'] = threading.Thread(target=_telemetry_loop, args=(collector,), daemon=True)
+    collector['thread'].start()
+    _collector = collector
+    return collector
+
+def _telemetry_loop(collector):
+    """Take a sample every interval until the collector is stopped."""
+    while not collector['stop'].wait(collector['interval']):
+        take_sample(collector)
+
+def take_sample(collector):
+    """Append one sample covering the time since the previous one.
+
+    A sample is a flat dict: seconds since the collector started, the wall-clock time, the span it covers, CPU
+    utilization and mean frequency, and per device <device>_temp_c and the disk_rates as <device>_<rate>.
+    """
+    with collector['lock']:
+        now = time.perf_counter()
+        span = now - collector['last']
+        if span <= 0:
+            return
+        sample = {'seconds': now - collector['start'], 'time': time.time(), 'span': span}
+        cpu_times = read_cpu_times()
+        if cpu_times is not None and collector['cpu_times'] is not None:
+            busy = cpu_utilization(collector['cpu_times'], cpu_times).get('cpu')
+            if busy is not None:
+                sample['cpu_percent'] = busy
+        frequencies = cpu_frequencies()
+        if frequencies:
+            sample['cpu_mhz'] = sum(frequencies) / len(frequencies)
+        diskstats = read_diskstats()
+        for name, device in collector['devices'].items():
+            if device['sensor'] is not None:
+                temperature = read_temperature(device['sensor'])
+            else:
+                smart = read_smart(device) if device['smart_start'] is not None else None
+                temperature = smart.get('temperature_c') if smart else None
+            if temperature is not None:
+                sample[f"{name}_temp_c"] = temperature
+            if name in diskstats and name in collector['diskstats']:
+                for rate, value in disk_rates(collector['diskstats'][name], diskstats[name], span).items():
+                    sample[f"{name}_{rate}"] = value
+        collector['samples'].append(sample)
+        collector['last'] = now
+        collector['diskstats'] = diskstats
+        collector['cpu_times'] = cpu_times
+
+def stop_telemetry(collector):
+    """Stop a collector, take a final sample and the closing SMART logs, and return it."""
+    global _collector
+    collector['stop'].set()
+    collector['thread'].join()
+    take_sample(collector)
+    for device in collector['devices'].values():
+        device['smart_end'] = read_smart(device) if device['smart_start'] is not None else None
+    if _collector is collector:
+        _collector = None
+    return collector
+
+def smart_changes(device):
+    """Return the SMART counters of a stopped collector's device that grew during the run, e.g. thermal throttling time."""
+    start, end = device.get('smart_start'), device.get('smart_end')
+    if not start or not end:
+        return {}
+    return {field: end[field] - start[field] for field in SMART_COUNTERS if field in start and field in end and end[field] != start[field]}
+
+def _cover(collector, ended):
+    """Take a sample now unless the samples already reach ended, so the end of a test just finished is covered."""
+    if collector['last'] - collector['start'] < ended:
+        take_sample(collector)
+
+def _overlap(sample, started, ended):
+    """Seconds of a sample's span that fall inside [started, ended] (both on the collector's clock)."""
+    return max(0.0, min(sample['seconds'], ended) - max(sample['seconds'] - sample['span'], started))
+
+def telemetry_window(path, started, seconds):
+    """Summarize the telemetry of a test that ran for seconds from perf_counter time started, or None if no collector runs.
+
+    Rates are means weighted by how much of each sample falls inside the test; the device is the one holding path.
+    """
+    collector = _collector
+    if collector is None:
+        return None
+    started -= collector['start']
+    ended = started + seconds
+    _cover(collector, ended)
+    with collector['lock']:
+        window = [(sample, _overlap(sample, started, ended)) for sample in collector['samples']]
+    window = [(sample, weight) for sample, weight in window if weight > 0]
+    if not window:
+        return None
+
+    def mean(key):
+        weighted = [(sample[key], weight) for sample, weight in window if key in sample]
+        total = sum(weight for _, weight in weighted)
+        return sum(value * weight for value, weight in weighted) / total if total else None
+
+    summary = {'samples': len(window)}
+    cpu = [sample['cpu_percent'] for sample, _ in window if 'cpu_percent' in sample]
+    if cpu:
+        summary.update({'cpu_mean_percent': mean('cpu_percent'), 'cpu_peak_percent': max(cpu)})
+    frequencies = [sample['cpu_mhz'] for sample, _ in window if 'cpu_mhz' in sample]
+    if frequencies:
+        summary.update({'cpu_mean_mhz': mean('cpu_mhz'), 'cpu_min_mhz': min(frequencies)})
+    device = block_device(path)
+    if device is not None and device['name'] in collector['devices']:
+        name = device['name']
+        summary['device'] = name
+        temperatures = [sample[f"{name}_temp_c"] for sample, _ in window if f"{name}_temp_c" in sample]
+        if temperatures:
+            summary.update({'temp_start_c': temperatures[0], 'temp_max_c': max(temperatures)})
+        for rate in ['read_mb_per_s', 'write_mb_per_s', 'read_iops', 'write_iops', 'util_percent', 'queue_depth']:
+            value = mean(f"{name}_{rate}")
+            if value is not None:
+                summary[f"device_{rate}"] = value
+    return summary
+
+def timeline_telemetry(timeline, started):
+    """Join a throughput timeline to the running collector: the telemetry sample covering each timeline row.
+
+    Returns one dict per timeline_rates row (empty where no sample covers it yet), or None without a collector.
+    """
+    collector = _collector
+    if collector is None or not timeline or started is None:
+        return None
+    offset = started - collector['start']
+    rows = timeline_rates(timeline)
+    if rows:
+        _cover(collector, offset + rows[-1][0])
+    with collector['lock']:
+        samples = list(collector['samples'])
+    joined = []
+    for seconds, _, _ in rows:
+        at = offset + seconds
+        sample = next((sample for sample in samples if sample['seconds'] - sample['span'] < at <= sample['seconds']), None)
+        joined.append({key: value for key, value in sample.items() if key not in ('seconds', 'span')} if sample else {})
+    return joined
+
+def write_telemetry_csv(path, samples):
+    """Export the samples of a collector as CSV, one row per sample."""
+    columns = []
+    for sample in samples:
+        columns.extend(column for column in sample if column not in columns)
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(samples)
+
+def format_telemetry(summary):
+    """Format a telemetry_window summary for the terminal and the log."""
+    parts = []
+    if 'temp_max_c' in summary:
+        parts.append(f"{summary['temp_start_c']:.0f}-{summary['temp_max_c']:.0f}C")
+    if 'device_util_percent' in summary:
+        parts.append(f"device {summary['device_read_mb_per_s']:.0f} MB/s read, {summary['device_write_mb_per_s']:.0f} MB/s write, "
+                     f"QD {summary['device_queue_depth']:.1f}, {summary['device_util_percent']:.0f}% busy")
+    if 'cpu_mean_percent' in summary:
+        parts.append(f"CPU {summary['cpu_mean_percent']:.0f}% (peak {summary['cpu_peak_percent']:.0f}%)")
+    if 'cpu_mean_mhz' in summary:
+        parts.append(f"{summary['cpu_mean_mhz']:.0f} MHz (min {summary['cpu_min_mhz']:.0f})")
+    text = ', '.join(parts) if parts else "no telemetry available"
+    return f"{summary['device']}: {text}" if 'device' in summary else text
@@ -0,0 +1,174 @@
+import os
+import math
+import time
+import random
+import shutil
+import threading
+import concurrent.futures
+from traveler_engine import DATA_PATTERNS, SECTOR_SIZE, fill_pattern_buffer, stamp_block
+from traveler_events import stop_event, check_stop
+from traveler_metrics import new_histogram, record_latency, merge_histograms, start_throughput_sampler, stop_throughput_sampler
+
+SIZE_DISTRIBUTIONS = ['fixed', 'uniform', 'lognormal']
+DEFAULT_TREE_FILES = 10000
+DEFAULT_TREE_FILE_SIZE = 64 * 1024
+DEFAULT_TREE_DEPTH = 2
+DEFAULT_TREE_FANOUT = 16
+DEFAULT_TREE_WORKERS = 16  # Small-file copies wait on metadata syscalls, so more threads than CPUs pay off
+DEFAULT_BATCH_SIZE = 64
+LOGNORMAL_SIGMA = 1.0  # Long tail of a few large files among many small ones, like photo libraries and source trees
+MAX_SIZE_FACTOR = 64
+WRITE_CHUNK = 1024 * 1024
+
+def file_sizes(count, mean_size, distribution='lognormal', seed=None):
+    """Draw count file sizes with the given mean from a size distribution."""
+    rng = random.Random(seed)
+    if distribution == 'fixed':
+        return [mean_size] * count
+    if distribution == 'uniform':
+        return [rng.randint(0, 2 * mean_size) for _ in range(count)]
+    if distribution == 'lognormal':
+        mu = math.log(max(1, mean_size)) - LOGNORMAL_SIGMA ** 2 / 2
+        cap = MAX_SIZE_FACTOR * mean_size
+        return [min(int(rng.lognormvariate(mu, LOGNORMAL_SIGMA)), cap) for _ in range(count)]
+    raise ValueError(f"Invalid size distribution. Use one of: {', '.join(SIZE_DISTRIBUTIONS)}.")
+
+def tree_directory(root, index, depth, fanout):
+    """Return the leaf directory of file index in a tree of the given depth and fanout."""
+    leaf = index % fanout ** depth
+    return os.path.join(root, *[f"d{leaf // fanout ** level % fanout:02d}" for level in range(depth)])
+
+def _generate_worker(root, indexes, sizes, depth, fanout, pattern, seed):
+    """Write the files with the given indexes and return the bytes written."""
+    buffer = bytearray(WRITE_CHUNK)
+    fill_pattern_buffer(buffer, pattern, seed)
+    view = memoryview(buffer)
+    written = 0
+    for index in indexes:
+        if stop_event.is_set():
+            break
+        size = sizes[index]
+        with open(os.path.join(tree_directory(root, index, depth, fanout), f"f{index:08d}.bin"), 'wb', buffering=0) as f:
+            offset = 0
+            while offset < size:
+                length = min(WRITE_CHUNK, size - offset)
+                if pattern != 'zeros':
+                    # Stamp whole sectors (the buffer is sector-aligned) so files stay distinct for dedupe-capable targets
+                    stamp_block(view[:-(-length // SECTOR_SIZE) * SECTOR_SIZE], (index << 40) + offset)
+                written += f.write(view[:length])
+                offset += length
+    return written
+
+def generate_tree(root, file_count=DEFAULT_TREE_FILES, mean_size=DEFAULT_TREE_FILE_SIZE, distribution='lognormal',
+                  depth=DEFAULT_TREE_DEPTH, fanout=DEFAULT_TREE_FANOUT, pattern='random', workers=DEFAULT_TREE_WORKERS, seed=None):
+    """Create a directory tree of many files and return the generation stats."""
+    if pattern not in DATA_PATTERNS:
+        raise ValueError(f"Invalid data pattern. Use one of: {', '.join(DATA_PATTERNS)}.")
+    if seed is None:
+        seed = random.randrange(1 << 32)
+    sizes = file_sizes(file_count, mean_size, distribution, seed)
+
+    start_time = time.perf_counter()
+    directories = {tree_directory(root, index, depth, fanout) for index in range(min(file_count, fanout ** depth))}
+    for directory in directories:
+        os.makedirs(directory, exist_ok=True)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_generate_worker, root, range(i, file_count, workers), sizes, depth, fanout, pattern, seed + i)
+                   for i in range(workers)]
+        written = sum(future.result() for future in futures)
+    check_stop()
+    if hasattr(os, 'sync'):
+        os.sync()
+    elapsed = time.perf_counter() - start_time
+
+    return {
+        'files': file_count,
+        'directories': len(directories),
+        'bytes': written,
+        'seconds': elapsed,
+        'seed': seed,
+    }
+
+def _scan_directory(source, destination, batch_size):
+    """Create the destination directory and split the source entries into subdirectories and file batches."""
+    os.makedirs(destination, exist_ok=True)
+    subdirectories, batches, batch = [], [], []
+    with os.scandir(source) as entries:
+        for entry in entries:
+            target = os.path.join(destination, entry.name)
+            if entry.is_dir(follow_symlinks=False):
+                subdirectories.append((entry.path, target))
+            elif entry.is_file(follow_symlinks=False):
+                batch.append((entry.path, target, entry.stat(follow_symlinks=False).st_size))
+                if len(batch) >= batch_size:
+                    batches.append(batch)
+                    batch = []
+    if batch:
+        batches.append(batch)
+    return {'subdirectories': subdirectories, 'batches': batches}
+
+def _copy_batch(batch, progress):
+    """Copy a batch of files, timing each one, and return the batch stats."""
+    histogram = new_histogram()
+    clock = time.perf_counter_ns
+    key = threading.get_ident()
+    files = copied = 0
+    for source, destination, size in batch:
+        if stop_event.is_set():
+            break
+        start_ns = clock()
+        shutil.copyfile(source, destination)
+        record_latency(histogram, clock() - start_ns)
+        files += 1
+        copied += size
+        progress[key] = progress.get(key, 0) + size
+    return {'files': files, 'bytes': copied, 'histogram': histogram}
+
+def copy_tree(source, destination, workers=DEFAULT_TREE_WORKERS, batch_size=DEFAULT_BATCH_SIZE, sample_interval=None):
+    """Copy a directory tree with a worker pool that both scans directories and copies batches of files."""
+    progress = {}  # Bytes copied per worker thread, for the throughput sampler
+    sampler = start_throughput_sampler(lambda: sum(list(progress.values())), sample_interval) if sample_interval else None
+    histograms = []
+    files = copied = directories = 0
+
+    start_time = time.perf_counter()
+    try:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = {executor.submit(_scan_directory, source, destination, batch_size)}
+            while pending:
+                done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    result = future.result()
+                    if 'batches' in result:
+                        directories += 1
+                        pending.update(executor.submit(_scan_directory, src, dst, batch_size)
+                                       for src, dst in result['subdirectories'])
+                        pending.update(executor.submit(_copy_batch, batch, progress) for batch in result['batches'])
+                    else:
+                        files += result['files']
+                        copied += result['bytes']
+                        histograms.append(result['histogram'])
+    finally:
+        timeline = stop_throughput_sampler(sampler) if sampler else None
+    check_stop()
+    elapsed = time.perf_counter() - start_time
+
+    return {
+        'bytes': copied,
+        'files': files,
+        'directories': directories,
+        'seconds': elapsed,
+        'started': start_time,
+        'engine': 'tree',
+        'histogram': merge_histograms(histograms),
+        'read_histogram': None,
+        'timeline': timeline,
+        'workers': workers,
+    }
+
+def remove_path(path):
+    """Remove a test file or test tree."""
+    if os.path.isdir(path) and not os.path.islink(path):
+        shutil.rmtree(path)
+    else:
+        os.remove(path)
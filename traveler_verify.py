@@ -0,0 +1,130 @@
+import os
+import mmap
+import time
+import zlib
+import threading
+import concurrent.futures
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+VERIFY_ALGORITHMS = ['xxh3', 'crc32']
+DEFAULT_VERIFY_CHUNK = 64 * 1024 * 1024  # Each chunk is hashed by one task, so large files are verified in parallel
+DEFAULT_VERIFY_WORKERS = max(2, min(8, os.cpu_count() or 1))
+
+def default_algorithm():
+    """xxh3 when the xxhash package is installed, else zlib's CRC32 (both release the GIL on large buffers)."""
+    return 'xxh3' if xxhash is not None else 'crc32'
+
+def _digest(data, algorithm):
+    """Hash one buffer."""
+    if algorithm == 'xxh3':
+        return xxhash.xxh3_64_intdigest(data)
+    return zlib.crc32(data)
+
+def _hash_chunk(path, offset, length, algorithm):
+    """Hash length bytes of path at offset, evicting them from the page cache first so the device is read."""
+    if not length:
+        return _digest(b'', algorithm)
+    fd = os.open(path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+    try:
+        if hasattr(os, 'posix_fadvise'):
+            try:
+                os.fsync(fd)
+            except OSError:
+                pass
+            os.posix_fadvise(fd, offset, length, os.POSIX_FADV_DONTNEED)
+        if not offset and length < mmap.ALLOCATIONGRANULARITY:
+            return _digest(os.read(fd, length), algorithm)  # Small files: cheaper than setting up a mapping
+        with mmap.mmap(fd, length, access=mmap.ACCESS_READ, offset=offset) as view:
+            return _digest(view, algorithm)
+    finally:
+        os.close(fd)
+
+def _submit_file(executor, path, algorithm, chunk_size):
+    """Queue the chunk hashes of one file; return (size, futures)."""
+    size = os.path.getsize(path)
+    offsets = range(0, size, chunk_size) if size else [0]
+    return size, [executor.submit(_hash_chunk, path, offset, min(chunk_size, size - offset), algorithm) for offset in offsets]
+
+def _resolve(digest):
+    """Return the value of a digest that may still be a pending future."""
+    return digest.result() if isinstance(digest, concurrent.futures.Future) else digest
+
+def tree_files(root):
+    """Return the paths of all files under root, relative to it, in a stable order."""
+    files = []
+    for directory, _, names in os.walk(root):
+        files += [os.path.relpath(os.path.join(directory, name), root) for name in names]
+    return sorted(files)
+
+def verify_copies(source, copies, algorithm=None, workers=DEFAULT_VERIFY_WORKERS, chunk_size=DEFAULT_VERIFY_CHUNK, source_digests=None):
+    """Check that every copy of a file (or test tree) matches the source, chunk by chunk.
+
+    Chunks of the source and all copies are hashed in parallel. source_digests, a dict kept by the caller, holds the
+    source hashes between calls so an unchanged source is read once per test. Returns a stats dict with the bytes
+    hashed, seconds, files per copy and a list of mismatch descriptions (empty when every copy matches).
+    """
+    algorithm = algorithm or default_algorithm()
+    if algorithm == 'xxh3' and xxhash is None:
+        raise ValueError("xxh3 verification needs the xxhash package (pip install xxhash).")
+    source_digests = {} if source_digests is None else source_digests
+    files = tree_files(source) if os.path.isdir(source) else ['']
+
+    start_time = time.perf_counter()
+    hashed = 0
+    mismatches = []
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = []
+        for name in files:
+            if (algorithm, name) not in source_digests:
+                size, futures = _submit_file(executor, os.path.join(source, name) if name else source, algorithm, chunk_size)
+                source_digests[(algorithm, name)] = (size, futures)
+                hashed += size
+            for copy in copies:
+                path = os.path.join(copy, name) if name else copy
+                if not os.path.isfile(path):
+                    mismatches.append(f"{path} is missing")
+                    continue
+                size, futures = _submit_file(executor, path, algorithm, chunk_size)
+                hashed += size
+                pending.append((name, path, size, futures))
+
+        for name, path, size, futures in pending:
+            source_size, source_futures = source_digests[(algorithm, name)]
+            if size != source_size:
+                mismatches.append(f"{path} is {size} bytes instead of {source_size}")
+                continue
+            for index, (expected, actual) in enumerate(zip(source_futures, futures)):
+                if actual.result() != _resolve(expected):
+                    mismatches.append(f"{path} differs from the source in the {chunk_size // (1024 * 1024)}MB chunk at offset {index * chunk_size}")
+                    break
+
+    # Keep plain values, not futures, for the next call
+    for key, (size, digests) in source_digests.items():
+        source_digests[key] = (size, [_resolve(digest) for digest in digests])
+    return {'bytes': hashed, 'seconds': time.perf_counter() - start_time, 'files': len(files), 'copies': len(copies),
+            'mismatches': mismatches, 'algorithm': algorithm}
+
+def start_verification(source, copies, algorithm=None, workers=DEFAULT_VERIFY_WORKERS, chunk_size=DEFAULT_VERIFY_CHUNK, source_digests=None):
+    """Run verify_copies on a background thread, so it overlaps the next transfer; finish_verification collects it."""
+    verification = {'thread': None, 'stats': None, 'error': None}
+
+    def run():
+        try:
+            verification['stats'] = verify_copies(source, copies, algorithm, workers, chunk_size, source_digests)
+        except Exception as e:
+            verification['error'] = e
+
+    verification['thread'] = threading.Thread(target=run, daemon=True)
+    verification['thread'].start()
+    return verification
+
+def finish_verification(verification):
+    """Wait for a background verification and return its stats, re-raising any error it hit."""
+    verification['thread'].join()
+    if verification['error'] is not None:
+        raise verification['error']
+    return verification['stats']